@@ -2,21 +2,55 @@
 
 from __future__ import annotations
 
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
 from typing import Any, cast
 
+from .batch import DEFAULT_BATCH_CONCURRENCY, BatchResult, async_run_batch
+from .cache import CoordinateGridCache
+from .spatial import LocationIndex
+
 
 class AirQuality:
     """Define an object to manage air quality API calls."""
 
-    def __init__(self, request: Callable[..., Awaitable]) -> None:
+    def __init__(
+        self,
+        request: Callable[..., Awaitable],
+        *,
+        coordinate_cache: CoordinateGridCache | None = None,
+        location_index: LocationIndex | None = None,
+    ) -> None:
         """Initialize.
 
         Args:
             request: The request method from the CloudAPI object.
+            coordinate_cache: An optional cache of nearest_* lookups that is keyed on
+                a grid cell of the coordinates.
+            location_index: An optional index of known cities/stations used to
+                answer nearest_* lookups without the nearest_* endpoints.
         """
+        self._coordinate_cache = coordinate_cache
+        self._location_index = location_index
         self._request = request
 
+    async def _get_location(
+        self, kind: str, endpoint: str, params: dict[str, str]
+    ) -> dict[str, Any]:
+        """Return data for a city/station (indexing its location).
+
+        Args:
+            kind: "city" or "station".
+            endpoint: The endpoint to query.
+            params: The request params.
+
+        Returns:
+            An API response payload.
+        """
+        data = await self._request("get", endpoint, params=params)
+        if self._location_index is not None:
+            self._location_index.record(kind, data["data"])
+        return cast(dict[str, Any], data["data"])
+
     async def _nearest(
         self,
         kind: str,
@@ -33,13 +67,71 @@ class AirQuality:
         Returns:
             An API response payload.
         """
-        if latitude and longitude:
-            params = {"lat": str(latitude), "lon": str(longitude)}
-        else:
-            params = {}
+        endpoint = f"nearest_{kind}"
 
-        data = await self._request("get", f"nearest_{kind}", params=params)
-        return cast(dict[str, Any], data["data"])
+        if not (latitude and longitude):
+            return await self._get_location(kind, endpoint, {})
+
+        if self._coordinate_cache is None:
+            return await self._nearest_by_coordinates(
+                kind, float(latitude), float(longitude)
+            )
+
+        coordinate_key = self._coordinate_cache.build_coordinate_key(
+            endpoint, float(latitude), float(longitude)
+        )
+        if (cached := self._coordinate_cache.get(coordinate_key)) is not None:
+            return cached
+
+        # Every lookup within the cell requests the same coordinates, so concurrent
+        # (cold) lookups are coalesced into a single upstream request:
+        payload = await self._nearest_by_coordinates(
+            kind,
+            *self._coordinate_cache.get_cell_center(float(latitude), float(longitude)),
+        )
+        self._coordinate_cache.set(
+            coordinate_key, payload, self._coordinate_cache.ttl_for(endpoint)
+        )
+        return payload
+
+    async def _nearest_by_coordinates(
+        self, kind: str, latitude: float, longitude: float
+    ) -> dict[str, Any]:
+        """Return data from the nearest city/station to a pair of coordinates.
+
+        Args:
+            kind: "city" or "station".
+            latitude: A latitude.
+            longitude: A longitude.
+
+        Returns:
+            An API response payload (the latest payload of a nearby, known location
+            if it's still fresh).
+        """
+        if self._location_index is not None:
+            index = (
+                self._location_index.cities
+                if kind == "city"
+                else self._location_index.stations
+            )
+            if match := index.nearest(
+                latitude, longitude, max_distance=self._location_index.max_distance
+            ):
+                location, _ = match
+                if data := self._location_index.get_payload(kind, location):
+                    return data
+                if location.station:
+                    return await self.station(
+                        location.station,
+                        location.city,
+                        location.state,
+                        location.country,
+                    )
+                return await self.city(location.city, location.state, location.country)
+
+        return await self._get_location(
+            kind, f"nearest_{kind}", {"lat": str(latitude), "lon": str(longitude)}
+        )
 
     async def city(self, city: str, state: str, country: str) -> dict[str, Any]:
         """Return data for the specified city.
@@ -52,10 +144,28 @@ class AirQuality:
         Returns:
             An API response payload.
         """
-        data = await self._request(
-            "get", "city", params={"city": city, "state": state, "country": country}
+        return await self._get_location(
+            "city", "city", {"city": city, "state": state, "country": country}
+        )
+
+    def cities_many(
+        self,
+        locations: Iterable[tuple[str, str, str]],
+        *,
+        concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    ) -> AsyncIterator[BatchResult[tuple[str, str, str], dict[str, Any]]]:
+        """Return data for many cities, yielding each result as it completes.
+
+        Args:
+            locations: (city, state, country) tuples.
+            concurrency: The max number of concurrent requests.
+
+        Returns:
+            An async iterator of per-city results (errors included).
+        """
+        return async_run_batch(
+            lambda location: self.city(*location), locations, concurrency=concurrency
         )
-        return cast(dict[str, Any], data["data"])
 
     async def nearest_city(
         self,
@@ -112,14 +222,29 @@ class AirQuality:
         Returns:
             An API response payload.
         """
-        data = await self._request(
-            "get",
+        return await self._get_location(
+            "station",
             "station",
-            params={
-                "station": station,
-                "city": city,
-                "state": state,
-                "country": country,
-            },
+            {"station": station, "city": city, "state": state, "country": country},
+        )
+
+    def stations_many(
+        self,
+        locations: Iterable[tuple[str, str, str, str]],
+        *,
+        concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    ) -> AsyncIterator[BatchResult[tuple[str, str, str, str], dict[str, Any]]]:
+        """Return data for many stations, yielding each result as it completes.
+
+        Args:
+            locations: (station, city, state, country) tuples.
+            concurrency: The max number of concurrent requests.
+
+        Returns:
+            An async iterator of per-station results (errors included).
+        """
+        return async_run_batch(
+            lambda location: self.station(*location),
+            locations,
+            concurrency=concurrency,
         )
-        return cast(dict[str, Any], data["data"])
@@ -0,0 +1,87 @@
+"""Define helpers to run many API calls with bounded concurrency."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator, Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+DEFAULT_BATCH_CONCURRENCY = 10
+
+_ItemType = TypeVar("_ItemType")  # pylint: disable=invalid-name
+_ResultType = TypeVar("_ResultType")  # pylint: disable=invalid-name
+
+
+@dataclass(frozen=True)
+class BatchResult(Generic[_ItemType, _ResultType]):
+    """Define the outcome of a single item in a batch."""
+
+    item: _ItemType
+    data: _ResultType | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Return whether the item succeeded.
+
+        Returns:
+            Whether the item succeeded.
+        """
+        return self.error is None
+
+
+async def async_run_batch(
+    func: Callable[[_ItemType], Awaitable[_ResultType]],
+    items: Iterable[_ItemType],
+    *,
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+) -> AsyncGenerator[BatchResult[_ItemType, _ResultType], None]:
+    """Run a coroutine function over many items, yielding results as they complete.
+
+    At most `concurrency` calls are in flight at once. An error in one item is
+    returned in its result (rather than failing the whole batch).
+
+    Args:
+        func: The coroutine function to call with each item.
+        items: The items to process.
+        concurrency: The max number of concurrent calls.
+
+    Yields:
+        A BatchResult for each item (in completion order).
+
+    Raises:
+        ValueError: Raised when the concurrency is less than 1.
+    """
+    if concurrency < 1:
+        raise ValueError("Batch concurrency must be at least 1")
+
+    pending = iter(items)
+    results: asyncio.Queue[BatchResult[_ItemType, _ResultType] | None] = (
+        asyncio.Queue()
+    )
+
+    async def worker() -> None:
+        """Process items until none are left."""
+        # Workers share the same iterator, so each item is only handed out once:
+        for item in pending:
+            try:
+                data = await func(item)
+            except Exception as err:  # pylint: disable=broad-except
+                results.put_nowait(BatchResult(item, error=err))
+            else:
+                results.put_nowait(BatchResult(item, data=data))
+        results.put_nowait(None)
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    finished_workers = 0
+
+    try:
+        while finished_workers < len(workers):
+            if (result := await results.get()) is None:
+                finished_workers += 1
+                continue
+            yield result
+    finally:
+        for task in workers:
+            task.cancel()
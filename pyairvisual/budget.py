@@ -0,0 +1,48 @@
+"""Define a budget that caps the extra requests (e.g., retries) a client can send."""
+
+from __future__ import annotations
+
+
+class TokenBudget:
+    """Define a budget of tokens that refills as new requests are made.
+
+    Each new request earns a fraction of a token, and each extra request (e.g., a
+    retry or a hedge) spends a whole one, so extra requests can never exceed a fixed
+    ratio of requests (plus whatever has been banked).
+    """
+
+    def __init__(self, ratio: float, size: int) -> None:
+        """Initialize.
+
+        Args:
+            ratio: The fraction of a token earned by each new request.
+            size: The max number of tokens that can be banked.
+        """
+        self._ratio = ratio
+        self._size = size
+        self._tokens = float(size)
+
+    @property
+    def remaining(self) -> int:
+        """Return the number of tokens currently available.
+
+        Returns:
+            A number of tokens.
+        """
+        return int(self._tokens)
+
+    def record_request(self) -> None:
+        """Earn a fraction of a token for a new request."""
+        self._tokens = min(self._size, self._tokens + self._ratio)
+
+    def try_draw(self) -> bool:
+        """Draw a token (if one is available).
+
+        Returns:
+            Whether a token was drawn.
+        """
+        if self._tokens < 1:
+            return False
+
+        self._tokens -= 1
+        return True
@@ -0,0 +1,391 @@
+"""Define an in-memory cache for Cloud API responses."""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .const import LOGGER
+from .disk_cache import DiskCache
+from .spatial import geohash_decode, geohash_encode
+
+DEFAULT_CACHE_MAX_SIZE = 1024
+DEFAULT_CACHE_TTL = 60
+DEFAULT_COORDINATE_CACHE_PRECISION = 6
+DEFAULT_COORDINATE_CACHE_TTL = 10 * 60
+DEFAULT_NEGATIVE_CACHE_MAX_SIZE = 256
+DEFAULT_NEGATIVE_CACHE_TTL = 60 * 60
+
+# Supported locations rarely change, while station/city readings are updated roughly
+# once an hour:
+DEFAULT_ENDPOINT_TTLS: dict[str, float] = {
+    "cities": 24 * 60 * 60,
+    "city": 10 * 60,
+    "city_ranking": 10 * 60,
+    "countries": 24 * 60 * 60,
+    "nearest_city": 10 * 60,
+    "nearest_station": 10 * 60,
+    "states": 24 * 60 * 60,
+    "station": 10 * 60,
+    "stations": 24 * 60 * 60,
+}
+
+CacheKey = tuple[Hashable, ...]
+
+
+@dataclass
+class CacheStats:
+    """Define hit/miss counters for a cache."""
+
+    disk_hits: int = 0
+    evictions: int = 0
+    hits: int = 0
+    misses: int = 0
+    stale_hits: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Return the ratio of lookups that were served from the cache.
+
+        Returns:
+            A float between 0 and 1.
+        """
+        if not (lookups := self.hits + self.misses):
+            return 0.0
+        return self.hits / lookups
+
+
+class ResponseCache:
+    """Define a size-bounded, TTL-aware LRU cache of API response payloads.
+
+    Cached payloads are shared between callers and should be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int = DEFAULT_CACHE_MAX_SIZE,
+        default_ttl: float = DEFAULT_CACHE_TTL,
+        endpoint_ttls: Mapping[str, float] | None = None,
+        max_stale: float = 0,
+        disk_cache: DiskCache | None = None,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            max_size: The maximum number of payloads to hold.
+            default_ttl: The number of seconds to cache an endpoint that doesn't have
+                an explicit TTL.
+            endpoint_ttls: A mapping of endpoint to TTL (in seconds); a TTL of 0
+                disables caching for that endpoint.
+            max_stale: The number of seconds past its TTL that an expired payload may
+                still be served while it is refreshed in the background (0 disables
+                stale-while-revalidate).
+            disk_cache: An optional persistent tier (shareable across processes)
+                that payloads are written through to and read from on a miss.
+        """
+        self._default_ttl = default_ttl
+        self._disk_cache = disk_cache
+        self._endpoint_ttls = dict(
+            DEFAULT_ENDPOINT_TTLS if endpoint_ttls is None else endpoint_ttls
+        )
+        self._entries: OrderedDict[CacheKey, tuple[float, dict[str, Any]]] = (
+            OrderedDict()
+        )
+        self._max_size = max_size
+        self.max_stale = max_stale
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        """Return the number of cached payloads.
+
+        Returns:
+            The number of cached payloads.
+        """
+        return len(self._entries)
+
+    @staticmethod
+    def build_key(
+        method: str, url: str, params: Mapping[str, Any] | None = None
+    ) -> CacheKey:
+        """Build a cache key for a request.
+
+        The API key is deliberately left out so that it never ends up in the cache.
+
+        Args:
+            method: An HTTP method.
+            url: The full URL being requested.
+            params: The query parameters being sent.
+
+        Returns:
+            A hashable cache key.
+        """
+        return (
+            method.lower(),
+            url,
+            tuple(sorted((k, str(v)) for k, v in (params or {}).items() if k != "key")),
+        )
+
+    def _get_from_disk(
+        self, key: CacheKey, stored: tuple[dict[str, Any], float] | None
+    ) -> dict[str, Any] | None:
+        """Return a payload looked up in the disk cache (storing it in memory).
+
+        Args:
+            key: A cache key.
+            stored: The result of the disk cache lookup (None on a miss).
+
+        Returns:
+            A response payload or None.
+        """
+        if stored is None:
+            self.stats.misses += 1
+            return None
+
+        # Another process (or an earlier run) already fetched this payload:
+        payload, ttl = stored
+        self._store(key, payload, ttl)
+        self.stats.disk_hits += 1
+        self.stats.hits += 1
+        return payload
+
+    def _get_from_memory(self, key: CacheKey) -> dict[str, Any] | None:
+        """Return a payload held in memory (if it exists and hasn't expired).
+
+        Args:
+            key: A cache key.
+
+        Returns:
+            A response payload or None.
+        """
+        if entry := self._entries.get(key):
+            expires_at, payload = entry
+            if expires_at > (now := time.monotonic()):
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return payload
+            if expires_at + self.max_stale <= now:
+                del self._entries[key]
+        return None
+
+    def _store(self, key: CacheKey, payload: dict[str, Any], ttl: float) -> None:
+        """Store a payload in memory.
+
+        Args:
+            key: A cache key.
+            payload: A response payload.
+            ttl: The number of seconds the payload is valid for.
+        """
+        if self._max_size <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, payload)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def async_get(self, key: CacheKey) -> dict[str, Any] | None:
+        """Return a cached payload (reading a disk cache in an executor).
+
+        A disk cache that can't be read is logged and treated as a miss.
+
+        Args:
+            key: A cache key.
+
+        Returns:
+            A response payload or None.
+        """
+        if (payload := self._get_from_memory(key)) is not None:
+            return payload
+        if self._disk_cache is None:
+            return self._get_from_disk(key, None)
+
+        try:
+            stored = await self._disk_cache.async_get(key)
+        except sqlite3.Error as err:
+            LOGGER.warning("Error reading from the disk cache: %s", err)
+            stored = None
+        return self._get_from_disk(key, stored)
+
+    async def async_set(
+        self, key: CacheKey, payload: dict[str, Any], ttl: float
+    ) -> None:
+        """Store a payload in the cache (writing a disk cache in an executor).
+
+        A disk cache that can't be written is logged and skipped.
+
+        Args:
+            key: A cache key.
+            payload: A response payload.
+            ttl: The number of seconds the payload is valid for.
+        """
+        if ttl <= 0:
+            return
+
+        self._store(key, payload, ttl)
+        if self._disk_cache is None:
+            return
+
+        try:
+            await self._disk_cache.async_set(key, payload, ttl)
+        except sqlite3.Error as err:
+            LOGGER.warning("Error writing to the disk cache: %s", err)
+
+    def clear(self) -> None:
+        """Remove all payloads from memory (a disk cache is left untouched)."""
+        self._entries.clear()
+
+    def get(self, key: CacheKey) -> dict[str, Any] | None:
+        """Return a cached payload (if it exists and hasn't expired).
+
+        Args:
+            key: A cache key.
+
+        Returns:
+            A response payload or None.
+        """
+        if (payload := self._get_from_memory(key)) is not None:
+            return payload
+        if self._disk_cache is None:
+            return self._get_from_disk(key, None)
+
+        try:
+            stored = self._disk_cache.get(key)
+        except sqlite3.Error as err:
+            LOGGER.warning("Error reading from the disk cache: %s", err)
+            stored = None
+        return self._get_from_disk(key, stored)
+
+    def get_stale(self, key: CacheKey) -> dict[str, Any] | None:
+        """Return an expired payload that is still within the max-stale window.
+
+        Args:
+            key: A cache key.
+
+        Returns:
+            A response payload or None.
+        """
+        try:
+            expires_at, payload = self._entries[key]
+        except KeyError:
+            return None
+
+        if not expires_at <= time.monotonic() < expires_at + self.max_stale:
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.stale_hits += 1
+        return payload
+
+    def set(self, key: CacheKey, payload: dict[str, Any], ttl: float) -> None:
+        """Store a payload in the cache.
+
+        Args:
+            key: A cache key.
+            payload: A response payload.
+            ttl: The number of seconds the payload is valid for.
+        """
+        if ttl <= 0:
+            return
+
+        self._store(key, payload, ttl)
+        if self._disk_cache is None:
+            return
+
+        try:
+            self._disk_cache.set(key, payload, ttl)
+        except sqlite3.Error as err:
+            LOGGER.warning("Error writing to the disk cache: %s", err)
+
+    def ttl_for(self, endpoint: str) -> float:
+        """Return the TTL for an endpoint.
+
+        Args:
+            endpoint: A relative API endpoint.
+
+        Returns:
+            A TTL (in seconds).
+        """
+        return self._endpoint_ttls.get(endpoint, self._default_ttl)
+
+
+class CoordinateGridCache(ResponseCache):
+    """Define a cache of nearest_* payloads keyed on a grid cell of the coordinates.
+
+    Coordinates are snapped to a geohash cell, so lookups from nearby coordinates
+    share a single upstream response (which is requested for the cell's center, so
+    that concurrent lookups within a cell are coalesced into one request, too).
+    """
+
+    def __init__(
+        self,
+        *,
+        precision: int = DEFAULT_COORDINATE_CACHE_PRECISION,
+        max_size: int = DEFAULT_CACHE_MAX_SIZE,
+        ttl: float = DEFAULT_COORDINATE_CACHE_TTL,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            precision: The geohash precision of each cell (e.g., 6 is roughly
+                1.2 km x 0.6 km and 7 is roughly 150 m x 150 m).
+            max_size: The maximum number of payloads to hold.
+            ttl: The number of seconds a payload is valid for.
+        """
+        super().__init__(max_size=max_size, default_ttl=ttl, endpoint_ttls={})
+        self.precision = precision
+
+    def build_coordinate_key(
+        self, endpoint: str, latitude: float, longitude: float
+    ) -> CacheKey:
+        """Build a cache key for the grid cell that contains a pair of coordinates.
+
+        Args:
+            endpoint: A nearest_* endpoint.
+            latitude: A latitude.
+            longitude: A longitude.
+
+        Returns:
+            A hashable cache key.
+        """
+        return (endpoint, geohash_encode(latitude, longitude, self.precision))
+
+    def get_cell_center(self, latitude: float, longitude: float) -> tuple[float, float]:
+        """Return the center of the grid cell that contains a pair of coordinates.
+
+        Args:
+            latitude: A latitude.
+            longitude: A longitude.
+
+        Returns:
+            A (latitude, longitude) tuple.
+        """
+        return geohash_decode(geohash_encode(latitude, longitude, self.precision))
+
+
+class NegativeCache(ResponseCache):
+    """Define a cache of error payloads for deterministic "not found" responses.
+
+    Repeated lookups of a misspelled city (or of coordinates without a nearby station)
+    are answered with the same error without spending any quota.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int = DEFAULT_NEGATIVE_CACHE_MAX_SIZE,
+        ttl: float = DEFAULT_NEGATIVE_CACHE_TTL,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            max_size: The maximum number of error payloads to hold.
+            ttl: The number of seconds an error payload is valid for.
+        """
+        super().__init__(max_size=max_size, default_ttl=ttl, endpoint_ttls={})
@@ -0,0 +1,280 @@
+"""Define a crawler (and offline index) for the tree of supported locations."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
+
+from .batch import DEFAULT_BATCH_CONCURRENCY, async_run_batch
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from .supported import Supported
+
+CATALOG_VERSION = 1
+
+DEFAULT_CHECKPOINT_EVERY = 100
+DEFAULT_CHECKPOINT_INTERVAL = 60.0
+
+# A None value means that the children of a node haven't been fetched (yet):
+StationsType = dict[str, list[float] | None] | None
+CitiesType = dict[str, StationsType] | None
+StatesType = dict[str, CitiesType] | None
+CountriesType = dict[str, StatesType] | None
+
+
+class SupportedCatalog:
+    """Define an offline index of supported countries, states, cities, and stations."""
+
+    def __init__(self, countries: CountriesType = None) -> None:
+        """Initialize.
+
+        Args:
+            countries: A nested country -> state -> city -> station mapping.
+        """
+        self.countries = countries
+
+    @classmethod
+    def load(cls, path: str | Path) -> SupportedCatalog:
+        """Load a catalog from disk.
+
+        Args:
+            path: The path to a saved catalog.
+
+        Returns:
+            A SupportedCatalog object.
+
+        Raises:
+            ValueError: Raised when the file isn't a compatible catalog.
+        """
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+
+        if data.get("version") != CATALOG_VERSION:
+            raise ValueError(f"Unsupported catalog version: {data.get('version')}")
+
+        return cls(data["countries"])
+
+    def save(self, path: str | Path) -> None:
+        """Save the catalog to disk (atomically).
+
+        Args:
+            path: The path to save the catalog to.
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(
+                {"version": CATALOG_VERSION, "countries": self.countries},
+                file,
+                separators=(",", ":"),
+            )
+        os.replace(tmp_path, path)
+
+    def is_supported(
+        self,
+        country: str,
+        state: str | None = None,
+        city: str | None = None,
+        station: str | None = None,
+    ) -> bool:
+        """Return whether a location is known to be supported.
+
+        Args:
+            country: A country.
+            state: An optional state.
+            city: An optional city (requires a state).
+            station: An optional station (requires a city).
+
+        Returns:
+            Whether the location is in the catalog.
+        """
+        node: Any = self.countries
+        for name in (country, state, city, station):
+            if name is None:
+                break
+            if not node or name not in node:
+                return False
+            node = node[name]
+        return True
+
+    def stations(self) -> Iterator[tuple[str, str, str, str, list[float] | None]]:
+        """Iterate over every known station.
+
+        Yields:
+            (station, city, state, country, [latitude, longitude]) tuples.
+        """
+        for country, states in (self.countries or {}).items():
+            for state, cities in (states or {}).items():
+                for city, stations in (cities or {}).items():
+                    for station, coordinates in (stations or {}).items():
+                        yield station, city, state, country, coordinates
+
+
+class _CrawlCheckpointer:
+    """Define a helper that periodically saves a catalog while it is crawled."""
+
+    def __init__(
+        self,
+        catalog: SupportedCatalog,
+        path: str | Path | None,
+        *,
+        every: int,
+        interval: float,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            catalog: The catalog being crawled.
+            path: The path to save the catalog to (or None to never save it).
+            every: The number of completed requests after which the catalog is saved.
+            interval: The number of seconds after which the catalog is saved.
+        """
+        self._catalog = catalog
+        self._every = every
+        self._interval = interval
+        self._last_save = time.monotonic()
+        self._path = path
+        self._unsaved_results = 0
+
+    def record_result(self) -> None:
+        """Count a completed request (saving the catalog if a checkpoint is due)."""
+        self._unsaved_results += 1
+        if (
+            self._unsaved_results >= self._every
+            or time.monotonic() - self._last_save >= self._interval
+        ):
+            self.save()
+
+    def save(self) -> None:
+        """Save the catalog to the checkpoint path (if one exists)."""
+        if self._path is not None:
+            self._catalog.save(self._path)
+        self._last_save = time.monotonic()
+        self._unsaved_results = 0
+
+
+async def async_crawl_supported_locations(  # pylint: disable=too-many-arguments,too-many-locals
+    supported: Supported,
+    *,
+    catalog: SupportedCatalog | None = None,
+    include_stations: bool = False,
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    checkpoint_path: str | Path | None = None,
+    checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL,
+) -> SupportedCatalog:
+    """Crawl the tree of supported locations, level by level.
+
+    Only nodes whose children haven't been fetched are requested, so passing a
+    partially-crawled catalog (e.g., one loaded from a checkpoint) resumes the crawl.
+    Failed nodes are left unfetched (and logged) so that a later crawl can retry them.
+
+    Args:
+        supported: The Supported object of a CloudAPI object.
+        catalog: An optional, partially-crawled catalog to resume.
+        include_stations: Whether to crawl stations (requires a Startup plan).
+        concurrency: The max number of concurrent requests.
+        checkpoint_path: An optional path to save the catalog to after each level
+            (and periodically within each level).
+        checkpoint_every: The number of completed requests after which the catalog
+            is saved.
+        checkpoint_interval: The number of seconds after which the catalog is saved
+            (once the next request completes).
+
+    Returns:
+        A SupportedCatalog object.
+    """
+    if catalog is None:
+        catalog = SupportedCatalog()
+
+    if catalog.countries is None:
+        catalog.countries = dict.fromkeys(await supported.countries())
+
+    countries = catalog.countries
+
+    checkpointer = _CrawlCheckpointer(
+        catalog, checkpoint_path, every=checkpoint_every, interval=checkpoint_interval
+    )
+
+    async for result in async_run_batch(
+        supported.states,
+        [country for country, states in countries.items() if states is None],
+        concurrency=concurrency,
+    ):
+        if result.ok:
+            countries[result.item] = dict.fromkeys(result.data or [])
+        else:
+            LOGGER.warning("Failed to crawl %s: %s", result.item, result.error)
+        checkpointer.record_result()
+    checkpointer.save()
+
+    async for city_result in async_run_batch(
+        lambda location: supported.cities(*location),
+        [
+            (country, state)
+            for country, states in countries.items()
+            for state, cities in (states or {}).items()
+            if cities is None
+        ],
+        concurrency=concurrency,
+    ):
+        country, state = city_result.item
+        if city_result.ok:
+            states = cast(dict[str, CitiesType], countries[country])
+            states[state] = dict.fromkeys(city_result.data or [])
+        else:
+            LOGGER.warning(
+                "Failed to crawl %s: %s", city_result.item, city_result.error
+            )
+        checkpointer.record_result()
+    checkpointer.save()
+
+    if not include_stations:
+        return catalog
+
+    async for station_result in async_run_batch(
+        lambda location: supported.stations(*location),
+        [
+            (city, state, country)
+            for country, states in countries.items()
+            for state, cities in (states or {}).items()
+            for city, stations in (cities or {}).items()
+            if stations is None
+        ],
+        concurrency=concurrency,
+    ):
+        city, state, country = station_result.item
+        if station_result.ok:
+            states = cast(dict[str, CitiesType], countries[country])
+            cast(dict[str, StationsType], states[state])[city] = {
+                station["station"]: _get_station_coordinates(station)
+                for station in station_result.data or []
+            }
+        else:
+            LOGGER.warning(
+                "Failed to crawl %s: %s", station_result.item, station_result.error
+            )
+        checkpointer.record_result()
+    checkpointer.save()
+
+    return catalog
+
+
+def _get_station_coordinates(station: dict[str, Any]) -> list[float] | None:
+    """Return the [latitude, longitude] of a station from the stations endpoint.
+
+    Args:
+        station: A station payload.
+
+    Returns:
+        A [latitude, longitude] pair (or None if the station has no location).
+    """
+    try:
+        longitude, latitude = station["location"]["coordinates"]
+    except (KeyError, TypeError, ValueError):
+        return None
+    return [latitude, longitude]
@@ -0,0 +1,231 @@
+"""Define circuit breakers that fail fast while an API is down."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+from .const import LOGGER
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_HALF_OPEN_MAX_CALLS = 1
+DEFAULT_RECOVERY_TIMEOUT = 30.0
+
+STATE_CLOSED = "closed"
+STATE_HALF_OPEN = "half_open"
+STATE_OPEN = "open"
+
+
+class CircuitBreaker:
+    """Define a circuit breaker for a single API endpoint.
+
+    The breaker opens after a number of consecutive failures, at which point requests
+    are refused outright. After a recovery timeout, it lets a limited number of trial
+    requests through (half-open): a successful trial closes it again, while a failed
+    one re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        recovery_timeout: float = DEFAULT_RECOVERY_TIMEOUT,
+        half_open_max_calls: int = DEFAULT_HALF_OPEN_MAX_CALLS,
+        on_state_change: Callable[[CircuitBreaker, str, str], None] | None = None,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            name: The name of the breaker (e.g., the endpoint URL).
+            failure_threshold: The number of consecutive failures that open the
+                breaker.
+            recovery_timeout: The number of seconds the breaker stays open before
+                trial requests are let through.
+            half_open_max_calls: The max number of concurrent trial requests.
+            on_state_change: An optional function to call with the breaker, its old
+                state, and its new state whenever its state changes.
+        """
+        self._failure_threshold = failure_threshold
+        self._failures = 0
+        self._half_open_calls = 0
+        self._half_open_max_calls = half_open_max_calls
+        self._on_state_change = on_state_change
+        self._opened_at = 0.0
+        self._recovery_timeout = recovery_timeout
+        self._state = STATE_CLOSED
+        self.name = name
+
+    @property
+    def retry_after(self) -> float:
+        """Return the number of seconds until trial requests are let through.
+
+        Returns:
+            A number of seconds (0 if requests are let through now).
+        """
+        if self._state != STATE_OPEN:
+            return 0.0
+        return max(self._opened_at + self._recovery_timeout - time.monotonic(), 0.0)
+
+    @property
+    def state(self) -> str:
+        """Return the state of the breaker.
+
+        Returns:
+            One of "closed", "open", or "half_open".
+        """
+        if self._state == STATE_OPEN and not self.retry_after:
+            self._set_state(STATE_HALF_OPEN)
+        return self._state
+
+    def _set_state(self, state: str) -> None:
+        """Move the breaker into a new state.
+
+        Args:
+            state: The new state.
+        """
+        if state == self._state:
+            return
+
+        old_state = self._state
+        self._state = state
+        self._half_open_calls = 0
+        if state == STATE_OPEN:
+            self._opened_at = time.monotonic()
+        elif state == STATE_CLOSED:
+            self._failures = 0
+
+        LOGGER.info("Circuit breaker for %s is now %s", self.name, state)
+        if self._on_state_change:
+            self._on_state_change(self, old_state, state)
+
+    def allow_request(self) -> bool:
+        """Return whether a request may be sent (reserving a trial if half-open).
+
+        Every allowed request must be followed by a call to record_failure(),
+        record_success(), or release().
+
+        Returns:
+            Whether a request may be sent.
+        """
+        if not self.would_allow_request():
+            return False
+
+        if self._state == STATE_HALF_OPEN:
+            self._half_open_calls += 1
+        return True
+
+    def record_failure(self) -> None:
+        """Record a request that failed because the API is (likely) unavailable."""
+        if self._state == STATE_HALF_OPEN:
+            self._set_state(STATE_OPEN)
+            return
+
+        self._failures += 1
+        if self._failures >= self._failure_threshold:
+            self._set_state(STATE_OPEN)
+
+    def record_success(self) -> None:
+        """Record a request that the API answered."""
+        self._failures = 0
+        self._set_state(STATE_CLOSED)
+
+    def would_allow_request(self) -> bool:
+        """Return whether a request may be sent (without reserving a trial).
+
+        Returns:
+            Whether a request may be sent.
+        """
+        if (state := self.state) == STATE_CLOSED:
+            return True
+        return (
+            state == STATE_HALF_OPEN
+            and self._half_open_calls < self._half_open_max_calls
+        )
+
+    def release(self) -> None:
+        """Release a request that ended without an outcome (e.g., it was cancelled)."""
+        if self._state == STATE_HALF_OPEN:
+            self._half_open_calls = max(self._half_open_calls - 1, 0)
+
+
+class CircuitBreakers:
+    """Define a set of circuit breakers, one per base URL and endpoint."""
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        recovery_timeout: float = DEFAULT_RECOVERY_TIMEOUT,
+        half_open_max_calls: int = DEFAULT_HALF_OPEN_MAX_CALLS,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            failure_threshold: The number of consecutive failures that open a breaker.
+            recovery_timeout: The number of seconds a breaker stays open before trial
+                requests are let through.
+            half_open_max_calls: The max number of concurrent trial requests.
+        """
+        self._breakers: dict[tuple[str, str], CircuitBreaker] = {}
+        self._failure_threshold = failure_threshold
+        self._half_open_max_calls = half_open_max_calls
+        self._listeners: list[Callable[[CircuitBreaker, str, str], None]] = []
+        self._recovery_timeout = recovery_timeout
+
+    def _on_state_change(
+        self, breaker: CircuitBreaker, old_state: str, new_state: str
+    ) -> None:
+        """Report a state change to every registered listener.
+
+        Args:
+            breaker: The breaker whose state changed.
+            old_state: The old state.
+            new_state: The new state.
+        """
+        for listener in list(self._listeners):
+            try:
+                listener(breaker, old_state, new_state)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception("Error in circuit breaker listener %s", listener)
+
+    def add_listener(
+        self, listener: Callable[[CircuitBreaker, str, str], None]
+    ) -> Callable[[], None]:
+        """Register a listener that is called whenever a breaker changes state.
+
+        Args:
+            listener: A function to call with the breaker, its old state, and its
+                new state.
+
+        Returns:
+            A function that removes the listener.
+        """
+        self._listeners.append(listener)
+
+        def remove() -> None:
+            """Remove the listener."""
+            self._listeners.remove(listener)
+
+        return remove
+
+    def get(self, base_url: str, endpoint: str) -> CircuitBreaker:
+        """Return the breaker for an endpoint (creating it if necessary).
+
+        Args:
+            base_url: The base API URL.
+            endpoint: A relative API endpoint (or an empty string for a breaker that
+                covers the entire base URL).
+
+        Returns:
+            A CircuitBreaker object.
+        """
+        if (breaker := self._breakers.get((base_url, endpoint))) is None:
+            breaker = self._breakers[(base_url, endpoint)] = CircuitBreaker(
+                f"{base_url}/{endpoint}" if endpoint else base_url,
+                failure_threshold=self._failure_threshold,
+                recovery_timeout=self._recovery_timeout,
+                half_open_max_calls=self._half_open_max_calls,
+                on_state_change=self._on_state_change,
+            )
+        return breaker
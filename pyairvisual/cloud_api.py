@@ -2,19 +2,42 @@
 
 from __future__ import annotations
 
-from json.decoder import JSONDecodeError
+import asyncio
+import time
+from functools import partial
+from types import TracebackType
 from typing import Any, cast
 
-from aiohttp import ClientSession, ClientTimeout
+from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector
 
 from .air_quality import AirQuality
+from .cache import CacheKey, CoordinateGridCache, NegativeCache, ResponseCache
+from .circuit_breaker import CircuitBreaker, CircuitBreakers
 from .const import LOGGER
+from .decoder import JSONDecoder, get_default_json_decoder
 from .errors import AirVisualError
+from .hedge import HedgePolicy
+from .instrumentation import (
+    SOURCE_CACHE,
+    SOURCE_COALESCED,
+    SOURCE_NETWORK,
+    SOURCE_STALE,
+    RequestEvent,
+    RequestInstrumentation,
+)
+from .key_pool import APIKeyPool
+from .node import API_URL_BASE as NODE_API_URL_BASE
 from .node import NodeCloudAPI
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
+from .spatial import LocationIndex
 from .supported import Supported
 
 API_URL_BASE = "https://api.airvisual.com/v2"
 
+DEFAULT_CONNECTOR_LIMIT_PER_HOST = 10
+DEFAULT_DNS_CACHE_TTL = 300
+DEFAULT_KEEPALIVE_TIMEOUT = 30
 DEFAULT_REQUEST_TIMEOUT = 10
 
 
@@ -24,12 +47,24 @@ class CloudAPIError(AirVisualError):
     pass
 
 
+class CircuitOpenError(CloudAPIError):
+    """Define an error when a request is refused because its circuit is open."""
+
+    pass
+
+
 class InvalidKeyError(CloudAPIError):
     """Define an error when the API key is invalid."""
 
     pass
 
 
+class InvalidResponseError(CloudAPIError):
+    """Define an error when the API returns a response that can't be parsed."""
+
+    pass
+
+
 class KeyExpiredError(CloudAPIError):
     """Define an error when the API key has expired."""
 
@@ -80,12 +115,33 @@ ERROR_CODES: dict[str, type[AirVisualError]] = {
     "too_many_requests": LimitReachedError,
 }
 
+# Errors that are likely to succeed if the request is tried again:
+RETRYABLE_ERRORS: tuple[type[Exception], ...] = (
+    ClientError,
+    InvalidResponseError,
+    LimitReachedError,
+    asyncio.TimeoutError,
+)
+
+# Errors that suggest the API is unavailable (and count against a circuit breaker):
+CIRCUIT_BREAKER_ERRORS: tuple[type[Exception], ...] = (
+    ClientError,
+    InvalidResponseError,
+    asyncio.TimeoutError,
+)
 
-def raise_on_data_error(data: dict[str, Any]) -> None:
+# Errors that the API deterministically returns for the same request:
+NEGATIVE_CACHEABLE_ERRORS: tuple[type[Exception], ...] = (NoStationError, NotFoundError)
+
+
+def raise_on_data_error(
+    data: dict[str, Any], *, fallback: type[AirVisualError] = AirVisualError
+) -> None:
     """Raise an error if the data payload suggests there is one.
 
     Args:
         data: A response data payload from the API.
+        fallback: The error to raise if the payload doesn't contain a known error.
 
     Raises:
         error: An appropriate API error (a subclass of AirVisualError).
@@ -98,40 +154,509 @@ def raise_on_data_error(data: dict[str, Any]) -> None:
             v for k, v in ERROR_CODES.items() if k in data["data"]["message"].lower()
         ]
     except ValueError:
-        error = AirVisualError
+        error = fallback
     raise error(data)
 
 
-class CloudAPI:  # pylint: disable=too-few-public-methods
+def _get_circuit_open_error(breaker: CircuitBreaker) -> CircuitOpenError:
+    """Return the error raised when a breaker refuses a request.
+
+    Args:
+        breaker: A CircuitBreaker object.
+
+    Returns:
+        A CircuitOpenError.
+    """
+    return CircuitOpenError(
+        f"Circuit for {breaker.name} is {breaker.state} (next trial request allowed "
+        f"in {breaker.retry_after:.2f}s)"
+    )
+
+
+class CloudAPI:  # pylint: disable=too-many-instance-attributes
     """Define an object to work with the AirVisual Cloud API."""
 
-    def __init__(self, api_key: str, session: ClientSession | None = None) -> None:
+    def __init__(  # pylint: disable=too-many-arguments,too-many-locals
+        self,
+        api_key: str | APIKeyPool,
+        session: ClientSession | None = None,
+        *,
+        cache: ResponseCache | None = None,
+        circuit_breakers: CircuitBreakers | None = None,
+        coalesce_requests: bool = True,
+        coordinate_cache: CoordinateGridCache | None = None,
+        hedge_policy: HedgePolicy | None = None,
+        instrumentation: RequestInstrumentation | None = None,
+        json_decoder: JSONDecoder | None = None,
+        location_index: LocationIndex | None = None,
+        negative_cache: NegativeCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        limit_per_host: int = DEFAULT_CONNECTOR_LIMIT_PER_HOST,
+        dns_cache_ttl: int = DEFAULT_DNS_CACHE_TTL,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+    ) -> None:
         """Initialize.
 
         Args:
-            api_key: An API key.
+            api_key: An API key (or a pool of API keys to spread requests across).
             session: An optional aiohttp ClientSession.
+            cache: An optional cache to serve repeated GET requests from.
+            circuit_breakers: Optional circuit breakers (one per base URL and
+                endpoint) that refuse requests while an endpoint keeps failing.
+            coalesce_requests: Whether identical, concurrent GET requests should share
+                a single in-flight request.
+            coordinate_cache: An optional cache of nearest_* lookups that snaps
+                coordinates to a grid cell.
+            hedge_policy: An optional policy for sending a second, identical GET
+                request when the first one is slow (the first response wins).
+            instrumentation: An optional object to report request events (timings,
+                sizes, statuses, errors and cache outcomes) to.
+            json_decoder: An optional function to decode response bodies (bytes)
+                with; defaults to orjson (if installed) or the standard library.
+            location_index: An optional index of known cities/stations used to answer
+                nearest_* lookups locally.
+            negative_cache: An optional cache of "not found" errors (NotFoundError
+                and NoStationError) to answer repeated bad lookups with.
+            rate_limiter: An optional client-side rate limiter to draw a call from
+                before each request is sent.
+            retry_policy: An optional policy for retrying transient failures.
+            limit_per_host: The max number of simultaneous connections to a single
+                host (used when the CloudAPI object owns its session).
+            dns_cache_ttl: The number of seconds to cache DNS lookups (used when the
+                CloudAPI object owns its session).
+            keepalive_timeout: The number of seconds to keep an idle connection open
+                (used when the CloudAPI object owns its session).
         """
-        self._api_key = api_key
+        self._api_key = api_key if isinstance(api_key, str) else None
+        self._cache = cache
+        self._circuit_breakers = circuit_breakers
+        self._closed = False
+        self._coalesce_requests = coalesce_requests
+        self._dns_cache_ttl = dns_cache_ttl
+        self._hedge_policy = hedge_policy
+        self._in_flight_requests: dict[CacheKey, asyncio.Task[dict[str, Any]]] = {}
+        self._instrumentation = instrumentation
+        self._json_decoder = json_decoder or get_default_json_decoder()
+        self._keepalive_timeout = keepalive_timeout
+        self._key_pool = api_key if isinstance(api_key, APIKeyPool) else None
+        self._limit_per_host = limit_per_host
+        self._negative_cache = negative_cache
+        self._owned_session: ClientSession | None = None
+        self._rate_limiter = rate_limiter
+        self._retry_policy = retry_policy
         self._session: ClientSession | None = session
 
-        self.air_quality = AirQuality(self._request)
+        self.air_quality = AirQuality(
+            self._request,
+            coordinate_cache=coordinate_cache,
+            location_index=location_index,
+        )
         self.node = NodeCloudAPI(self._request)
         self.supported = Supported(self._request)
 
-    async def _request(
+    async def __aenter__(self) -> CloudAPI:
+        """Handle the start of a context manager.
+
+        Returns:
+            This CloudAPI object.
+        """
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,  # noqa: F841
+        exc_val: BaseException | None,  # noqa: F841
+        exc_tb: TracebackType | None,  # noqa: F841
+    ) -> None:
+        """Handle the end of a context manager.
+
+        Args:
+            exc_type: An optional exception if one caused the context manager to close.
+            exc_val: The value of the optional exception
+            exc_tb: The traceback of the optional exception
+        """
+        await self.aclose()
+
+    def _get_circuit_breaker(
+        self, base_url: str, endpoint: str
+    ) -> CircuitBreaker | None:
+        """Return the circuit breaker of an endpoint (if circuit breakers are enabled).
+
+        Args:
+            base_url: The base API URL.
+            endpoint: A relative API endpoint.
+
+        Returns:
+            A CircuitBreaker object (or None).
+        """
+        if self._circuit_breakers is None:
+            return None
+        # Node "endpoints" are node IDs, so all nodes share a single breaker:
+        if base_url == NODE_API_URL_BASE:
+            endpoint = ""
+        return self._circuit_breakers.get(base_url, endpoint)
+
+    def _get_session(self) -> ClientSession:
+        """Return the session to make a request with.
+
+        A session provided by the caller is always preferred; otherwise, a single
+        long-lived session (with a pooled, keep-alive connector) is lazily created and
+        owned by this object.
+
+        Returns:
+            An aiohttp ClientSession.
+
+        Raises:
+            AirVisualError: Raised when a session is needed after closing this object.
+        """
+        if self._session and not self._session.closed:
+            return self._session
+
+        if self._owned_session is None or self._owned_session.closed:
+            if self._closed:
+                raise AirVisualError("Can't send requests after closing the client")
+
+            self._owned_session = ClientSession(
+                connector=TCPConnector(
+                    keepalive_timeout=self._keepalive_timeout,
+                    limit_per_host=self._limit_per_host,
+                    ttl_dns_cache=self._dns_cache_ttl,
+                ),
+                timeout=ClientTimeout(total=DEFAULT_REQUEST_TIMEOUT),
+                trace_configs=(
+                    [self._instrumentation.create_trace_config()]
+                    if self._instrumentation
+                    else None
+                ),
+            )
+
+        return self._owned_session
+
+    async def aclose(self) -> None:
+        """Cancel in-flight requests and close the session owned by this object.
+
+        Sessions provided by the caller are left untouched.
+        """
+        self._closed = True
+
+        # In-flight requests (e.g., background refreshes) must not outlive the client
+        # (or recreate its session):
+        if tasks := list(self._in_flight_requests.values()):
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if self._owned_session is None:
+            return
+
+        await self._owned_session.close()
+        self._owned_session = None
+
+    async def _async_acquire_rate_limit(self) -> None:
+        """Draw a call from the rate limiter (if one exists).
+
+        Raises:
+            LimitReachedError: Raised when the rate limiter doesn't block and no call
+                is currently available.
+        """
+        if self._rate_limiter is None:
+            return
+
+        if self._rate_limiter.block:
+            await self._rate_limiter.acquire()
+            return
+
+        if delay := await self._rate_limiter.async_try_acquire():
+            raise LimitReachedError(
+                f"Client-side rate limit reached (next call allowed in {delay:.2f}s)"
+            )
+
+    def _create_event(
+        self, method: str, endpoint: str, source: str, *, attempt: int = 0
+    ) -> RequestEvent | None:
+        """Return a new request event (if anything is listening for one).
+
+        Args:
+            method: An HTTP method.
+            endpoint: A relative API endpoint to query.
+            source: Where the payload of the request comes from.
+            attempt: The attempt number of a request sent over the network.
+
+        Returns:
+            A RequestEvent (or None if instrumentation is disabled).
+        """
+        if self._instrumentation is None or not self._instrumentation.has_listeners:
+            return None
+        return RequestEvent(endpoint, method.lower(), source, attempt=attempt)
+
+    def _emit_event(self, method: str, endpoint: str, source: str) -> None:
+        """Report a request that was answered without the network.
+
+        Args:
+            method: An HTTP method.
+            endpoint: A relative API endpoint to query.
+            source: Where the payload of the request came from.
+        """
+        if event := self._create_event(method, endpoint, source):
+            event.total = event.since()
+            cast(RequestInstrumentation, self._instrumentation).emit(event)
+
+    async def _async_send_attempt(
         self,
         method: str,
         endpoint: str,
         *,
+        attempt: int = 1,
         base_url: str = API_URL_BASE,
         **kwargs: dict[str, Any],
     ) -> dict[str, Any]:
-        """Make a request against the API.
+        """Send a single attempt of a request with the API key (or the pool's keys).
+
+        When a pool of keys is used, a key that turns out to be invalid/expired (or
+        over its limit) is taken out of rotation and the request moves on to the next
+        available key.
+
+        Args:
+            method: An HTTP method.
+            endpoint: A relative API endpoint to query.
+            attempt: The attempt number of the request.
+            base_url: The base API URL to use.
+            **kwargs: Extra arguments to send with the API request.
+
+        Returns:
+            An API response payload.
+
+        Raises:
+            LimitReachedError: Raised when no key in the pool is available.
+        """
+        if self._key_pool is None:
+            return await self._async_send_instrumented_request(
+                method,
+                endpoint,
+                cast(str, self._api_key),
+                attempt=attempt,
+                base_url=base_url,
+                **kwargs,
+            )
+
+        key_error: CloudAPIError | None = None
+
+        while (api_key := self._key_pool.acquire()) is not None:
+            try:
+                data = await self._async_send_instrumented_request(
+                    method,
+                    endpoint,
+                    api_key,
+                    attempt=attempt,
+                    base_url=base_url,
+                    **kwargs,
+                )
+            except (InvalidKeyError, KeyExpiredError, LimitReachedError) as err:
+                self._key_pool.release(api_key, error=True)
+                if isinstance(err, LimitReachedError):
+                    self._key_pool.suspend(api_key)
+                else:
+                    self._key_pool.disable(api_key)
+                LOGGER.debug("Taking an API key out of rotation: %s", err)
+                key_error = err
+                continue
+            except BaseException:
+                self._key_pool.release(api_key, error=True)
+                raise
+
+            self._key_pool.release(api_key)
+            return data
+
+        if key_error is not None:
+            raise key_error
+        raise LimitReachedError("No API key in the pool is currently available")
+
+    async def _async_send_guarded_attempt(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        attempt: int = 1,
+        base_url: str = API_URL_BASE,
+        **kwargs: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Send an attempt of a request through its circuit breaker (if enabled).
+
+        Args:
+            method: An HTTP method.
+            endpoint: A relative API endpoint to query.
+            attempt: The attempt number of the request.
+            base_url: The base API URL to use.
+            **kwargs: Extra arguments to send with the API request.
+
+        Returns:
+            An API response payload.
+
+        Raises:
+            CircuitOpenError: Raised when the endpoint's circuit is open.
+        """
+        if (breaker := self._get_circuit_breaker(base_url, endpoint)) is None:
+            return await self._async_send_hedged_attempt(
+                method, endpoint, attempt=attempt, base_url=base_url, **kwargs
+            )
+
+        if not breaker.allow_request():
+            raise _get_circuit_open_error(breaker)
+
+        try:
+            data = await self._async_send_hedged_attempt(
+                method, endpoint, attempt=attempt, base_url=base_url, **kwargs
+            )
+        except CIRCUIT_BREAKER_ERRORS:
+            breaker.record_failure()
+            raise
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception:
+            # The API answered (albeit with an error), so it's available:
+            breaker.record_success()
+            raise
+
+        breaker.record_success()
+        return data
+
+    async def _async_send_hedged_attempt(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        attempt: int = 1,
+        base_url: str = API_URL_BASE,
+        **kwargs: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Send an attempt of a GET request, hedging it if it is slow.
+
+        If no response arrives within the hedge delay (and the hedge budget and rate
+        limiter allow it), a second attempt is sent; the first successful response
+        wins and the other attempt is cancelled.
 
         Args:
             method: An HTTP method.
             endpoint: A relative API endpoint to query.
+            attempt: The attempt number of the request.
+            base_url: The base API URL to use.
+            **kwargs: Extra arguments to send with the API request.
+
+        Returns:
+            An API response payload.
+        """
+        if self._hedge_policy is None or method.lower() != "get":
+            return await self._async_send_attempt(
+                method, endpoint, attempt=attempt, base_url=base_url, **kwargs
+            )
+
+        hedge_policy = self._hedge_policy
+        hedge_policy.record_request()
+        start = time.monotonic()
+
+        def send() -> asyncio.Task[dict[str, Any]]:
+            """Start an attempt of the request.
+
+            Returns:
+                The attempt task.
+            """
+            return asyncio.create_task(
+                self._async_send_attempt(
+                    method, endpoint, attempt=attempt, base_url=base_url, **kwargs
+                )
+            )
+
+        pending = {send()}
+        try:
+            done, _ = await asyncio.wait(
+                pending, timeout=hedge_policy.get_hedge_delay()
+            )
+            # Only draw a call from the rate limiter if a hedge could be sent, and
+            # only draw the hedge once the rate limiter has allowed the call:
+            if (
+                not done
+                and hedge_policy.budget_remaining
+                and not (
+                    self._rate_limiter and await self._rate_limiter.async_try_acquire()
+                )
+                and hedge_policy.try_hedge()
+            ):
+                LOGGER.debug("Hedging slow request to /%s", endpoint)
+                pending.add(send())
+
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if (error := task.exception()) is None:
+                        hedge_policy.record_latency(time.monotonic() - start)
+                        return task.result()
+
+            raise cast(BaseException, error)
+        finally:
+            # Cancel the losing attempt (or every attempt, if we were cancelled):
+            for task in pending:
+                task.cancel()
+
+    async def _async_send_instrumented_request(
+        self,
+        method: str,
+        endpoint: str,
+        api_key: str,
+        *,
+        attempt: int = 1,
+        base_url: str = API_URL_BASE,
+        **kwargs: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Send a single request and report it to the instrumentation (if enabled).
+
+        Args:
+            method: An HTTP method.
+            endpoint: A relative API endpoint to query.
+            api_key: The API key to send the request with.
+            attempt: The attempt number of the request.
+            base_url: The base API URL to use.
+            **kwargs: Extra arguments to send with the API request.
+
+        Returns:
+            An API response payload.
+        """
+        event = self._create_event(method, endpoint, SOURCE_NETWORK, attempt=attempt)
+
+        try:
+            return await self._async_send_request(
+                method, endpoint, api_key, event, base_url=base_url, **kwargs
+            )
+        except BaseException as err:
+            if event:
+                event.error = type(err)
+            raise
+        finally:
+            if event:
+                event.total = event.since()
+                cast(RequestInstrumentation, self._instrumentation).emit(event)
+
+    async def _async_send_request(
+        self,
+        method: str,
+        endpoint: str,
+        api_key: str,
+        event: RequestEvent | None = None,
+        *,
+        base_url: str = API_URL_BASE,
+        **kwargs: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Send a single request to the API and validate its response.
+
+        Args:
+            method: An HTTP method.
+            endpoint: A relative API endpoint to query.
+            api_key: The API key to send the request with.
+            event: An optional request event to record the response in.
             base_url: The base API URL to use.
             **kwargs: Extra arguments to send with the API request.
 
@@ -141,29 +666,30 @@ class CloudAPI:  # pylint: disable=too-few-public-methods
         kwargs.setdefault("headers", {})
         kwargs["headers"]["Content-Type"] = "application/json"
 
-        kwargs.setdefault("params", {})
-        kwargs["params"]["key"] = self._api_key
+        # Concurrent attempts of a request may use different keys, so the caller's
+        # params are copied rather than updated:
+        kwargs["params"] = {**kwargs.get("params", {}), "key": api_key}
 
-        if use_running_session := self._session and not self._session.closed:
-            session = self._session
-        else:
-            session = ClientSession(
-                timeout=ClientTimeout(total=DEFAULT_REQUEST_TIMEOUT)
-            )
+        session = self._get_session()
+        error_fallback: type[AirVisualError] = AirVisualError
+
+        async with session.request(
+            method, f"{base_url}/{endpoint}", trace_request_ctx=event, **kwargs
+        ) as resp:
+            body = await resp.read()
+
+        if event:
+            event.bytes_received = len(body)
+            event.status = resp.status
 
         try:
-            async with session.request(
-                method, f"{base_url}/{endpoint}", **kwargs
-            ) as resp:
-                data = await resp.json(content_type=None)
-        except JSONDecodeError:
+            data = self._json_decoder(body)
+        except ValueError:
             # The response can't be parsed as JSON, so we'll use its body text
             # in an error:
-            response_text = await resp.text()
+            response_text = body.decode(resp.get_encoding(), errors="replace")
             data = {"status": "fail", "data": {"message": response_text}}
-        finally:
-            if not use_running_session:
-                await session.close()
+            error_fallback = InvalidResponseError
 
         if isinstance(data, str):
             # In some cases, the AirVisual API will return a quoted string in its
@@ -177,6 +703,234 @@ class CloudAPI:  # pylint: disable=too-few-public-methods
 
         LOGGER.debug("Data received for /%s: %s", endpoint, data)
 
-        raise_on_data_error(data)
+        raise_on_data_error(data, fallback=error_fallback)
 
         return cast(dict[str, Any], data)
+
+    async def _async_send_request_with_retries(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        base_url: str = API_URL_BASE,
+        **kwargs: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Send a request, retrying retryable failures according to the retry policy.
+
+        With a retry policy, the request (including every attempt) is also bounded by
+        the policy's deadline.
+
+        Args:
+            method: An HTTP method.
+            endpoint: A relative API endpoint to query.
+            base_url: The base API URL to use.
+            **kwargs: Extra arguments to send with the API request.
+
+        Returns:
+            An API response payload.
+        """
+        if self._retry_policy is not None:
+            self._retry_policy.record_request()
+
+        attempt = 0
+        start = time.monotonic()
+
+        while True:
+            attempt += 1
+
+            # An open circuit fails fast, without waiting on (or spending a call
+            # from) the rate limiter:
+            if (
+                breaker := self._get_circuit_breaker(base_url, endpoint)
+            ) is not None and not breaker.would_allow_request():
+                raise _get_circuit_open_error(breaker)
+
+            # A client-side rate limit error is deliberately raised outside of the
+            # retry handling (so that "fail fast" means just that):
+            await self._async_acquire_rate_limit()
+
+            attempt_coro = self._async_send_guarded_attempt(
+                method, endpoint, attempt=attempt, base_url=base_url, **kwargs
+            )
+
+            try:
+                if self._retry_policy is None:
+                    return await attempt_coro
+                # Bound each attempt by what's left of the deadline, so that a slow
+                # attempt can't push the request past it (asyncio.timeout() would
+                # require Python 3.11):
+                return await asyncio.wait_for(
+                    attempt_coro,
+                    max(self._retry_policy.deadline - (time.monotonic() - start), 0),
+                )
+            except RETRYABLE_ERRORS as err:
+                if self._retry_policy is None or (
+                    (
+                        delay := self._retry_policy.get_retry_delay(
+                            attempt, time.monotonic() - start
+                        )
+                    )
+                    is None
+                ):
+                    raise
+
+                LOGGER.debug(
+                    "Retrying /%s in %.2f seconds (attempt %s failed: %s)",
+                    endpoint,
+                    delay,
+                    attempt,
+                    err,
+                )
+                await asyncio.sleep(delay)
+
+    def _on_in_flight_request_done(
+        self, request_key: CacheKey, task: asyncio.Task[dict[str, Any]]
+    ) -> None:
+        """Stop tracking an in-flight request once it finishes.
+
+        Args:
+            request_key: The key the request was tracked under.
+            task: The finished request task.
+        """
+        self._in_flight_requests.pop(request_key, None)
+        if not task.cancelled():
+            # Mark the exception as retrieved (every waiter has already received it):
+            task.exception()
+
+    def _start_in_flight_request(
+        self,
+        request_key: CacheKey,
+        method: str,
+        endpoint: str,
+        *,
+        base_url: str = API_URL_BASE,
+        **kwargs: dict[str, Any],
+    ) -> asyncio.Task[dict[str, Any]]:
+        """Start a request that other callers can join until it finishes.
+
+        Args:
+            request_key: The key that identifies the request.
+            method: An HTTP method.
+            endpoint: A relative API endpoint to query.
+            base_url: The base API URL to use.
+            **kwargs: Extra arguments to send with the API request.
+
+        Returns:
+            The request task.
+        """
+        task = asyncio.create_task(
+            self._async_fetch(
+                request_key, method, endpoint, base_url=base_url, **kwargs
+            )
+        )
+        task.add_done_callback(partial(self._on_in_flight_request_done, request_key))
+        self._in_flight_requests[request_key] = task
+        return task
+
+    async def _async_fetch(
+        self,
+        request_key: CacheKey,
+        method: str,
+        endpoint: str,
+        *,
+        base_url: str = API_URL_BASE,
+        **kwargs: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Send a request and cache its response (or its "not found" error).
+
+        Args:
+            request_key: The key that identifies the request.
+            method: An HTTP method.
+            endpoint: A relative API endpoint to query.
+            base_url: The base API URL to use.
+            **kwargs: Extra arguments to send with the API request.
+
+        Returns:
+            An API response payload.
+        """
+        try:
+            data = await self._async_send_request_with_retries(
+                method, endpoint, base_url=base_url, **kwargs
+            )
+        except NEGATIVE_CACHEABLE_ERRORS as err:
+            if self._negative_cache is not None and isinstance(err.args[0], dict):
+                self._negative_cache.set(
+                    request_key, err.args[0], self._negative_cache.ttl_for(endpoint)
+                )
+            raise
+
+        if self._cache is not None:
+            await self._cache.async_set(
+                request_key, data, self._cache.ttl_for(endpoint)
+            )
+        return data
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        base_url: str = API_URL_BASE,
+        **kwargs: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Make a request against the API.
+
+        Args:
+            method: An HTTP method.
+            endpoint: A relative API endpoint to query.
+            base_url: The base API URL to use.
+            **kwargs: Extra arguments to send with the API request.
+
+        Returns:
+            An API response payload.
+        """
+        if method.lower() != "get":
+            return await self._async_send_request_with_retries(
+                method, endpoint, base_url=base_url, **kwargs
+            )
+
+        request_key = ResponseCache.build_key(
+            method, f"{base_url}/{endpoint}", kwargs.get("params")
+        )
+
+        if self._cache is not None:
+            if (cached := await self._cache.async_get(request_key)) is not None:
+                LOGGER.debug("Cache hit for /%s", endpoint)
+                self._emit_event(method, endpoint, SOURCE_CACHE)
+                return cached
+
+            if (stale := self._cache.get_stale(request_key)) is not None:
+                # Serve the stale payload right away and refresh it in the background
+                # (if a refresh fails, the stale payload keeps being served until it
+                # leaves the max-stale window):
+                LOGGER.debug("Serving stale payload for /%s", endpoint)
+                self._emit_event(method, endpoint, SOURCE_STALE)
+                if not self._closed and request_key not in self._in_flight_requests:
+                    self._start_in_flight_request(
+                        request_key, method, endpoint, base_url=base_url, **kwargs
+                    )
+                return stale
+
+        if self._negative_cache is not None and (
+            (error_payload := self._negative_cache.get(request_key)) is not None
+        ):
+            LOGGER.debug("Negative cache hit for /%s", endpoint)
+            self._emit_event(method, endpoint, SOURCE_CACHE)
+            raise_on_data_error(error_payload)
+
+        if not self._coalesce_requests:
+            return await self._async_fetch(
+                request_key, method, endpoint, base_url=base_url, **kwargs
+            )
+
+        if (task := self._in_flight_requests.get(request_key)) is None:
+            task = self._start_in_flight_request(
+                request_key, method, endpoint, base_url=base_url, **kwargs
+            )
+        else:
+            LOGGER.debug("Joining in-flight request for /%s", endpoint)
+            self._emit_event(method, endpoint, SOURCE_COALESCED)
+
+        # Shield the shared request so that one cancelled caller doesn't cancel it for
+        # everyone else waiting on it:
+        return await asyncio.shield(task)
@@ -0,0 +1,27 @@
+"""Define the JSON decoders used to parse API responses."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+# A decoder accepts a raw response body and must raise a ValueError (e.g., a
+# json.JSONDecodeError) when that body isn't valid JSON:
+JSONDecoder = Callable[[bytes], Any]
+
+
+def get_default_json_decoder() -> JSONDecoder:
+    """Return the fastest JSON decoder that is installed.
+
+    orjson is used when it is available; otherwise, the standard library is used.
+
+    Returns:
+        A function that decodes JSON bytes.
+    """
+    try:
+        import orjson  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return json.loads
+
+    return orjson.loads
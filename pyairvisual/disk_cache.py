@@ -0,0 +1,249 @@
+"""Define a persistent, multi-process cache tier for Cloud API responses."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import partial
+from pathlib import Path
+from typing import Any, cast
+
+from .decoder import get_default_json_decoder
+
+DEFAULT_DISK_CACHE_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_DISK_CACHE_TIMEOUT = 5.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    expires_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at);
+
+-- A running total of the payload sizes, so that a write never has to sum them:
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta
+    SELECT 'total_size', COALESCE(SUM(size), 0) FROM responses
+    WHERE NOT EXISTS (SELECT 1 FROM meta WHERE name = 'total_size');
+CREATE TRIGGER IF NOT EXISTS responses_insert AFTER INSERT ON responses BEGIN
+    UPDATE meta SET value = value + new.size WHERE name = 'total_size';
+END;
+CREATE TRIGGER IF NOT EXISTS responses_update AFTER UPDATE OF size ON responses BEGIN
+    UPDATE meta SET value = value - old.size + new.size WHERE name = 'total_size';
+END;
+CREATE TRIGGER IF NOT EXISTS responses_delete AFTER DELETE ON responses BEGIN
+    UPDATE meta SET value = value - old.size WHERE name = 'total_size';
+END;
+"""
+
+
+class DiskCache:
+    """Define a size-bounded, TTL-aware cache of API response payloads in SQLite.
+
+    The database runs in WAL mode, so several processes (e.g., the workers of a web
+    server) can share one file: readers never block each other and writers wait for
+    (rather than fail on) a lock held by another process. Entries expire on wall-clock
+    time, since monotonic clocks aren't comparable across processes.
+
+    The combined payload size is kept in a running total (maintained by triggers), so
+    a write only touches the rows it expires or evicts. The `async_*` methods run the
+    database calls in an executor, so that they never block the event loop.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        max_bytes: int = DEFAULT_DISK_CACHE_MAX_BYTES,
+        timeout: float = DEFAULT_DISK_CACHE_TIMEOUT,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            path: The path of the SQLite database file.
+            max_bytes: The maximum combined size of the stored payloads; once it is
+                exceeded, the payloads closest to expiring are evicted first.
+            timeout: The number of seconds to wait for another process's lock.
+        """
+        self._connection: sqlite3.Connection | None = None
+        self._connection_pid: int | None = None
+        self._json_decoder = get_default_json_decoder()
+        self._lock = threading.Lock()
+        self._max_bytes = max_bytes
+        self._path = Path(path)
+        self._timeout = timeout
+
+    def __len__(self) -> int:
+        """Return the number of stored (possibly expired) payloads.
+
+        Returns:
+            The number of stored payloads.
+        """
+        with self._lock:
+            connection = self._get_connection()
+            row = connection.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return cast(int, row[0])
+
+    @staticmethod
+    def _encode_key(key: tuple[Any, ...]) -> str:
+        """Return the database key for a cache key.
+
+        Args:
+            key: A cache key.
+
+        Returns:
+            A string key.
+        """
+        return json.dumps(key, separators=(",", ":"))
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """Remove expired payloads and keep the cache under its size limit.
+
+        Args:
+            connection: The connection to use (within an open transaction).
+        """
+        # The expires_at index limits this to the rows that have actually expired:
+        connection.execute(
+            "DELETE FROM responses WHERE expires_at <= ?", (time.time(),)
+        )
+
+        [(total,)] = connection.execute(
+            "SELECT value FROM meta WHERE name = 'total_size'"
+        )
+        if (excess := total - self._max_bytes) <= 0:
+            return
+
+        keys = []
+        for key, size in connection.execute(
+            "SELECT key, size FROM responses ORDER BY expires_at"
+        ):
+            keys.append((key,))
+            if (excess := excess - size) <= 0:
+                break
+        connection.executemany("DELETE FROM responses WHERE key = ?", keys)
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Return a connection to the database (opening it if necessary).
+
+        A connection is never shared across a fork, so a process that inherits this
+        object (e.g., a pre-forked worker) opens its own. Within a process, the
+        connection is shared by the executor threads (guarded by a lock).
+
+        Returns:
+            A SQLite connection.
+        """
+        if self._connection is not None and self._connection_pid == os.getpid():
+            return self._connection
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(
+            self._path, timeout=self._timeout, check_same_thread=False
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(SCHEMA)
+
+        self._connection = connection
+        self._connection_pid = os.getpid()
+        return connection
+
+    async def async_get(
+        self, key: tuple[Any, ...]
+    ) -> tuple[dict[str, Any], float] | None:
+        """Return a stored payload (without blocking the event loop).
+
+        Args:
+            key: A cache key.
+
+        Returns:
+            A (payload, remaining TTL in seconds) tuple or None.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(self.get, key))
+
+    async def async_set(
+        self, key: tuple[Any, ...], payload: dict[str, Any], ttl: float
+    ) -> None:
+        """Store a payload in the cache (without blocking the event loop).
+
+        Args:
+            key: A cache key.
+            payload: A response payload.
+            ttl: The number of seconds the payload is valid for.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, partial(self.set, key, payload, ttl))
+
+    def clear(self) -> None:
+        """Remove all payloads from the cache."""
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                connection.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        """Close the connection to the database (if one is open)."""
+        with self._lock:
+            if self._connection is None:
+                return
+
+            if self._connection_pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+            self._connection_pid = None
+
+    def get(self, key: tuple[Any, ...]) -> tuple[dict[str, Any], float] | None:
+        """Return a stored payload (if it exists and hasn't expired).
+
+        Args:
+            key: A cache key.
+
+        Returns:
+            A (payload, remaining TTL in seconds) tuple or None.
+        """
+        with self._lock:
+            row = (
+                self._get_connection()
+                .execute(
+                    "SELECT expires_at, payload FROM responses WHERE key = ?",
+                    (self._encode_key(key),),
+                )
+                .fetchone()
+            )
+        if row is None or (ttl := row[0] - time.time()) <= 0:
+            return None
+        return self._json_decoder(row[1]), ttl
+
+    def set(self, key: tuple[Any, ...], payload: dict[str, Any], ttl: float) -> None:
+        """Store a payload in the cache.
+
+        Args:
+            key: A cache key.
+            payload: A response payload.
+            ttl: The number of seconds the payload is valid for.
+        """
+        if ttl <= 0:
+            return
+
+        value = json.dumps(payload, separators=(",", ":")).encode()
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                # An upsert (unlike INSERT OR REPLACE) fires the update trigger that
+                # keeps the running total in sync:
+                connection.execute(
+                    "INSERT INTO responses VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET expires_at = excluded.expires_at, "
+                    "size = excluded.size, payload = excluded.payload",
+                    (self._encode_key(key), time.time() + ttl, len(value), value),
+                )
+                self._evict(connection)
@@ -0,0 +1,93 @@
+"""Define a hedging policy for Cloud API requests."""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+
+from .budget import TokenBudget
+
+DEFAULT_HEDGE_BUDGET_RATIO = 0.05
+DEFAULT_HEDGE_BUDGET_SIZE = 5
+DEFAULT_HEDGE_INITIAL_DELAY = 1.0
+DEFAULT_HEDGE_MIN_SAMPLES = 20
+DEFAULT_HEDGE_PERCENTILE = 95.0
+DEFAULT_HEDGE_WINDOW_SIZE = 200
+
+
+class HedgePolicy:
+    """Define when a slow GET request is "hedged" with a second, identical request.
+
+    The hedge delay tracks a percentile of recent latencies, so only the slowest
+    requests are hedged. Hedges are also drawn from a budget that refills as new
+    requests are made, which caps the extra quota that hedging can spend.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        initial_delay: float = DEFAULT_HEDGE_INITIAL_DELAY,
+        min_samples: int = DEFAULT_HEDGE_MIN_SAMPLES,
+        window_size: int = DEFAULT_HEDGE_WINDOW_SIZE,
+        budget_ratio: float = DEFAULT_HEDGE_BUDGET_RATIO,
+        budget_size: int = DEFAULT_HEDGE_BUDGET_SIZE,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            percentile: The latency percentile (0-100) after which a request is hedged.
+            initial_delay: The hedge delay (in seconds) to use until enough latencies
+                have been recorded.
+            min_samples: The number of latencies needed before the percentile is used.
+            window_size: The number of recent latencies to track.
+            budget_ratio: The fraction of a hedge earned by each new request.
+            budget_size: The max number of hedges that can be banked.
+        """
+        self._budget = TokenBudget(budget_ratio, budget_size)
+        self._initial_delay = initial_delay
+        self._latencies: deque[float] = deque(maxlen=window_size)
+        self._min_samples = min_samples
+        self._percentile = percentile
+
+    @property
+    def budget_remaining(self) -> int:
+        """Return the number of hedges currently available in the budget.
+
+        Returns:
+            A number of hedges.
+        """
+        return self._budget.remaining
+
+    def get_hedge_delay(self) -> float:
+        """Return how long to wait for a response before hedging a request.
+
+        Returns:
+            A number of seconds.
+        """
+        if len(self._latencies) < max(self._min_samples, 1):
+            return self._initial_delay
+
+        latencies = sorted(self._latencies)
+        index = math.ceil(self._percentile / 100 * len(latencies)) - 1
+        return latencies[min(max(index, 0), len(latencies) - 1)]
+
+    def record_latency(self, latency: float) -> None:
+        """Record the latency of a successful request.
+
+        Args:
+            latency: A number of seconds.
+        """
+        self._latencies.append(latency)
+
+    def record_request(self) -> None:
+        """Earn a fraction of a hedge for a new request."""
+        self._budget.record_request()
+
+    def try_hedge(self) -> bool:
+        """Draw a hedge from the budget (if one is available).
+
+        Returns:
+            Whether a hedge may be sent.
+        """
+        return self._budget.try_draw()
@@ -0,0 +1,343 @@
+"""Define helpers to work with Node/Pro measurement histories."""
+
+from __future__ import annotations
+
+import codecs
+import csv
+import os
+import warnings
+from collections.abc import Collection, Sequence
+from dataclasses import dataclass
+from typing import IO, Any, overload
+
+import numpy as np
+
+DEFAULT_TRUNCATE_CHUNK_SIZE = 4096
+
+HISTORY_NON_NUMERIC_COLUMNS = ("Date", "Time")
+HISTORY_TIMESTAMP_COLUMN = "Timestamp"
+
+
+@dataclass(frozen=True)
+class ColumnarHistory:
+    """Define a series of measurements stored as one array per metric."""
+
+    timestamps: np.ndarray
+    metrics: dict[str, np.ndarray]
+
+    def __getitem__(self, metric: str) -> np.ndarray:
+        """Return the array of values for a metric.
+
+        Args:
+            metric: A metric name.
+
+        Returns:
+            A NumPy array.
+        """
+        return self.metrics[metric]
+
+    def __len__(self) -> int:
+        """Return the number of measurements.
+
+        Returns:
+            The number of measurements.
+        """
+        return len(self.timestamps)
+
+
+class ColumnarHistoryBuffer:
+    """Define a growing ColumnarHistory that appends in amortized constant time.
+
+    Measurements are written into arrays whose capacity doubles whenever it runs out,
+    so appending new rows never copies the existing ones (except while growing).
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._metrics: dict[str, np.ndarray] = {}
+        self._size = 0
+        self._timestamps = np.empty(0, dtype="datetime64[ms]")
+
+    def __len__(self) -> int:
+        """Return the number of measurements.
+
+        Returns:
+            The number of measurements.
+        """
+        return self._size
+
+    def _grow(self, capacity: int) -> None:
+        """Move the measurements into larger arrays.
+
+        Args:
+            capacity: The new number of measurements the arrays can hold.
+        """
+        timestamps = np.empty(capacity, dtype=self._timestamps.dtype)
+        timestamps[: self._size] = self._timestamps[: self._size]
+        self._timestamps = timestamps
+
+        for metric, values in self._metrics.items():
+            grown = np.empty(capacity, dtype=values.dtype)
+            grown[: self._size] = values[: self._size]
+            self._metrics[metric] = grown
+
+    def append(self, history: ColumnarHistory) -> None:
+        """Append measurements.
+
+        Args:
+            history: A ColumnarHistory object with the same metrics as the buffer.
+        """
+        if not self._size:
+            self._metrics = {
+                metric: np.empty(0, dtype=values.dtype)
+                for metric, values in history.metrics.items()
+            }
+
+        if (size := self._size + len(history)) > len(self._timestamps):
+            self._grow(max(size, 2 * len(self._timestamps)))
+
+        self._timestamps[self._size : size] = history.timestamps
+        for metric, values in self._metrics.items():
+            values[self._size : size] = history[metric]
+        self._size = size
+
+    def view(self) -> ColumnarHistory:
+        """Return a read-only view of the current measurements (without copying).
+
+        Later appends only write past the end of the view, so it never changes.
+
+        Returns:
+            A ColumnarHistory object.
+        """
+        timestamps = self._timestamps[: self._size]
+        timestamps.flags.writeable = False
+        metrics = {}
+        for metric, values in self._metrics.items():
+            metrics[metric] = values[: self._size]
+            metrics[metric].flags.writeable = False
+        return ColumnarHistory(timestamps, metrics)
+
+
+class HistoryRowsView(Sequence[dict[str, Any]]):
+    """Define a fixed-length, read-only view of a growing list of measurement dicts.
+
+    Rows are only ever appended to the underlying list, so the view never changes.
+    """
+
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        """Initialize.
+
+        Args:
+            rows: A list of measurement dicts (that may grow later).
+        """
+        self._rows = rows
+        self._size = len(rows)
+
+    @overload
+    def __getitem__(self, index: int) -> dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[dict[str, Any]]: ...
+
+    def __getitem__(self, index: int | slice) -> dict[str, Any] | list[dict[str, Any]]:
+        """Return a measurement dict (or a list of them for a slice).
+
+        Args:
+            index: An index or slice.
+
+        Returns:
+            A measurement dict or a list of them.
+        """
+        if isinstance(index, slice):
+            return self._rows[slice(*index.indices(self._size))]
+        return self._rows[range(self._size)[index]]
+
+    def __len__(self) -> int:
+        """Return the number of measurements.
+
+        Returns:
+            The number of measurements.
+        """
+        return self._size
+
+
+HistoryMeasurements = Sequence[dict[str, Any]] | ColumnarHistory
+
+
+def _get_columns(fieldnames: list[str], metrics: Collection[str] | None) -> list[int]:
+    """Return the indices of the columns to parse (the timestamp is always included).
+
+    Args:
+        fieldnames: The (normalized) column names from the header.
+        metrics: The metrics to include (or None for all columns).
+
+    Returns:
+        A list of column indices.
+    """
+    return [
+        idx
+        for idx, name in enumerate(fieldnames)
+        if metrics is None or name == HISTORY_TIMESTAMP_COLUMN or name in metrics
+    ]
+
+
+def _parse_value(value: str) -> float:
+    """Parse a numeric history value (an empty cell is a missing value).
+
+    Args:
+        value: A raw value.
+
+    Returns:
+        A float (NaN if the value is missing).
+    """
+    return float(value) if value.strip() else np.nan
+
+
+def get_empty_columnar_history() -> ColumnarHistory:
+    """Return a ColumnarHistory object without any measurements.
+
+    Returns:
+        A ColumnarHistory object.
+    """
+    return ColumnarHistory(np.empty(0, dtype="datetime64[ms]"), {})
+
+
+def get_last_measurements(
+    history: HistoryMeasurements, count: int
+) -> HistoryMeasurements:
+    """Return the last measurements in a history.
+
+    Args:
+        history: A list of measurement dicts or a ColumnarHistory object.
+        count: The number of measurements to return.
+
+    Returns:
+        The same kind of object as the provided history.
+    """
+    if isinstance(history, ColumnarHistory):
+        return ColumnarHistory(
+            history.timestamps[-count:],
+            {metric: values[-count:] for metric, values in history.metrics.items()},
+        )
+    return history[-count:]
+
+
+def parse_columnar_history(
+    file_obj: IO[bytes],
+    fieldnames: list[str],
+    *,
+    metrics: Collection[str] | None = None,
+) -> ColumnarHistory:
+    """Parse history rows into one array per metric.
+
+    The rows are parsed by NumPy's (C-based) text reader in a single pass over the
+    bytes, without building any per-row objects; columns that aren't requested are
+    never converted or allocated. If a row has empty cells (e.g., a sensor that
+    didn't report), the rows are parsed again with those cells mapped to NaN.
+
+    Args:
+        file_obj: A file-like object positioned at the first row.
+        fieldnames: The (normalized) column names from the header.
+        metrics: The metrics to include (all by default).
+
+    Returns:
+        A ColumnarHistory object.
+    """
+    if not fieldnames:
+        return get_empty_columnar_history()
+
+    usecols = [
+        idx
+        for idx in _get_columns(fieldnames, metrics)
+        if fieldnames[idx] not in HISTORY_NON_NUMERIC_COLUMNS
+    ]
+    position = file_obj.tell()
+    with warnings.catch_warnings():
+        # A history file without any rows isn't an error:
+        warnings.simplefilter("ignore", UserWarning)
+        try:
+            values = np.loadtxt(
+                file_obj, delimiter=";", encoding="utf-8", ndmin=2, usecols=usecols
+            )
+        except ValueError:
+            # Converting every value in Python is slower, so it's only done when
+            # the fast path fails:
+            file_obj.seek(position)
+            values = np.loadtxt(
+                file_obj,
+                converters=_parse_value,
+                delimiter=";",
+                encoding="utf-8",
+                ndmin=2,
+                usecols=usecols,
+            )
+
+    columns = {fieldnames[idx]: column for idx, column in zip(usecols, values.T)}
+    timestamps = columns.pop(HISTORY_TIMESTAMP_COLUMN).astype("datetime64[s]")
+    return ColumnarHistory(timestamps.astype("datetime64[ms]"), columns)
+
+
+def parse_history(
+    file_obj: IO[bytes],
+    fieldnames: list[str],
+    *,
+    columnar: bool,
+    metrics: Collection[str] | None = None,
+) -> HistoryMeasurements:
+    """Parse history rows (without a header).
+
+    Args:
+        file_obj: A file-like object positioned at the first row.
+        fieldnames: The (normalized) column names from the header.
+        columnar: Whether to return a ColumnarHistory object (rather than a list of
+            dicts).
+        metrics: The metrics to include (all columns by default); the timestamp is
+            always included.
+
+    Returns:
+        A list of measurement dicts or a ColumnarHistory object.
+    """
+    if columnar:
+        return parse_columnar_history(file_obj, fieldnames, metrics=metrics)
+
+    lines = codecs.iterdecode(file_obj, "utf-8")
+    if metrics is None:
+        return list(csv.DictReader(lines, fieldnames=fieldnames, delimiter=";"))
+
+    # History files never quote their fields, so each row can be split directly; the
+    # split stops after the last requested column, so the trailing (unrequested)
+    # columns are never split into strings of their own:
+    columns = [(idx, fieldnames[idx]) for idx in _get_columns(fieldnames, metrics)]
+    maxsplit = columns[-1][0] + 1 if columns else 0
+    return [
+        {name: values[idx] for idx, name in columns}
+        for line in lines
+        if (values := line.rstrip("\r\n").split(";", maxsplit)) != [""]
+    ]
+
+
+def truncate_partial_row(
+    file_obj: IO[bytes], *, chunk_size: int = DEFAULT_TRUNCATE_CHUNK_SIZE
+) -> None:
+    """Drop a trailing, partially written row from a file-like object.
+
+    The search for the last newline starts at the end, so only the last row is read.
+
+    Args:
+        file_obj: A seekable, writable file-like object; its position is restored.
+        chunk_size: The number of bytes to read at a time.
+    """
+    position = file_obj.tell()
+    end = file_obj.seek(0, os.SEEK_END)
+
+    while end > position:
+        start = max(end - chunk_size, position)
+        file_obj.seek(start)
+        if (idx := file_obj.read(end - start).rfind(b"\n")) != -1:
+            file_obj.truncate(start + idx + 1)
+            break
+        end = start
+    else:
+        file_obj.truncate(position)
+
+    file_obj.seek(position)
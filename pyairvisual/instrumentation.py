@@ -0,0 +1,204 @@
+"""Define instrumentation hooks for Cloud API requests."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any
+
+from aiohttp import (
+    TraceConfig,
+    TraceConnectionCreateEndParams,
+    TraceConnectionCreateStartParams,
+    TraceDnsResolveHostEndParams,
+    TraceDnsResolveHostStartParams,
+    TraceRequestEndParams,
+)
+
+from .const import LOGGER
+
+# Where the payload of a request came from:
+SOURCE_CACHE = "cache"
+SOURCE_COALESCED = "coalesced"
+SOURCE_NETWORK = "network"
+SOURCE_STALE = "stale"
+
+
+@dataclass(slots=True)
+class RequestEvent:  # pylint: disable=too-many-instance-attributes
+    """Define an instrumentation record of a single request (or cache lookup).
+
+    All durations are in seconds. Phase timings (dns, connect and first_byte) are only
+    recorded when the session that sent the request has this library's trace config
+    (which is always the case for a session owned by a CloudAPI object); connect
+    covers both the TCP connection and the TLS handshake.
+    """
+
+    endpoint: str
+    method: str
+    source: str
+    attempt: int = 0
+    bytes_received: int = 0
+    connect: float | None = None
+    dns: float | None = None
+    error: type[BaseException] | None = None
+    first_byte: float | None = None
+    status: int | None = None
+    total: float | None = None
+    _marks: dict[str, float] = field(default_factory=dict, repr=False)
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+
+    def mark(self, phase: str) -> None:
+        """Mark the start of a request phase.
+
+        Args:
+            phase: The name of the phase.
+        """
+        self._marks[phase] = time.perf_counter()
+
+    def since(self, phase: str | None = None) -> float | None:
+        """Return the time since a phase was marked (or since the event started).
+
+        Args:
+            phase: The name of a marked phase.
+
+        Returns:
+            A duration (or None if the phase was never marked).
+        """
+        if phase is None:
+            return time.perf_counter() - self._started
+        if (started := self._marks.get(phase)) is None:
+            return None
+        return time.perf_counter() - started
+
+
+RequestListener = Callable[[RequestEvent], None]
+
+
+async def _on_dns_resolvehost_start(
+    _: Any, context: SimpleNamespace, __: TraceDnsResolveHostStartParams
+) -> None:
+    """Mark the start of a DNS lookup.
+
+    Args:
+        context: The trace context of the request.
+    """
+    if isinstance(event := context.trace_request_ctx, RequestEvent):
+        event.mark("dns")
+
+
+async def _on_dns_resolvehost_end(
+    _: Any, context: SimpleNamespace, __: TraceDnsResolveHostEndParams
+) -> None:
+    """Record the duration of a DNS lookup.
+
+    Args:
+        context: The trace context of the request.
+    """
+    if isinstance(event := context.trace_request_ctx, RequestEvent):
+        event.dns = event.since("dns")
+
+
+async def _on_connection_create_start(
+    _: Any, context: SimpleNamespace, __: TraceConnectionCreateStartParams
+) -> None:
+    """Mark the start of a new connection.
+
+    Args:
+        context: The trace context of the request.
+    """
+    if isinstance(event := context.trace_request_ctx, RequestEvent):
+        event.mark("connect")
+
+
+async def _on_connection_create_end(
+    _: Any, context: SimpleNamespace, __: TraceConnectionCreateEndParams
+) -> None:
+    """Record the duration of a new connection (including the TLS handshake).
+
+    Args:
+        context: The trace context of the request.
+    """
+    if isinstance(event := context.trace_request_ctx, RequestEvent):
+        event.connect = event.since("connect")
+
+
+async def _on_request_end(
+    _: Any, context: SimpleNamespace, __: TraceRequestEndParams
+) -> None:
+    """Record the time until the response headers arrived.
+
+    Args:
+        context: The trace context of the request.
+    """
+    if isinstance(event := context.trace_request_ctx, RequestEvent):
+        event.first_byte = event.since()
+
+
+class RequestInstrumentation:
+    """Define an object that reports request events to registered listeners."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._listeners: list[RequestListener] = []
+
+    @property
+    def has_listeners(self) -> bool:
+        """Return whether any listeners are registered.
+
+        Returns:
+            Whether any listeners are registered.
+        """
+        return bool(self._listeners)
+
+    def add_listener(self, listener: RequestListener) -> Callable[[], None]:
+        """Register a listener that is called with every request event.
+
+        Listeners are called synchronously (on the event loop), so they should hand
+        expensive work off elsewhere.
+
+        Args:
+            listener: The listener to register.
+
+        Returns:
+            A function that removes the listener.
+        """
+        self._listeners.append(listener)
+
+        def remove() -> None:
+            """Remove the listener."""
+            self._listeners.remove(listener)
+
+        return remove
+
+    @staticmethod
+    def create_trace_config() -> TraceConfig:
+        """Return an aiohttp trace config that records DNS/connect/first-byte timings.
+
+        This is automatically used by sessions that a CloudAPI object owns; to get
+        phase timings from a session you provide, pass this to its `trace_configs`.
+
+        Returns:
+            An aiohttp TraceConfig.
+        """
+        trace_config = TraceConfig()
+        trace_config.on_connection_create_end.append(_on_connection_create_end)
+        trace_config.on_connection_create_start.append(_on_connection_create_start)
+        trace_config.on_dns_resolvehost_end.append(_on_dns_resolvehost_end)
+        trace_config.on_dns_resolvehost_start.append(_on_dns_resolvehost_start)
+        trace_config.on_request_end.append(_on_request_end)
+        return trace_config
+
+    def emit(self, event: RequestEvent) -> None:
+        """Report an event to every registered listener.
+
+        Args:
+            event: The event to report.
+        """
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception("Error in request listener %s", listener)
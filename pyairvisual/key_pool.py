@@ -0,0 +1,162 @@
+"""Define a pool of API keys that requests are spread across."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from .rate_limit import Quota, RateLimiter
+
+DEFAULT_SUSPENSION = 60
+
+
+@dataclass
+class KeyStats:
+    """Define usage counters for a single API key."""
+
+    disabled: bool = False
+    errors: int = 0
+    in_flight: int = 0
+    requests: int = 0
+    suspended_until: float = 0.0
+    suspensions: int = 0
+
+    def is_available(self, now: float) -> bool:
+        """Return whether the key can currently be used.
+
+        Args:
+            now: The current monotonic time.
+
+        Returns:
+            Whether the key can currently be used.
+        """
+        return not self.disabled and self.suspended_until <= now
+
+
+class APIKeyPool:
+    """Define a pool of API keys that picks the least-loaded key for each request.
+
+    If the pool knows each key's quotas, the key with the largest share of its budget
+    left is used; otherwise, the key with the fewest in-flight (and then total)
+    requests is. Keys that are invalid or expired are removed from rotation for good,
+    while keys that hit their limit are suspended for a while.
+    """
+
+    def __init__(
+        self,
+        api_keys: Iterable[str],
+        *,
+        quotas: Iterable[Quota] | None = None,
+        suspension: float = DEFAULT_SUSPENSION,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            api_keys: The API keys to use.
+            quotas: The optional quotas of each key (e.g., those of its plan).
+            suspension: The number of seconds a key that hit its limit is suspended.
+
+        Raises:
+            ValueError: Raised when no API keys are provided.
+        """
+        self._quotas = tuple(quotas or ())
+        self._rate_limiters = {
+            api_key: RateLimiter(self._quotas, block=False)
+            for api_key in dict.fromkeys(api_keys)
+        }
+        self._suspension = suspension
+        self.stats = {api_key: KeyStats() for api_key in self._rate_limiters}
+
+        if not self.stats:
+            raise ValueError("At least one API key is required")
+
+    def __len__(self) -> int:
+        """Return the number of keys in the pool (including unavailable ones).
+
+        Returns:
+            The number of keys.
+        """
+        return len(self.stats)
+
+    def _get_budget_share(self, api_key: str) -> float:
+        """Return the smallest share of any of a key's quotas that is left.
+
+        Args:
+            api_key: An API key.
+
+        Returns:
+            A float between 0 and 1.
+        """
+        remaining = self._rate_limiters[api_key].remaining
+        return min(
+            (remaining[quota.name] / quota.limit for quota in self._quotas),
+            default=1.0,
+        )
+
+    def acquire(self) -> str | None:
+        """Pick a key for a request (and count the request against it).
+
+        Every call that returns a key must be paired with a call to release().
+
+        Returns:
+            An API key (or None if no key is currently available).
+        """
+        now = time.monotonic()
+        candidates = sorted(
+            (
+                api_key
+                for api_key, stats in self.stats.items()
+                if stats.is_available(now)
+            ),
+            key=lambda api_key: (
+                -self._get_budget_share(api_key),
+                self.stats[api_key].in_flight,
+                self.stats[api_key].requests,
+            ),
+        )
+
+        for api_key in candidates:
+            if self._rate_limiters[api_key].try_acquire():
+                continue
+
+            stats = self.stats[api_key]
+            stats.in_flight += 1
+            stats.requests += 1
+            return api_key
+
+        return None
+
+    def disable(self, api_key: str) -> None:
+        """Remove a key (e.g., an invalid or expired one) from rotation for good.
+
+        Args:
+            api_key: An API key.
+        """
+        self.stats[api_key].disabled = True
+
+    def release(self, api_key: str, *, error: bool = False) -> None:
+        """Mark a request made with a key as finished.
+
+        Args:
+            api_key: An API key.
+            error: Whether the request failed.
+        """
+        stats = self.stats[api_key]
+        stats.in_flight -= 1
+        if error:
+            stats.errors += 1
+
+    def suspend(self, api_key: str, duration: float | None = None) -> None:
+        """Take a key (e.g., one that hit its limit) out of rotation for a while.
+
+        Args:
+            api_key: An API key.
+            duration: The number of seconds to suspend the key for (defaults to the
+                pool's suspension period).
+        """
+        stats = self.stats[api_key]
+        stats.suspended_until = time.monotonic() + (
+            self._suspension if duration is None else duration
+        )
+        stats.suspensions += 1
@@ -0,0 +1,374 @@
+"""Define typed, memory-compact models of Cloud API response payloads."""
+
+from __future__ import annotations
+
+import abc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Final
+
+# Marks a lazily-parsed slot that hasn't been accessed yet (None is a valid value):
+_UNSET: Final = object()
+
+
+def _get_payload(fields: dict[str, Any]) -> dict[str, Any]:
+    """Return a payload dict built from a model's fields (skipping empty ones).
+
+    Args:
+        fields: A dict of payload key to value.
+
+    Returns:
+        A payload dict.
+    """
+    return {key: value for key, value in fields.items() if value is not None}
+
+
+def _parse_timestamp(value: str | None) -> datetime | None:
+    """Parse an API timestamp (e.g., "2018-06-10T00:00:00.000Z").
+
+    Args:
+        value: A raw timestamp string.
+
+    Returns:
+        A timezone-aware datetime (or None if there isn't a timestamp).
+    """
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class _PayloadModel(abc.ABC):
+    """Define a base model of a raw payload dict.
+
+    A reference to the raw dict is kept by default, so `raw` returns it unchanged.
+    With `keep_raw=False`, fields are copied into slots so that the raw dict can be
+    garbage-collected, and `raw` rebuilds a dict of the modeled fields (other fields,
+    like a station's forecasts, are dropped).
+    """
+
+    __slots__ = ("_raw",)
+
+    def __init__(self, raw: dict[str, Any], *, keep_raw: bool = True) -> None:
+        """Initialize.
+
+        Args:
+            raw: A raw payload dict.
+            keep_raw: Whether to keep a reference to the raw payload dict.
+        """
+        self._raw = raw if keep_raw else None
+
+    def __repr__(self) -> str:
+        """Return a representation of the model.
+
+        Returns:
+            A string representation.
+        """
+        return f"{type(self).__name__}({self.raw!r})"
+
+    @property
+    def raw(self) -> dict[str, Any]:
+        """Return the raw payload dict (rebuilt from the stored fields if necessary).
+
+        Returns:
+            A payload dict.
+        """
+        if self._raw is not None:
+            return self._raw
+        return self._build_raw()
+
+    @abc.abstractmethod
+    def _build_raw(self) -> dict[str, Any]:
+        """Rebuild a payload dict from the stored fields.
+
+        Returns:
+            A payload dict.
+        """
+
+
+class _TimestampedModel(_PayloadModel):  # pylint: disable=abstract-method
+    """Define a payload model with a lazily-parsed `ts` timestamp."""
+
+    __slots__ = ("_timestamp", "_ts")
+
+    def __init__(self, raw: dict[str, Any], *, keep_raw: bool = True) -> None:
+        """Initialize.
+
+        Args:
+            raw: A raw payload dict.
+            keep_raw: Whether to keep a reference to the raw payload dict.
+        """
+        super().__init__(raw, keep_raw=keep_raw)
+        self._timestamp: Any = _UNSET
+        self._ts: str | None = raw.get("ts")
+
+    @property
+    def timestamp(self) -> datetime | None:
+        """Return the (UTC) time of the reading, parsed on first access.
+
+        Returns:
+            A timezone-aware datetime.
+        """
+        if self._timestamp is _UNSET:
+            self._timestamp = _parse_timestamp(self._ts)
+        return self._timestamp  # type: ignore[no-any-return]
+
+
+@dataclass(frozen=True, slots=True)
+class PollutantConcentration:
+    """Define the concentration of a single pollutant (e.g., "p2")."""
+
+    concentration: float | None
+    aqi_cn: int | None
+    aqi_us: int | None
+
+
+class Pollution(_TimestampedModel):
+    """Define a model of a `current.pollution` payload."""
+
+    __slots__ = (
+        "_pollutant_payloads",
+        "_pollutants",
+        "aqi_cn",
+        "aqi_us",
+        "main_pollutant_cn",
+        "main_pollutant_us",
+    )
+
+    def __init__(self, raw: dict[str, Any], *, keep_raw: bool = True) -> None:
+        """Initialize.
+
+        Args:
+            raw: A raw payload dict.
+            keep_raw: Whether to keep a reference to the raw payload dict.
+        """
+        super().__init__(raw, keep_raw=keep_raw)
+        # Only station payloads have per-pollutant fragments; they're parsed lazily:
+        self._pollutant_payloads: dict[str, dict[str, Any]] | None = {
+            code: value for code, value in raw.items() if isinstance(value, dict)
+        } or None
+        self._pollutants: Any = _UNSET
+        self.aqi_cn: int | None = raw.get("aqicn")
+        self.aqi_us: int | None = raw.get("aqius")
+        self.main_pollutant_cn: str | None = raw.get("maincn")
+        self.main_pollutant_us: str | None = raw.get("mainus")
+
+    def _build_raw(self) -> dict[str, Any]:
+        """Rebuild a payload dict from the stored fields.
+
+        Returns:
+            A payload dict.
+        """
+        return _get_payload(
+            {
+                "ts": self._ts,
+                "aqius": self.aqi_us,
+                "mainus": self.main_pollutant_us,
+                "aqicn": self.aqi_cn,
+                "maincn": self.main_pollutant_cn,
+                **(self._pollutant_payloads or {}),
+            }
+        )
+
+    @property
+    def pollutants(self) -> dict[str, PollutantConcentration]:
+        """Return per-pollutant concentrations (station payloads only).
+
+        Returns:
+            A dict of pollutant code to concentration, built on first access.
+        """
+        if self._pollutants is _UNSET:
+            self._pollutants = {
+                code: PollutantConcentration(
+                    value.get("conc"), value.get("aqicn"), value.get("aqius")
+                )
+                for code, value in (self._pollutant_payloads or {}).items()
+            }
+        return self._pollutants  # type: ignore[no-any-return]
+
+
+class Weather(_TimestampedModel):
+    """Define a model of a `current.weather` payload."""
+
+    __slots__ = (
+        "humidity",
+        "icon",
+        "pressure",
+        "temperature",
+        "wind_direction",
+        "wind_speed",
+    )
+
+    def __init__(self, raw: dict[str, Any], *, keep_raw: bool = True) -> None:
+        """Initialize.
+
+        Args:
+            raw: A raw payload dict.
+            keep_raw: Whether to keep a reference to the raw payload dict.
+        """
+        super().__init__(raw, keep_raw=keep_raw)
+        self.humidity: int | None = raw.get("hu")
+        self.icon: str | None = raw.get("ic")
+        self.pressure: int | None = raw.get("pr")
+        self.temperature: float | None = raw.get("tp")
+        self.wind_direction: int | None = raw.get("wd")
+        self.wind_speed: float | None = raw.get("ws")
+
+    def _build_raw(self) -> dict[str, Any]:
+        """Rebuild a payload dict from the stored fields.
+
+        Returns:
+            A payload dict.
+        """
+        return _get_payload(
+            {
+                "ts": self._ts,
+                "tp": self.temperature,
+                "pr": self.pressure,
+                "hu": self.humidity,
+                "ws": self.wind_speed,
+                "wd": self.wind_direction,
+                "ic": self.icon,
+            }
+        )
+
+
+class Location(_PayloadModel):  # pylint: disable=too-few-public-methods
+    """Define a model of the location fields of a city/station payload."""
+
+    __slots__ = ("city", "coordinates", "country", "state", "station")
+
+    def __init__(self, raw: dict[str, Any], *, keep_raw: bool = True) -> None:
+        """Initialize.
+
+        Args:
+            raw: A raw payload dict.
+            keep_raw: Whether to keep a reference to the raw payload dict.
+        """
+        super().__init__(raw, keep_raw=keep_raw)
+        self.city: str | None = raw.get("city")
+        self.country: str | None = raw.get("country")
+        self.state: str | None = raw.get("state")
+        self.station: str | None = raw.get("name")
+
+        self.coordinates: tuple[float, float] | None
+        try:
+            longitude, latitude = raw["location"]["coordinates"]
+        except (KeyError, TypeError, ValueError):
+            self.coordinates = None
+        else:
+            self.coordinates = float(latitude), float(longitude)
+
+    def _build_raw(self) -> dict[str, Any]:
+        """Rebuild a payload dict from the stored fields.
+
+        Returns:
+            A payload dict.
+        """
+        location = None
+        if self.coordinates is not None:
+            latitude, longitude = self.coordinates
+            location = {"type": "Point", "coordinates": [longitude, latitude]}
+
+        return _get_payload(
+            {
+                "name": self.station,
+                "city": self.city,
+                "state": self.state,
+                "country": self.country,
+                "location": location,
+            }
+        )
+
+
+class AirQualityReading(_PayloadModel):
+    """Define a typed, compact model of an `AirQuality` city/station payload.
+
+    The location, pollution, and weather models are built on first access (or up
+    front with `keep_raw=False`, so that the payload can be released); timestamps and
+    per-pollutant concentrations are parsed on first access.
+    """
+
+    __slots__ = ("_location", "_pollution", "_weather")
+
+    def __init__(self, raw: dict[str, Any], *, keep_raw: bool = True) -> None:
+        """Initialize.
+
+        Args:
+            raw: A payload returned by an `AirQuality` method (e.g., `city()`).
+            keep_raw: Whether to keep a reference to the raw payload dict (rather
+                than rebuilding it from the stored fields when `raw` is accessed).
+        """
+        super().__init__(raw, keep_raw=keep_raw)
+        self._location: Any = _UNSET
+        self._pollution: Any = _UNSET
+        self._weather: Any = _UNSET
+
+        if not keep_raw:
+            self._build_models(raw, keep_raw=False)
+
+    def _build_models(self, raw: dict[str, Any], *, keep_raw: bool = True) -> None:
+        """Build the location, pollution, and weather models.
+
+        Args:
+            raw: A payload returned by an `AirQuality` method (e.g., `city()`).
+            keep_raw: Whether the models should keep references to their payloads.
+        """
+        current = raw.get("current", {})
+        self._location = Location(raw, keep_raw=keep_raw)
+        self._pollution = (
+            None
+            if (pollution := current.get("pollution")) is None
+            else Pollution(pollution, keep_raw=keep_raw)
+        )
+        self._weather = (
+            None
+            if (weather := current.get("weather")) is None
+            else Weather(weather, keep_raw=keep_raw)
+        )
+
+    def _build_raw(self) -> dict[str, Any]:
+        """Rebuild a payload dict from the stored fields.
+
+        Returns:
+            A payload dict.
+        """
+        current = _get_payload(
+            {
+                "weather": None if self.weather is None else self.weather.raw,
+                "pollution": None if self.pollution is None else self.pollution.raw,
+            }
+        )
+        return {**self.location.raw, **({"current": current} if current else {})}
+
+    @property
+    def location(self) -> Location:
+        """Return the location of the reading, built on first access.
+
+        Returns:
+            A Location object.
+        """
+        if self._location is _UNSET:
+            self._build_models(self.raw)
+        return self._location  # type: ignore[no-any-return]
+
+    @property
+    def pollution(self) -> Pollution | None:
+        """Return the pollution data of the reading, built on first access.
+
+        Returns:
+            A Pollution object (or None if the payload doesn't contain any).
+        """
+        if self._pollution is _UNSET:
+            self._build_models(self.raw)
+        return self._pollution  # type: ignore[no-any-return]
+
+    @property
+    def weather(self) -> Weather | None:
+        """Return the weather data of the reading, built on first access.
+
+        Returns:
+            A Weather object (or None if the payload doesn't contain any).
+        """
+        if self._weather is _UNSET:
+            self._build_models(self.raw)
+        return self._weather  # type: ignore[no-any-return]
@@ -4,10 +4,12 @@ from __future__ import annotations
 
 import asyncio
 import csv
+import io
 import json
 import tempfile
 from collections import OrderedDict
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable, Collection, Iterable
+from dataclasses import dataclass, field
 from functools import partial
 from types import TracebackType
 from typing import IO, Any, TypeVar, cast, overload
@@ -16,12 +18,26 @@ import numpy as np
 import smb
 from smb.SMBConnection import SMBConnection
 
+from .batch import DEFAULT_BATCH_CONCURRENCY, BatchResult, async_run_batch
 from .const import LOGGER
 from .errors import AirVisualError
+from .history import (
+    ColumnarHistory,
+    ColumnarHistoryBuffer,
+    HistoryMeasurements,
+    HistoryRowsView,
+    get_last_measurements,
+    parse_history,
+    truncate_partial_row,
+)
 
 API_URL_BASE = "https://www.airvisual.com/api/v2/node"
 
 DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# The number of bytes read per request while reading a history file from its end:
+TAIL_CHUNK_SIZE = 4096
 
 SAMBA_HISTORY_PATTERN = "*_AirVisual_values.txt"
 SMB_SERVICE = "airvisual"
@@ -121,26 +137,79 @@ def _calculate_trends(
         if measurements_to_use != -1:
             values = values[-measurements_to_use:]
 
-        index_array = np.array(values)
-        linear_fit = np.polyfit(
-            index_range,
-            index_array,
-            1,
+        trends[_get_normalized_metric_name(attribute)] = _get_trend(
+            index_range, np.array(values)
         )
-        slope = round(linear_fit[0], 2)
 
-        metric = _get_normalized_metric_name(attribute)
+    return trends
 
-        if slope > 0:
-            trends[metric] = TREND_INCREASING
-        elif slope < 0:
-            trends[metric] = TREND_DECREASING
-        else:
-            trends[metric] = TREND_FLAT
+
+def _calculate_columnar_trends(
+    history: ColumnarHistory, measurements_to_use: int
+) -> dict[str, Any]:
+    """Calculate the trends of all data points in columnar history data.
+
+    Args:
+        history: A ColumnarHistory object.
+        measurements_to_use: The number of measurements to include (-1 for all)
+
+    Returns:
+        An API response payload.
+    """
+    if not history:
+        return {}
+
+    trends = {}
+    for metric in METRICS_TO_TREND:
+        if (values := history.metrics.get(metric)) is None:
+            continue
+
+        if measurements_to_use != -1:
+            values = values[-measurements_to_use:]
+
+        trends[metric] = _get_trend(np.arange(0, len(values)), values)
 
     return trends
 
 
+def _get_columnar_history(
+    rows: list[dict[str, Any]],
+    *,
+    metrics: Collection[str] | None = None,
+    timestamp_key: str = "ts",
+) -> ColumnarHistory:
+    """Convert a list of per-timestamp measurement dicts into a ColumnarHistory.
+
+    Numeric values are written into preallocated float64 arrays in a single pass over
+    the rows (missing values become NaN); non-numeric values are skipped.
+
+    Args:
+        rows: A list of measurement dicts.
+        metrics: The metrics to include (all by default).
+        timestamp_key: The key that holds each measurement's ISO 8601 timestamp.
+
+    Returns:
+        A ColumnarHistory object.
+    """
+    size = len(rows)
+    columns: dict[str, np.ndarray] = {}
+    timestamps = np.empty(size, dtype=object)
+
+    for idx, row in enumerate(rows):
+        for key, value in row.items():
+            if key == timestamp_key:
+                # NumPy doesn't accept the trailing timezone designator:
+                timestamps[idx] = value.rstrip("Z")
+            elif metrics is not None and key not in metrics:
+                continue
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                if (column := columns.get(key)) is None:
+                    column = columns[key] = np.full(size, np.nan)
+                column[idx] = value
+
+    return ColumnarHistory(timestamps.astype("datetime64[ms]"), columns)
+
+
 def _get_normalized_metric_name(key: str) -> str:
     """Return a normalized string (if it exists) for a metric.
 
@@ -153,7 +222,47 @@ def _get_normalized_metric_name(key: str) -> str:
     return METRIC_MAPPING.get(key, key)
 
 
-class NodeCloudAPI:  # pylint: disable=too-few-public-methods
+def _get_trend(index_range: np.ndarray, values: np.ndarray) -> str:
+    """Return the trend of a series of values (based on a linear fit).
+
+    Missing (NaN) values are left out of the fit.
+
+    Args:
+        index_range: The index of each value.
+        values: The values.
+
+    Returns:
+        A trend.
+    """
+    finite = np.isfinite(values)
+    if np.count_nonzero(finite) < 2:
+        return TREND_FLAT
+
+    slope = round(np.polyfit(index_range[finite], values[finite], 1)[0], 2)
+
+    if slope > 0:
+        return TREND_INCREASING
+    if slope < 0:
+        return TREND_DECREASING
+    return TREND_FLAT
+
+
+def _parse_history_header(line: bytes) -> list[str]:
+    """Parse the normalized column names from the header of a history file.
+
+    Args:
+        line: The first line of a history file.
+
+    Returns:
+        A list of column names.
+    """
+    return [
+        _get_normalized_metric_name(name)
+        for name in next(csv.reader([line.decode()], delimiter=";"), [])
+    ]
+
+
+class NodeCloudAPI:
     """Define an object to work with getting Node info via the Cloud API."""
 
     def __init__(self, request: Callable[..., Awaitable]) -> None:
@@ -164,43 +273,111 @@ class NodeCloudAPI:  # pylint: disable=too-few-public-methods
         """
         self._request = request
 
-    async def get_by_node_id(self, node_id: str) -> dict[str, Any]:
+    async def get_by_node_id(
+        self,
+        node_id: str,
+        *,
+        columnar: bool = False,
+        metrics: Iterable[str] | None = None,
+    ) -> dict[str, Any]:
         """Return cloud API data from a node its ID.
 
         Args:
             node_id: A Node ID.
+            columnar: Whether the historical series should be returned as
+                ColumnarHistory objects (rather than lists of dicts).
+            metrics: The metrics to include in ColumnarHistory objects (all by
+                default).
 
         Returns:
             An API response payload.
         """
         data = await self._request("get", node_id, base_url=API_URL_BASE)
-        return cast(dict[str, Any], data)
+
+        if not columnar:
+            return cast(dict[str, Any], data)
+
+        # Don't modify the (possibly cached) response payload:
+        data = {**data, "historical": dict(data.get("historical", {}))}
+        selected_metrics = None if metrics is None else frozenset(metrics)
+        for series, rows in data["historical"].items():
+            if isinstance(rows, list):
+                data["historical"][series] = _get_columnar_history(
+                    rows, metrics=selected_metrics
+                )
+        return data
+
+    def get_by_node_ids(
+        self,
+        node_ids: Iterable[str],
+        *,
+        concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    ) -> AsyncIterator[BatchResult[str, dict[str, Any]]]:
+        """Return cloud API data for many nodes, yielding each as it completes.
+
+        Args:
+            node_ids: Node IDs.
+            concurrency: The max number of concurrent requests.
+
+        Returns:
+            An async iterator of per-node results (errors included).
+        """
+        return async_run_batch(self.get_by_node_id, node_ids, concurrency=concurrency)
 
 
 _SambaOperationReturnType = TypeVar(  # pylint: disable=invalid-name
     "_SambaOperationReturnType",
     int,
     list[smb.base.SharedFile],
-    list[dict[str, Any]],
+    HistoryMeasurements,
+    tuple[int, int],
     None,
 )
 
 
+@dataclass
+class _HistoryFileState:
+    """Define what has been parsed so far from a (growing) history file."""
+
+    filename: str
+    columnar: bool = False
+    fieldnames: list[str] | None = None
+    measurements: list[dict[str, Any]] | ColumnarHistoryBuffer = field(
+        default_factory=list
+    )
+    metrics: frozenset[str] | None = None
+    offset: int = 0
+
+
 class NodeSamba:
     """Define an object to work with getting Node info over Samba."""
 
-    def __init__(self, ip_or_hostname: str, password: str) -> None:
+    def __init__(
+        self,
+        ip_or_hostname: str,
+        password: str,
+        *,
+        incremental_history: bool = False,
+        spool_max_size: int = DEFAULT_SPOOL_MAX_SIZE,
+    ) -> None:
         """Initialize.
 
         Args:
             ip_or_hostname: An IP address or hostname to a Node.
             password: A Samba password for a Node.
+            incremental_history: Whether history files should be synced incrementally
+                (i.e., only the bytes appended since the last poll are retrieved).
+            spool_max_size: The size (in bytes) above which a file retrieved from the
+                Node is spilled from memory to a temporary file on disk.
         """
         self._conn = SMBConnection(SMB_USERNAME, password, "pyairvisual", SMB_SERVICE)
         self._connected = False
+        self._history_states: dict[str, _HistoryFileState] = {}
+        self._incremental_history = incremental_history
         self._ip_or_hostname = ip_or_hostname
         self._latest_history = None
         self._loop = asyncio.get_event_loop()
+        self._spool_max_size = spool_max_size
 
     async def __aenter__(self) -> NodeSamba:
         """Handle the start of a context manager.
@@ -228,8 +405,8 @@ class NodeSamba:
 
     @overload
     async def _execute_samba_operation(
-        self, pysmb_func: Callable[..., list[dict[str, Any]]]
-    ) -> list[dict[str, Any]]: ...
+        self, pysmb_func: Callable[..., HistoryMeasurements]
+    ) -> HistoryMeasurements: ...
 
     @overload
     async def _execute_samba_operation(
@@ -249,6 +426,18 @@ class NodeSamba:
         file_obj: IO[bytes],  # noqa: F841
     ) -> None: ...
 
+    @overload
+    async def _execute_samba_operation(  # pylint: disable=too-many-arguments
+        self,
+        pysmb_func: Callable[..., tuple[int, int]],
+        service: str,  # noqa: F841
+        filepath: str,
+        file_obj: IO[bytes],  # noqa: F841
+        *,
+        offset: int,  # noqa: F841
+        max_length: int = -1,  # noqa: F841
+    ) -> tuple[int, int]: ...
+
     @overload
     async def _execute_samba_operation(  # pylint: disable=too-many-arguments
         self,
@@ -319,52 +508,248 @@ class NodeSamba:
             search=smb.smb_constants.SMB_FILE_ATTRIBUTE_NORMAL,
         )
 
-    async def _async_retrieve_data_from_tempfile(
-        self, tmp_file: IO[bytes]
-    ) -> list[dict[str, Any]]:
-        """Retrieve data from a NamedTemporaryFile.
+    async def _async_parse_history_file(
+        self,
+        file_obj: IO[bytes],
+        *,
+        columnar: bool = False,
+        metrics: frozenset[str] | None = None,
+    ) -> HistoryMeasurements:
+        """Parse the measurements from a retrieved history file.
+
+        A trailing, partially written row is ignored.
 
         Args:
-            tmp_file: A reference to a NamedTemporaryFile.
+            file_obj: A file-like object positioned at the start of a history file.
+            columnar: Whether to return a ColumnarHistory object (rather than a list
+                of dicts).
+            metrics: The metrics to include (all by default).
 
         Returns:
             An API response payload.
         """
 
-        def get_data() -> list[dict[str, Any]]:
+        def get_data() -> HistoryMeasurements:
             """Get the data.
 
             Returns:
                 An API response payload.
             """
-            data = []
-            with open(tmp_file.name, encoding="utf-8") as file:
-                reader = csv.DictReader(file, delimiter=";")
-                for row in reader:
-                    data.append(
-                        {
-                            _get_normalized_metric_name(header): value
-                            for header, value in row.items()
-                        }
-                    )
+            fieldnames = _parse_history_header(file_obj.readline())
+            truncate_partial_row(file_obj)
+            data = parse_history(
+                file_obj, fieldnames, columnar=columnar, metrics=metrics
+            )
 
             LOGGER.debug("Loaded data from file: %s", data)
             return data
 
         return await self._execute_samba_operation(get_data)
 
-    async def _async_store_filepath_in_tempfile(
-        self, filepath: str, tmp_file: IO[bytes]
-    ) -> None:
-        """Save a file to a NamedTemporaryFile object.
+    async def _async_get_history_tail(
+        self,
+        history_file: smb.base.SharedFile,
+        count: int,
+        *,
+        columnar: bool = False,
+        metrics: frozenset[str] | None = None,
+    ) -> HistoryMeasurements:
+        """Return the last measurements in a history file, reading it from its end.
+
+        Only the header and enough chunks from the end of the file to hold the
+        requested number of complete rows are retrieved; a trailing, partially
+        written row is ignored.
+
+        Args:
+            history_file: A Samba file reference.
+            count: The number of measurements to return.
+            columnar: Whether to return a ColumnarHistory object (rather than a list
+                of dicts).
+            metrics: The metrics to include (all by default).
+
+        Returns:
+            An API response payload.
+        """
+        filepath = f"/{history_file.filename}"
+
+        head = b""
+        while (header_end := head.find(b"\n") + 1) == 0:
+            with await self._async_retrieve_file(
+                filepath, offset=len(head), max_length=TAIL_CHUNK_SIZE
+            ) as buffer:
+                if not (chunk := buffer.read()):
+                    return parse_history(io.BytesIO(), [], columnar=columnar)
+                head += chunk
+
+        chunks: list[bytes] = []
+        end = history_file.file_size
+        newlines = 0
+        # A row is only known to be complete if a newline precedes it (unless it's
+        # the first row), so look for one more newline than the number of rows:
+        while end > header_end and newlines <= count:
+            start = max(end - TAIL_CHUNK_SIZE, header_end)
+            with await self._async_retrieve_file(
+                filepath, offset=start, max_length=end - start
+            ) as buffer:
+                chunk = buffer.read()
+            chunks.append(chunk)
+            newlines += chunk.count(b"\n")
+            end = start
+
+        def get_data() -> HistoryMeasurements:
+            """Get the data.
+
+            Returns:
+                An API response payload.
+            """
+            tail = b"".join(reversed(chunks))
+            if end > header_end:
+                # Drop the partial row at the start of the tail:
+                tail = tail[tail.find(b"\n") + 1 :]
+            rows = tail[: tail.rfind(b"\n") + 1].splitlines(keepends=True)[-count:]
+            data = parse_history(
+                io.BytesIO(b"".join(rows)),
+                _parse_history_header(head[:header_end]),
+                columnar=columnar,
+                metrics=metrics,
+            )
+
+            LOGGER.debug("Loaded the last %s rows from file: %s", count, data)
+            return data
+
+        return await self._execute_samba_operation(get_data)
+
+    async def _async_parse_history_tail(
+        self, state: _HistoryFileState, file_obj: IO[bytes]
+    ) -> HistoryMeasurements:
+        """Parse the complete rows from the tail of a history file.
+
+        The state's offset (and header, if it hasn't been parsed yet) is updated; a
+        trailing, partially written row is left for the next sync.
+
+        Args:
+            state: The state of the history file.
+            file_obj: A file-like object holding the bytes after the state's offset.
+
+        Returns:
+            The new measurements.
+        """
+
+        def get_data() -> HistoryMeasurements:
+            """Get the data.
+
+            Returns:
+                The new measurements.
+            """
+            tail = file_obj.read()
+            consumed = tail.rfind(b"\n") + 1
+            rows = io.BytesIO(tail[:consumed])
+            if state.fieldnames is None and consumed:
+                state.fieldnames = _parse_history_header(rows.readline())
+            data = parse_history(
+                rows,
+                state.fieldnames or [],
+                columnar=state.columnar,
+                metrics=state.metrics,
+            )
+            state.offset += consumed
+            return data
+
+        return await self._execute_samba_operation(get_data)
+
+    async def _async_sync_history_file(
+        self,
+        history_file: smb.base.SharedFile,
+        *,
+        columnar: bool = False,
+        metrics: frozenset[str] | None = None,
+    ) -> HistoryMeasurements:
+        """Return the measurements in a history file, retrieving only new bytes.
+
+        The measurements are kept in buffers that only ever grow at the end, so each
+        sync returns a read-only view of them rather than a copy.
+
+        Args:
+            history_file: A Samba file reference.
+            columnar: Whether to return a ColumnarHistory object (rather than a list
+                of dicts).
+            metrics: The metrics to include (all by default).
+
+        Returns:
+            An API response payload.
+        """
+        state = self._history_states.get(history_file.filename)
+        if (
+            state is None
+            or state.offset > history_file.file_size
+            or state.columnar != columnar
+            or state.metrics != metrics
+        ):
+            # This is a new (or rewritten) file or the requested columns changed, so
+            # start over:
+            state = self._history_states[history_file.filename] = _HistoryFileState(
+                history_file.filename,
+                columnar=columnar,
+                measurements=ColumnarHistoryBuffer() if columnar else [],
+                metrics=metrics,
+            )
+
+        if state.offset < history_file.file_size:
+            with await self._async_retrieve_file(
+                f"/{history_file.filename}", offset=state.offset
+            ) as buffer:
+                measurements = await self._async_parse_history_tail(state, buffer)
+
+            if isinstance(state.measurements, ColumnarHistoryBuffer):
+                state.measurements.append(cast(ColumnarHistory, measurements))
+            else:
+                state.measurements.extend(cast(list, measurements))
+
+        LOGGER.debug("Synced %s up to byte %s", history_file.filename, state.offset)
+        if isinstance(state.measurements, ColumnarHistoryBuffer):
+            return state.measurements.view()
+        return HistoryRowsView(state.measurements)
+
+    async def _async_retrieve_file(
+        self, filepath: str, *, offset: int = 0, max_length: int = -1
+    ) -> IO[bytes]:
+        """Retrieve a file from the Node into a spooled buffer.
+
+        The file is kept in memory unless it is larger than the spool size, in which
+        case it is spilled to a temporary file on disk. The caller is responsible for
+        closing the returned buffer.
 
         Args:
             filepath: A filepath on the Node Samba share.
-            tmp_file: A reference to a NamedTemporaryFile.
+            offset: The byte offset to start retrieving the file from.
+            max_length: The max number of bytes to retrieve (-1 for all).
+
+        Returns:
+            A file-like object positioned at the start of the retrieved bytes.
         """
-        await self._execute_samba_operation(
-            self._conn.retrieveFile, SMB_SERVICE, filepath, tmp_file
+        buffer = tempfile.SpooledTemporaryFile(  # pylint: disable=consider-using-with
+            max_size=self._spool_max_size
         )
+        try:
+            if offset or max_length != -1:
+                await self._execute_samba_operation(
+                    self._conn.retrieveFileFromOffset,
+                    SMB_SERVICE,
+                    filepath,
+                    buffer,
+                    offset=offset,
+                    max_length=max_length,
+                )
+            else:
+                await self._execute_samba_operation(
+                    self._conn.retrieveFile, SMB_SERVICE, filepath, buffer
+                )
+        except BaseException:
+            buffer.close()
+            raise
+
+        buffer.seek(0)
+        return cast(IO[bytes], buffer)
 
     async def async_connect(self, *, timeout: int = DEFAULT_CONNECT_TIMEOUT) -> None:
         """Connect to the Node.
@@ -399,13 +784,25 @@ class NodeSamba:
         self._connected = False
 
     async def async_get_history(
-        self, *, include_trends: bool = True, measurements_to_use: int = -1
+        self,
+        *,
+        columnar: bool = False,
+        include_trends: bool = True,
+        measurements_to_use: int = -1,
+        metrics: Iterable[str] | None = None,
     ) -> dict[str, Any]:
         """Get history data from the device.
 
+        If a number of measurements is requested, only the end of the history file
+        (enough to hold those measurements) is read from the device.
+
         Args:
+            columnar: Whether the measurements should be returned as a
+                ColumnarHistory object (rather than a list of dicts).
             include_trends: Whether trend data should be included.
             measurements_to_use: The number of measurements to include (-1 for all)
+            metrics: The (normalized) metrics to include, e.g. "pm2_5" (all columns
+                by default); other columns are skipped while parsing.
 
         Returns:
             An API response payload.
@@ -413,6 +810,8 @@ class NodeSamba:
         Raises:
             NodeProError: Raised when no history files are found.
         """
+        selected_metrics = None if metrics is None else frozenset(metrics)
+
         history_files = await self._async_get_history_files()
         history_files.sort(key=lambda file: file.filename, reverse=True)
 
@@ -421,22 +820,46 @@ class NodeSamba:
                 f"No history files found that match {SAMBA_HISTORY_PATTERN}"
             )
 
+        # Each file keeps its own state (e.g., so that the previous month's file isn't
+        # retrieved in full again while the new month's file has no rows yet), but only
+        # for as long as it is listed:
+        self._history_states = {
+            file.filename: state
+            for file in history_files
+            if (state := self._history_states.get(file.filename)) is not None
+        }
+
         data: dict[str, Any] = {}
 
         for history_file in history_files:
-            tmp_file = (
-                tempfile.NamedTemporaryFile()  # pylint: disable=consider-using-with
-            )
-            await self._async_store_filepath_in_tempfile(
-                f"/{history_file.filename}", tmp_file
-            )
-            tmp_file.seek(0)
-            data["measurements"] = await self._async_retrieve_data_from_tempfile(
-                tmp_file
-            )
-            tmp_file.close()
+            if self._incremental_history:
+                data["measurements"] = await self._async_sync_history_file(
+                    history_file, columnar=columnar, metrics=selected_metrics
+                )
+                if measurements_to_use != -1:
+                    data["measurements"] = get_last_measurements(
+                        data["measurements"], measurements_to_use
+                    )
+            elif measurements_to_use != -1:
+                data["measurements"] = await self._async_get_history_tail(
+                    history_file,
+                    measurements_to_use,
+                    columnar=columnar,
+                    metrics=selected_metrics,
+                )
+            else:
+                with await self._async_retrieve_file(
+                    f"/{history_file.filename}"
+                ) as buffer:
+                    data["measurements"] = await self._async_parse_history_file(
+                        buffer, columnar=columnar, metrics=selected_metrics
+                    )
 
-            if include_trends:
+            if include_trends and columnar:
+                data["trends"] = _calculate_columnar_trends(
+                    data["measurements"], measurements_to_use
+                )
+            elif include_trends:
                 data["trends"] = _calculate_trends(
                     data["measurements"], measurements_to_use
                 )
@@ -452,16 +875,10 @@ class NodeSamba:
         Returns:
             An API response payload.
         """
-        data = {}
-
-        tmp_file = tempfile.NamedTemporaryFile()
-        await self._async_store_filepath_in_tempfile(
-            "/latest_config_measurements.json", tmp_file
-        )
-        tmp_file.seek(0)
-        raw = tmp_file.read()
-        tmp_file.close()
-        data = json.loads(raw.decode())
+        with await self._async_retrieve_file(
+            "/latest_config_measurements.json"
+        ) as buffer:
+            data = json.load(buffer)
 
         LOGGER.debug("Node measurements loaded: %s", data)
 
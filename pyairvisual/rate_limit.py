@@ -0,0 +1,498 @@
+"""Define a client-side rate limiter that mirrors AirVisual plan quotas."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Protocol
+
+MINUTE = 60
+DAY = 24 * 60 * MINUTE
+MONTH = 30 * DAY
+
+DEFAULT_QUOTA_STORE_TIMEOUT = 5.0
+
+PLAN_COMMUNITY = "community"
+PLAN_ENTERPRISE = "enterprise"
+PLAN_STARTUP = "startup"
+
+
+@dataclass(frozen=True)
+class Quota:
+    """Define a number of calls allowed within a period."""
+
+    name: str
+    limit: int
+    period: float
+
+
+# Each plan maps to a sequence of same-typed quotas (rather than a record of fields),
+# so the values are already as structured as they need to be:
+# pylint: disable-next=consider-using-namedtuple-or-dataclass
+PLAN_QUOTAS: dict[str, tuple[Quota, ...]] = {
+    PLAN_COMMUNITY: (
+        Quota("minute", 5, MINUTE),
+        Quota("day", 500, DAY),
+        Quota("month", 10_000, MONTH),
+    ),
+    PLAN_STARTUP: (
+        Quota("minute", 10, MINUTE),
+        Quota("day", 10_000, DAY),
+        Quota("month", 100_000, MONTH),
+    ),
+    PLAN_ENTERPRISE: (
+        Quota("minute", 100, MINUTE),
+        Quota("day", 100_000, DAY),
+        Quota("month", 1_000_000, MONTH),
+    ),
+}
+
+
+class TokenBucket:
+    """Define a token bucket that refills continuously over a quota's period."""
+
+    def __init__(
+        self,
+        quota: Quota,
+        *,
+        tokens: float | None = None,
+        last_refill: float | None = None,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            quota: The quota this bucket enforces.
+            tokens: The number of tokens in the bucket (defaults to a full bucket).
+            last_refill: The time of the last refill (defaults to now).
+        """
+        self._refill_rate = quota.limit / quota.period
+        self.last_refill = time.monotonic() if last_refill is None else last_refill
+        self.quota = quota
+        self.tokens = float(quota.limit) if tokens is None else tokens
+
+    def refill(self, now: float) -> None:
+        """Add the tokens that have accrued since the last refill.
+
+        Args:
+            now: The current monotonic time.
+        """
+        elapsed = max(now - self.last_refill, 0)
+        self.tokens = min(self.quota.limit, self.tokens + elapsed * self._refill_rate)
+        self.last_refill = now
+
+    def seconds_until_available(self) -> float:
+        """Return the number of seconds until a token is available.
+
+        Returns:
+            A number of seconds (0 if a token is available now).
+        """
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self._refill_rate
+
+
+def _try_consume(buckets: Sequence[TokenBucket], now: float) -> float:
+    """Consume a token from every bucket if each one has a token available.
+
+    Args:
+        buckets: The buckets to draw from.
+        now: The current time (on the clock the buckets were created with).
+
+    Returns:
+        0 if the tokens were consumed; otherwise, the number of seconds until they
+        can be.
+    """
+    for bucket in buckets:
+        bucket.refill(now)
+
+    if delay := max(
+        (bucket.seconds_until_available() for bucket in buckets), default=0.0
+    ):
+        return delay
+
+    for bucket in buckets:
+        bucket.tokens -= 1
+    return 0.0
+
+
+class QuotaStore(Protocol):
+    """Define a store of the token buckets that a rate limiter draws calls from."""
+
+    async def async_remaining(self, quotas: Sequence[Quota]) -> dict[str, int]:
+        """Return the number of calls left for each quota (without blocking the loop).
+
+        Args:
+            quotas: The quotas to check.
+        """
+
+    async def async_try_acquire(self, quotas: Sequence[Quota]) -> float:
+        """Consume a call from every quota (without blocking the event loop).
+
+        Args:
+            quotas: The quotas to draw from.
+        """
+
+    def remaining(self, quotas: Sequence[Quota]) -> dict[str, int]:
+        """Return the number of calls left for each quota.
+
+        Args:
+            quotas: The quotas to check.
+        """
+
+    def try_acquire(self, quotas: Sequence[Quota]) -> float:
+        """Consume a call from every quota if one is allowed right now.
+
+        Args:
+            quotas: The quotas to draw from.
+        """
+
+
+class MemoryQuotaStore:
+    """Define a quota store that only covers the current process."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._buckets: dict[Quota, TokenBucket] = {}
+
+    def _get_buckets(self, quotas: Sequence[Quota]) -> list[TokenBucket]:
+        """Return the bucket of each quota (creating full buckets as needed).
+
+        Args:
+            quotas: The quotas to get buckets for.
+
+        Returns:
+            A list of TokenBucket objects.
+        """
+        return [
+            self._buckets.setdefault(quota, TokenBucket(quota)) for quota in quotas
+        ]
+
+    async def async_remaining(self, quotas: Sequence[Quota]) -> dict[str, int]:
+        """Return the number of calls left for each quota (without blocking the loop).
+
+        The buckets live in memory, so this never blocks.
+
+        Args:
+            quotas: The quotas to check.
+
+        Returns:
+            A mapping of quota name to remaining calls.
+        """
+        return self.remaining(quotas)
+
+    async def async_try_acquire(self, quotas: Sequence[Quota]) -> float:
+        """Consume a call from every quota (without blocking the event loop).
+
+        The buckets live in memory, so this never blocks.
+
+        Args:
+            quotas: The quotas to draw from.
+
+        Returns:
+            0 if the call was allowed; otherwise, the number of seconds until it will
+            be.
+        """
+        return self.try_acquire(quotas)
+
+    def remaining(self, quotas: Sequence[Quota]) -> dict[str, int]:
+        """Return the number of calls left for each quota.
+
+        Args:
+            quotas: The quotas to check.
+
+        Returns:
+            A mapping of quota name to remaining calls.
+        """
+        now = time.monotonic()
+        remaining = {}
+        for bucket in self._get_buckets(quotas):
+            bucket.refill(now)
+            remaining[bucket.quota.name] = math.floor(bucket.tokens)
+        return remaining
+
+    def try_acquire(self, quotas: Sequence[Quota]) -> float:
+        """Consume a call from every quota if one is allowed right now.
+
+        Args:
+            quotas: The quotas to draw from.
+
+        Returns:
+            0 if the call was allowed; otherwise, the number of seconds until it will
+            be.
+        """
+        return _try_consume(self._get_buckets(quotas), time.monotonic())
+
+
+class SQLiteQuotaStore:
+    """Define a quota store that processes on the same host share via SQLite.
+
+    Every process (or CloudAPI object) that uses the same database file and namespace
+    draws from a single set of buckets. Each call is one short write transaction, and
+    buckets refill on wall-clock time (which, unlike a monotonic clock, is comparable
+    across processes). Since a transaction may wait on another process's lock,
+    `async_remaining` and `async_try_acquire` run it in an executor.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        namespace: str = "default",
+        timeout: float = DEFAULT_QUOTA_STORE_TIMEOUT,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            path: The path of the SQLite database file.
+            namespace: The name of the shared budget (e.g., one per API key; the API
+                key itself shouldn't be used, since it would be stored in plain text).
+            timeout: The number of seconds to wait for another process's lock.
+        """
+        self._connection: sqlite3.Connection | None = None
+        self._connection_pid: int | None = None
+        self._lock = threading.Lock()
+        self._namespace = namespace
+        self._path = Path(path)
+        self._timeout = timeout
+
+    def _get_buckets(
+        self, connection: sqlite3.Connection, quotas: Sequence[Quota]
+    ) -> list[TokenBucket]:
+        """Load the bucket of each quota (full buckets are used for unknown quotas).
+
+        Args:
+            connection: The connection to use.
+            quotas: The quotas to get buckets for.
+
+        Returns:
+            A list of TokenBucket objects.
+        """
+        stored = {
+            name: (tokens, last_refill)
+            for name, tokens, last_refill in connection.execute(
+                "SELECT name, tokens, last_refill FROM quotas WHERE namespace = ?",
+                (self._namespace,),
+            )
+        }
+        now = time.time()
+        buckets = []
+        for quota in quotas:
+            tokens, last_refill = stored.get(quota.name, (quota.limit, now))
+            buckets.append(TokenBucket(quota, tokens=tokens, last_refill=last_refill))
+        return buckets
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Return a connection to the database (opening it if necessary).
+
+        Returns:
+            A SQLite connection.
+        """
+        if self._connection is not None and self._connection_pid == os.getpid():
+            return self._connection
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        # Transactions are managed explicitly (see try_acquire):
+        connection = sqlite3.connect(
+            self._path,
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=self._timeout,
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode, this only syncs at checkpoints (rather than on every commit):
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS quotas ("
+            "namespace TEXT NOT NULL, name TEXT NOT NULL, tokens REAL NOT NULL, "
+            "last_refill REAL NOT NULL, PRIMARY KEY (namespace, name))"
+        )
+
+        self._connection = connection
+        self._connection_pid = os.getpid()
+        return connection
+
+    async def async_remaining(self, quotas: Sequence[Quota]) -> dict[str, int]:
+        """Return the number of calls left for each quota (without blocking the loop).
+
+        Args:
+            quotas: The quotas to check.
+
+        Returns:
+            A mapping of quota name to remaining calls.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(self.remaining, quotas))
+
+    async def async_try_acquire(self, quotas: Sequence[Quota]) -> float:
+        """Consume a call from every quota (without blocking the event loop).
+
+        Args:
+            quotas: The quotas to draw from.
+
+        Returns:
+            0 if the call was allowed; otherwise, the number of seconds until it will
+            be.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(self.try_acquire, quotas))
+
+    def close(self) -> None:
+        """Close the connection to the database (if one is open)."""
+        with self._lock:
+            if self._connection is None:
+                return
+
+            if self._connection_pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+            self._connection_pid = None
+
+    def remaining(self, quotas: Sequence[Quota]) -> dict[str, int]:
+        """Return the number of calls left for each quota.
+
+        Args:
+            quotas: The quotas to check.
+
+        Returns:
+            A mapping of quota name to remaining calls.
+        """
+        with self._lock:
+            buckets = self._get_buckets(self._get_connection(), quotas)
+
+        now = time.time()
+        remaining = {}
+        for bucket in buckets:
+            bucket.refill(now)
+            remaining[bucket.quota.name] = math.floor(bucket.tokens)
+        return remaining
+
+    def try_acquire(self, quotas: Sequence[Quota]) -> float:
+        """Consume a call from every quota if one is allowed right now.
+
+        Args:
+            quotas: The quotas to draw from.
+
+        Returns:
+            0 if the call was allowed; otherwise, the number of seconds until it will
+            be.
+        """
+        with self._lock:
+            connection = self._get_connection()
+
+            # Take the write lock up front, so that no other process can read the
+            # buckets between our read and our write:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                buckets = self._get_buckets(connection, quotas)
+                if not (delay := _try_consume(buckets, time.time())):
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO quotas VALUES (?, ?, ?, ?)",
+                        [
+                            (self._namespace, b.quota.name, b.tokens, b.last_refill)
+                            for b in buckets
+                        ],
+                    )
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+            connection.execute("COMMIT")
+        return delay
+
+
+class RateLimiter:
+    """Define a rate limiter that draws one token per call from several buckets.
+
+    A call is only allowed when every bucket (e.g., per-minute, per-day, and
+    per-month) has a token available.
+    """
+
+    def __init__(
+        self,
+        quotas: Iterable[Quota],
+        *,
+        block: bool = True,
+        store: QuotaStore | None = None,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            quotas: The quotas to enforce.
+            block: Whether calls over the limit should wait for a slot (as opposed
+                to failing immediately).
+            store: An optional store of the buckets (e.g., one shared by several
+                processes); defaults to an in-process store.
+        """
+        self._lock = asyncio.Lock()
+        self._quotas = tuple(quotas)
+        self._store = store or MemoryQuotaStore()
+        self.block = block
+
+    @classmethod
+    def for_plan(
+        cls, plan: str, *, block: bool = True, store: QuotaStore | None = None
+    ) -> RateLimiter:
+        """Create a rate limiter that matches an AirVisual plan.
+
+        Args:
+            plan: An AirVisual plan name (e.g., "community").
+            block: Whether calls over the limit should wait for a slot.
+            store: An optional store of the buckets.
+
+        Returns:
+            A RateLimiter object.
+        """
+        return cls(PLAN_QUOTAS[plan], block=block, store=store)
+
+    @property
+    def remaining(self) -> dict[str, int]:
+        """Return the number of calls left in each bucket.
+
+        Depending on the store, this may block (e.g., on another process's SQLite
+        lock); use async_remaining() from the event loop.
+
+        Returns:
+            A mapping of quota name to remaining calls.
+        """
+        return self._store.remaining(self._quotas)
+
+    async def acquire(self) -> None:
+        """Wait until a call is allowed and then consume it."""
+        # Waiters queue up on the lock so that slots are handed out in FIFO order:
+        async with self._lock:
+            while delay := await self.async_try_acquire():
+                await asyncio.sleep(delay)
+
+    async def async_remaining(self) -> dict[str, int]:
+        """Return the number of calls left in each bucket (without blocking the loop).
+
+        Returns:
+            A mapping of quota name to remaining calls.
+        """
+        return await self._store.async_remaining(self._quotas)
+
+    async def async_try_acquire(self) -> float:
+        """Consume a call if one is allowed right now (without blocking the loop).
+
+        Returns:
+            0 if the call was allowed; otherwise, the number of seconds until it will
+            be.
+        """
+        return await self._store.async_try_acquire(self._quotas)
+
+    def try_acquire(self) -> float:
+        """Consume a call if one is allowed right now.
+
+        Returns:
+            0 if the call was allowed; otherwise, the number of seconds until it will
+            be.
+        """
+        return self._store.try_acquire(self._quotas)
@@ -0,0 +1,95 @@
+"""Define a retry policy for Cloud API requests."""
+
+from __future__ import annotations
+
+import random
+
+from .budget import TokenBudget
+
+DEFAULT_RETRY_BASE_DELAY = 0.5
+DEFAULT_RETRY_BUDGET_RATIO = 0.2
+DEFAULT_RETRY_BUDGET_SIZE = 10
+DEFAULT_RETRY_DEADLINE = 30.0
+DEFAULT_RETRY_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_MAX_DELAY = 10.0
+
+
+class RetryPolicy:
+    """Define when (and how long to wait before) a failed request is retried.
+
+    Delays use capped exponential backoff with full jitter. Retries are also drawn
+    from a budget that refills as new requests are made, so a burst of failures can't
+    turn into a retry storm.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        max_attempts: int = DEFAULT_RETRY_MAX_ATTEMPTS,
+        base_delay: float = DEFAULT_RETRY_BASE_DELAY,
+        max_delay: float = DEFAULT_RETRY_MAX_DELAY,
+        deadline: float = DEFAULT_RETRY_DEADLINE,
+        budget_ratio: float = DEFAULT_RETRY_BUDGET_RATIO,
+        budget_size: int = DEFAULT_RETRY_BUDGET_SIZE,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            max_attempts: The max number of attempts (including the first) per request.
+            base_delay: The backoff delay (in seconds) before the first retry.
+            max_delay: The max backoff delay (in seconds) before any retry.
+            deadline: The max number of seconds a request (including all of its
+                retries) may take before giving up.
+            budget_ratio: The fraction of a retry earned by each new request.
+            budget_size: The max number of retries that can be banked.
+        """
+        self._base_delay = base_delay
+        self._budget = TokenBudget(budget_ratio, budget_size)
+        self._deadline = deadline
+        self._max_attempts = max_attempts
+        self._max_delay = max_delay
+
+    @property
+    def deadline(self) -> float:
+        """Return the max number of seconds a request (including its retries) may take.
+
+        Returns:
+            A number of seconds.
+        """
+        return self._deadline
+
+    @property
+    def budget_remaining(self) -> int:
+        """Return the number of retries currently available in the budget.
+
+        Returns:
+            A number of retries.
+        """
+        return self._budget.remaining
+
+    def get_retry_delay(self, attempt: int, elapsed: float) -> float | None:
+        """Return how long to wait before retrying a retryable failure.
+
+        A retry is drawn from the budget when one is granted.
+
+        Args:
+            attempt: The number of the attempt that just failed (starting at 1).
+            elapsed: The number of seconds spent on the request so far.
+
+        Returns:
+            A number of seconds to wait, or None if the request shouldn't be retried.
+        """
+        if attempt >= self._max_attempts:
+            return None
+
+        delay = random.uniform(  # noqa: S311
+            0, min(self._max_delay, self._base_delay * 2 ** (attempt - 1))
+        )
+
+        if elapsed + delay > self._deadline or not self._budget.try_draw():
+            return None
+        return delay
+
+    def record_request(self) -> None:
+        """Earn a fraction of a retry for a new (non-retry) request."""
+        self._budget.record_request()
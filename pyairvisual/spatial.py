@@ -0,0 +1,369 @@
+"""Define a local spatial index of known cities and stations."""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any
+
+from .catalog import SupportedCatalog
+
+DEFAULT_CELL_SIZE = 0.25
+DEFAULT_MAX_DISTANCE_KM = 10.0
+# Station/city readings are updated roughly once an hour:
+DEFAULT_PAYLOAD_TTL = 10 * 60
+
+EARTH_RADIUS_KM = 6371.0088
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+KM_PER_DEGREE_LATITUDE = math.pi * EARTH_RADIUS_KM / 180
+
+
+@dataclass(frozen=True)
+class KnownLocation:
+    """Define a city or station whose coordinates are known."""
+
+    latitude: float
+    longitude: float
+    city: str
+    state: str
+    country: str
+    station: str | None = None
+
+    @classmethod
+    def from_payload(cls, data: dict[str, Any]) -> KnownLocation | None:
+        """Create a known location from a city/station API response payload.
+
+        Args:
+            data: The "data" portion of a city/station API response payload.
+
+        Returns:
+            A KnownLocation (or None if the payload doesn't describe one).
+        """
+        try:
+            longitude, latitude = data["location"]["coordinates"]
+            return cls(
+                float(latitude),
+                float(longitude),
+                data["city"],
+                data["state"],
+                data["country"],
+                data.get("name"),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+def geohash_decode(geohash: str) -> tuple[float, float]:
+    """Return the center of a geohash cell.
+
+    Args:
+        geohash: A geohash.
+
+    Returns:
+        A (latitude, longitude) tuple.
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    use_longitude = True
+
+    for char in geohash:
+        bits = GEOHASH_ALPHABET.index(char)
+        for shift in range(4, -1, -1):
+            value_range = lon_range if use_longitude else lat_range
+            midpoint = (value_range[0] + value_range[1]) / 2
+            if bits >> shift & 1:
+                value_range[0] = midpoint
+            else:
+                value_range[1] = midpoint
+            use_longitude = not use_longitude
+
+    return (lat_range[0] + lat_range[1]) / 2, (lon_range[0] + lon_range[1]) / 2
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int) -> str:
+    """Return the geohash of the cell that contains a point.
+
+    Args:
+        latitude: A latitude.
+        longitude: A longitude.
+        precision: The number of geohash characters (i.e., the cell size).
+
+    Returns:
+        A geohash.
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    geohash: list[str] = []
+    bits = 0
+    bit_count = 0
+    use_longitude = True
+
+    while len(geohash) < precision:
+        value, value_range = (
+            (longitude, lon_range) if use_longitude else (latitude, lat_range)
+        )
+        midpoint = (value_range[0] + value_range[1]) / 2
+        if value >= midpoint:
+            bits = (bits << 1) | 1
+            value_range[0] = midpoint
+        else:
+            bits <<= 1
+            value_range[1] = midpoint
+
+        use_longitude = not use_longitude
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(geohash)
+
+
+# Each grid cell maps a (country, state, city, station) key to a location:
+_CellType = dict[tuple[str, ...], KnownLocation]
+
+
+def haversine_distance(
+    latitude1: float, longitude1: float, latitude2: float, longitude2: float
+) -> float:
+    """Return the great-circle distance between two points.
+
+    Args:
+        latitude1: The latitude of the first point.
+        longitude1: The longitude of the first point.
+        latitude2: The latitude of the second point.
+        longitude2: The longitude of the second point.
+
+    Returns:
+        A distance (in kilometers).
+    """
+    phi1 = math.radians(latitude1)
+    phi2 = math.radians(latitude2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1)
+        * math.cos(phi2)
+        * math.sin(math.radians(longitude2 - longitude1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class SpatialIndex:
+    """Define a grid-bucketed index that finds the nearest known location.
+
+    Locations are bucketed into cells of `cell_size` degrees, so a lookup only has
+    to examine the cells that fall within the search radius.
+    """
+
+    def __init__(self, *, cell_size: float = DEFAULT_CELL_SIZE) -> None:
+        """Initialize.
+
+        Args:
+            cell_size: The size (in degrees) of each grid cell.
+        """
+        self._cell_size = cell_size
+        self._cells: defaultdict[tuple[int, int], _CellType] = defaultdict(dict)
+        self._lat_cell_count = math.ceil(180 / cell_size)
+        self._lon_cell_count = math.ceil(360 / cell_size)
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of indexed locations.
+
+        Returns:
+            The number of indexed locations.
+        """
+        return self._size
+
+    @staticmethod
+    def get_key(location: KnownLocation) -> tuple[str, ...]:
+        """Return the key that identifies a location in the index.
+
+        Args:
+            location: A known location.
+
+        Returns:
+            A (country, state, city, station) key.
+        """
+        return location.country, location.state, location.city, location.station or ""
+
+    def _get_cell(self, latitude: float, longitude: float) -> tuple[int, int]:
+        """Return the grid cell that contains a point.
+
+        Args:
+            latitude: A latitude.
+            longitude: A longitude.
+
+        Returns:
+            A (latitude index, longitude index) pair.
+        """
+        lat_idx = min(
+            int((latitude + 90) // self._cell_size), self._lat_cell_count - 1
+        )
+        lon_idx = int((longitude + 180) // self._cell_size) % self._lon_cell_count
+        return lat_idx, lon_idx
+
+    def _get_cells_within(
+        self, latitude: float, longitude: float, distance: float
+    ) -> list[tuple[int, int]]:
+        """Return the grid cells that may contain points within a distance of a point.
+
+        Args:
+            latitude: A latitude.
+            longitude: A longitude.
+            distance: A distance (in kilometers).
+
+        Returns:
+            A list of grid cells.
+        """
+        lat_span = distance / KM_PER_DEGREE_LATITUDE
+        min_lat = max(latitude - lat_span, -90.0)
+        max_lat = min(latitude + lat_span, 90.0)
+        widest_cos = min(
+            math.cos(math.radians(min_lat)), math.cos(math.radians(max_lat))
+        )
+
+        if widest_cos <= 0 or (lon_span := lat_span / widest_cos) >= 180:
+            return list(self._cells)
+
+        min_lat_idx, min_lon_idx = self._get_cell(min_lat, longitude - lon_span)
+        max_lat_idx, _ = self._get_cell(max_lat, longitude + lon_span)
+        lon_cell_span = math.ceil(2 * lon_span / self._cell_size) + 1
+        return [
+            (lat_idx, (min_lon_idx + offset) % self._lon_cell_count)
+            for lat_idx in range(min_lat_idx, max_lat_idx + 1)
+            for offset in range(min(lon_cell_span, self._lon_cell_count))
+        ]
+
+    def add(self, location: KnownLocation) -> None:
+        """Add (or update) a location in the index.
+
+        Args:
+            location: A known location.
+        """
+        key = self.get_key(location)
+        cell = self._cells[self._get_cell(location.latitude, location.longitude)]
+        if key not in cell:
+            self._size += 1
+        cell[key] = location
+
+    def add_catalog_stations(self, catalog: SupportedCatalog) -> None:
+        """Add every station (with coordinates) from a crawled catalog.
+
+        Args:
+            catalog: A SupportedCatalog object.
+        """
+        for station, city, state, country, coordinates in catalog.stations():
+            if coordinates:
+                latitude, longitude = coordinates
+                self.add(
+                    KnownLocation(latitude, longitude, city, state, country, station)
+                )
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        *,
+        max_distance: float = math.inf,
+    ) -> tuple[KnownLocation, float] | None:
+        """Return the nearest known location to a point.
+
+        Args:
+            latitude: A latitude.
+            longitude: A longitude.
+            max_distance: The max distance (in kilometers) to search.
+
+        Returns:
+            A (location, distance in kilometers) pair, or None if no known location
+            is within the max distance.
+        """
+        best_location: KnownLocation | None = None
+        best_distance = max_distance
+
+        for cell in self._get_cells_within(latitude, longitude, max_distance):
+            for location in self._cells.get(cell, {}).values():
+                distance = haversine_distance(
+                    latitude, longitude, location.latitude, location.longitude
+                )
+                if distance <= best_distance:
+                    best_location, best_distance = location, distance
+
+        if best_location is None:
+            return None
+        return best_location, best_distance
+
+
+class LocationIndex:
+    """Define spatial indices of known cities and stations for nearest_* lookups.
+
+    The latest payload of each recorded location is kept alongside it, so that a
+    nearby lookup can be answered without a request while that payload is fresh.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_distance: float = DEFAULT_MAX_DISTANCE_KM,
+        cell_size: float = DEFAULT_CELL_SIZE,
+        payload_ttl: float = DEFAULT_PAYLOAD_TTL,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            max_distance: The max distance (in kilometers) a known location can be
+                from the requested coordinates before the API is used instead.
+            cell_size: The size (in degrees) of each grid cell.
+            payload_ttl: The number of seconds a recorded payload can be returned
+                for (0 to always request a nearby location).
+        """
+        self._payloads: dict[tuple[str, ...], tuple[float, dict[str, Any]]] = {}
+        self.cities = SpatialIndex(cell_size=cell_size)
+        self.max_distance = max_distance
+        self.payload_ttl = payload_ttl
+        self.stations = SpatialIndex(cell_size=cell_size)
+
+    def get_payload(self, kind: str, location: KnownLocation) -> dict[str, Any] | None:
+        """Return the latest recorded payload of a location (if it's still fresh).
+
+        Args:
+            kind: "city" or "station".
+            location: A known location.
+
+        Returns:
+            The "data" portion of a city/station API response payload (or None if
+            there isn't a fresh one).
+        """
+        key = (kind, *SpatialIndex.get_key(location))
+        if (stored := self._payloads.get(key)) is None:
+            return None
+
+        expires_at, data = stored
+        if expires_at <= time.monotonic():
+            del self._payloads[key]
+            return None
+        return data
+
+    def record(self, kind: str, data: dict[str, Any]) -> None:
+        """Index the location described by an API response payload.
+
+        Args:
+            kind: "city" or "station".
+            data: The "data" portion of a city/station API response payload.
+        """
+        if (location := KnownLocation.from_payload(data)) is None:
+            return
+
+        if kind == "city":
+            self.cities.add(location)
+        elif location.station:
+            self.stations.add(location)
+        else:
+            return
+
+        if self.payload_ttl > 0:
+            key = (kind, *SpatialIndex.get_key(location))
+            self._payloads[key] = (time.monotonic() + self.payload_ttl, data)
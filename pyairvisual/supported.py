@@ -17,7 +17,7 @@ class Supported:
         """
         self._request = request
 
-    async def cities(self, country: str, state: str) -> list[dict[str, Any]]:
+    async def cities(self, country: str, state: str) -> list[str]:
         """Return a list of supported cities in a country/state.
 
         Args:
@@ -32,7 +32,7 @@ class Supported:
         )
         return [d["city"] for d in data["data"]]
 
-    async def countries(self) -> list[dict[str, Any]]:
+    async def countries(self) -> list[str]:
         """Return an array of all supported countries.
 
         Returns:
@@ -41,7 +41,7 @@ class Supported:
         data = await self._request("get", "countries")
         return [d["country"] for d in data["data"]]
 
-    async def states(self, country: str) -> list[dict[str, Any]]:
+    async def states(self, country: str) -> list[str]:
         """Return a list of supported states in a country.
 
         Args:
@@ -0,0 +1,151 @@
+"""Define tests for batched Cloud API calls."""
+
+import asyncio
+import json
+
+import aiohttp
+import pytest
+from aresponses import ResponsesMockServer
+
+from pyairvisual.batch import async_run_batch
+from pyairvisual.cloud_api import CloudAPI, NotFoundError
+from tests.common import (
+    TEST_API_KEY,
+    TEST_CITY,
+    TEST_COUNTRY,
+    TEST_NODE_ID,
+    TEST_STATE,
+    TEST_STATION_NAME,
+)
+
+
+@pytest.mark.asyncio
+async def test_cities_many(
+    aresponses: ResponsesMockServer,
+    city_response: str,
+    error_city_not_found_response: str,
+) -> None:
+    """Test getting many cities, with per-item errors.
+
+    Args:
+        aresponses: An aresponses server.
+        city_response: An API response payload.
+        error_city_not_found_response: An API response payload.
+    """
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/city",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(city_response), status=200
+        ),
+    )
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/city",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(error_city_not_found_response), status=400
+        ),
+    )
+
+    locations = [(TEST_CITY, TEST_STATE, TEST_COUNTRY), ("Nowhere", "Nope", "USA")]
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(TEST_API_KEY, session=session)
+        results = [
+            result
+            async for result in cloud_api.air_quality.cities_many(
+                locations, concurrency=1
+            )
+        ]
+
+    assert [result.item for result in results] == locations
+    assert results[0].ok
+    assert results[0].data["city"] == "Los Angeles"
+    assert not results[1].ok
+    assert isinstance(results[1].error, NotFoundError)
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_stations_many_and_nodes(
+    aresponses: ResponsesMockServer, node_by_id_response: str, station_response: str
+) -> None:
+    """Test getting many stations and many nodes.
+
+    Args:
+        aresponses: An aresponses server.
+        node_by_id_response: An API response payload.
+        station_response: An API response payload.
+    """
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/station",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(station_response), status=200
+        ),
+    )
+    aresponses.add(
+        "www.airvisual.com",
+        f"/api/v2/node/{TEST_NODE_ID}",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(node_by_id_response), status=200
+        ),
+    )
+
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(TEST_API_KEY, session=session)
+        stations = [
+            result
+            async for result in cloud_api.air_quality.stations_many(
+                [(TEST_STATION_NAME, "Beijing", "Beijing", "China")]
+            )
+        ]
+        nodes = [
+            result async for result in cloud_api.node.get_by_node_ids([TEST_NODE_ID])
+        ]
+
+    assert stations[0].data["city"] == "Beijing"
+    assert nodes[0].item == TEST_NODE_ID
+    assert nodes[0].ok
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_batch_concurrency() -> None:
+    """Test that a batch never exceeds its concurrency and can be stopped early."""
+    in_flight = 0
+    max_in_flight = 0
+
+    async def double(value: int) -> int:
+        """Double a value (slowly).
+
+        Args:
+            value: The value to double.
+
+        Returns:
+            The doubled value.
+        """
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return value * 2
+
+    results = [result.data async for result in async_run_batch(double, range(20))]
+    assert sorted(results) == [value * 2 for value in range(20)]
+    assert max_in_flight == 10
+
+    batch = async_run_batch(double, range(20), concurrency=3)
+    async for _ in batch:
+        break
+    await batch.aclose()
+    assert max_in_flight == 10
+
+    with pytest.raises(ValueError):
+        await anext(async_run_batch(double, range(1), concurrency=0))
@@ -0,0 +1,406 @@
+"""Define tests for the Cloud API response cache."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+from aresponses import ResponsesMockServer
+
+from pyairvisual.cache import CoordinateGridCache, NegativeCache, ResponseCache
+from pyairvisual.cloud_api import CloudAPI, NotFoundError
+from pyairvisual.errors import AirVisualError
+from tests.common import (
+    TEST_API_KEY,
+    TEST_CITY,
+    TEST_COUNTRY,
+    TEST_LATITUDE,
+    TEST_LONGITUDE,
+    TEST_STATE,
+)
+
+
+@pytest.mark.asyncio
+async def test_cache_hit(aresponses: ResponsesMockServer, city_response: str) -> None:
+    """Test that a repeated request is served from the cache.
+
+    Args:
+        aresponses: An aresponses server.
+        city_response: An API response payload.
+    """
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/city",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(city_response), status=200
+        ),
+    )
+
+    cache = ResponseCache()
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(TEST_API_KEY, session=session, cache=cache)
+        first = await cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+        second = await cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+
+    assert first == second
+    assert len(cache) == 1
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+    assert cache.stats.hit_ratio == 0.5
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_cache_disabled_for_endpoint(
+    aresponses: ResponsesMockServer, countries_response: str
+) -> None:
+    """Test that an endpoint with a TTL of 0 is never cached.
+
+    Args:
+        aresponses: An aresponses server.
+        countries_response: An API response payload.
+    """
+    for _ in range(2):
+        aresponses.add(
+            "api.airvisual.com",
+            "/v2/countries",
+            "get",
+            response=aiohttp.web_response.json_response(
+                json.loads(countries_response), status=200
+            ),
+        )
+
+    cache = ResponseCache(endpoint_ttls={"countries": 0})
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(TEST_API_KEY, session=session, cache=cache)
+        await cloud_api.supported.countries()
+        await cloud_api.supported.countries()
+
+    assert len(cache) == 0
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_coordinate_grid_cache(
+    aresponses: ResponsesMockServer, city_response: str
+) -> None:
+    """Test that nearby nearest_* lookups share a single upstream response.
+
+    Args:
+        aresponses: An aresponses server.
+        city_response: An API response payload.
+    """
+    for _ in range(2):
+        aresponses.add(
+            "api.airvisual.com",
+            "/v2/nearest_city",
+            "get",
+            response=aiohttp.web_response.json_response(
+                json.loads(city_response), status=200
+            ),
+        )
+
+    coordinate_cache = CoordinateGridCache(precision=6)
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(
+            TEST_API_KEY, session=session, coordinate_cache=coordinate_cache
+        )
+        await cloud_api.air_quality.nearest_city(
+            latitude=TEST_LATITUDE, longitude=TEST_LONGITUDE
+        )
+
+        # ~20 m away (same grid cell):
+        data = await cloud_api.air_quality.nearest_city(
+            latitude=TEST_LATITUDE + 0.0002, longitude=TEST_LONGITUDE
+        )
+        assert data["city"] == "Los Angeles"
+
+        # ~5 km away (a different grid cell):
+        await cloud_api.air_quality.nearest_city(
+            latitude=TEST_LATITUDE + 0.05, longitude=TEST_LONGITUDE
+        )
+
+    assert len(coordinate_cache) == 2
+    assert coordinate_cache.stats.hits == 1
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_coordinate_grid_cache_coalescing(
+    aresponses: ResponsesMockServer, city_response: str
+) -> None:
+    """Test that concurrent (cold) lookups within a grid cell share one request.
+
+    Args:
+        aresponses: An aresponses server.
+        city_response: An API response payload.
+    """
+    requested_coordinates = []
+
+    async def nearest_city_response(
+        request: aiohttp.web.Request,
+    ) -> aiohttp.web.Response:
+        """Record the requested coordinates and return a response.
+
+        Args:
+            request: An aiohttp request.
+
+        Returns:
+            An aiohttp response.
+        """
+        requested_coordinates.append((request.query["lat"], request.query["lon"]))
+        return aiohttp.web_response.json_response(json.loads(city_response))
+
+    aresponses.add(
+        "api.airvisual.com", "/v2/nearest_city", "get", response=nearest_city_response
+    )
+
+    coordinate_cache = CoordinateGridCache(precision=6)
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(
+            TEST_API_KEY, session=session, coordinate_cache=coordinate_cache
+        )
+        # ~20 m apart (same grid cell):
+        first, second = await asyncio.gather(
+            cloud_api.air_quality.nearest_city(
+                latitude=TEST_LATITUDE, longitude=TEST_LONGITUDE
+            ),
+            cloud_api.air_quality.nearest_city(
+                latitude=TEST_LATITUDE + 0.0002, longitude=TEST_LONGITUDE
+            ),
+        )
+
+    assert first == second
+    latitude, longitude = coordinate_cache.get_cell_center(
+        TEST_LATITUDE, TEST_LONGITUDE
+    )
+    assert requested_coordinates == [(str(latitude), str(longitude))]
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_negative_cache_hit(
+    aresponses: ResponsesMockServer, error_city_not_found_response: str
+) -> None:
+    """Test that a repeated "not found" lookup is answered from the negative cache.
+
+    Args:
+        aresponses: An aresponses server.
+        error_city_not_found_response: An API response payload.
+    """
+    for _ in range(2):
+        aresponses.add(
+            "api.airvisual.com",
+            "/v2/city",
+            "get",
+            response=aiohttp.web_response.json_response(
+                json.loads(error_city_not_found_response), status=200
+            ),
+        )
+
+    negative_cache = NegativeCache(max_size=1)
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(
+            TEST_API_KEY, session=session, negative_cache=negative_cache
+        )
+        for _ in range(2):
+            with pytest.raises(NotFoundError):
+                await cloud_api.air_quality.city(
+                    "Los Angelos", TEST_STATE, TEST_COUNTRY
+                )
+
+        # A different lookup evicts the oldest error:
+        with pytest.raises(NotFoundError):
+            await cloud_api.air_quality.city("Las Angeles", TEST_STATE, TEST_COUNTRY)
+
+    assert len(negative_cache) == 1
+    assert negative_cache.stats.hits == 1
+    assert negative_cache.stats.evictions == 1
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_stale_while_revalidate(
+    aresponses: ResponsesMockServer, city_response: str
+) -> None:
+    """Test that an expired payload is served while it is refreshed.
+
+    Args:
+        aresponses: An aresponses server.
+        city_response: An API response payload.
+    """
+    refreshed_response = json.loads(city_response)
+    refreshed_response["data"]["current"]["pollution"]["aqius"] = 100
+
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/city",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(city_response), status=200
+        ),
+    )
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/city",
+        "get",
+        response=aresponses.Response(text="Bad Gateway", status=502),
+    )
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/city",
+        "get",
+        response=aiohttp.web_response.json_response(refreshed_response, status=200),
+    )
+
+    cache = ResponseCache(endpoint_ttls={"city": 0.01}, max_stale=60)
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(TEST_API_KEY, session=session, cache=cache)
+        data = await cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+        assert data["current"]["pollution"]["aqius"] == 66
+
+        for _ in range(2):
+            # The first refresh fails (so the stale payload is kept), while the second
+            # one succeeds:
+            await asyncio.sleep(0.02)
+            data = await cloud_api.air_quality.city(
+                TEST_CITY, TEST_STATE, TEST_COUNTRY
+            )
+            assert data["current"]["pollution"]["aqius"] == 66
+            # Wait for the background refresh:
+            refreshes = cloud_api._in_flight_requests.values()  # pylint: disable=W0212
+            await asyncio.gather(*refreshes, return_exceptions=True)
+
+        data = await cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+        assert data["current"]["pollution"]["aqius"] == 100
+
+    assert cache.stats.stale_hits == 2
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_close_cancels_background_refresh(
+    aresponses: ResponsesMockServer, city_response: str
+) -> None:
+    """Test that closing the client cancels (and doesn't outlive) background refreshes.
+
+    Args:
+        aresponses: An aresponses server.
+        city_response: An API response payload.
+    """
+
+    async def slow_response(_: aiohttp.web.Request) -> aiohttp.web.Response:
+        """Return a response after a long delay.
+
+        Returns:
+            An aiohttp response.
+        """
+        await asyncio.sleep(10)
+        return aiohttp.web_response.json_response(json.loads(city_response))
+
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/city",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(city_response), status=200
+        ),
+    )
+    aresponses.add("api.airvisual.com", "/v2/city", "get", response=slow_response)
+
+    cloud_api = CloudAPI(
+        TEST_API_KEY, cache=ResponseCache(endpoint_ttls={"city": 0.01}, max_stale=60)
+    )
+    await cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+    await asyncio.sleep(0.02)
+    await cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+
+    # Let the background refresh reach the (slow) API:
+    await asyncio.sleep(0.1)
+    refreshes = list(cloud_api._in_flight_requests.values())  # pylint: disable=W0212
+    assert len(refreshes) == 1
+    await cloud_api.aclose()
+    assert refreshes[0].cancelled()
+
+    # A closed client can still serve stale payloads, but never starts a refresh (or
+    # creates a new session):
+    await cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+    assert not cloud_api._in_flight_requests  # pylint: disable=W0212
+    with pytest.raises(AirVisualError):
+        await cloud_api.air_quality.ranking()
+
+
+def test_stale_window_expiration() -> None:
+    """Test that a payload isn't served once it leaves the max-stale window."""
+    cache = ResponseCache(default_ttl=10, endpoint_ttls={}, max_stale=20)
+    key = cache.build_key("get", "https://example.com/city")
+
+    with patch("pyairvisual.cache.time.monotonic", return_value=100.0):
+        cache.set(key, {"status": "success"}, cache.ttl_for("city"))
+
+    with patch("pyairvisual.cache.time.monotonic", return_value=125.0):
+        assert cache.get(key) is None
+        assert cache.get_stale(key) == {"status": "success"}
+
+    with patch("pyairvisual.cache.time.monotonic", return_value=130.0):
+        assert cache.get(key) is None
+        assert cache.get_stale(key) is None
+
+    assert len(cache) == 0
+    assert cache.get_stale(key) is None
+
+
+def test_cache_expiration() -> None:
+    """Test that an expired payload is treated as a miss."""
+    cache = ResponseCache(default_ttl=10, endpoint_ttls={})
+    key = cache.build_key("get", "https://example.com/city")
+
+    with patch("pyairvisual.cache.time.monotonic", return_value=100.0):
+        cache.set(key, {"status": "success"}, cache.ttl_for("city"))
+        assert cache.get(key) == {"status": "success"}
+
+    with patch("pyairvisual.cache.time.monotonic", return_value=110.0):
+        assert cache.get(key) is None
+
+    assert len(cache) == 0
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_cache_key_excludes_api_key() -> None:
+    """Test that the API key never ends up in a cache key."""
+    key = ResponseCache.build_key(
+        "GET", "https://example.com/city", {"city": TEST_CITY, "key": TEST_API_KEY}
+    )
+    assert key == ("get", "https://example.com/city", (("city", TEST_CITY),))
+    assert key == ResponseCache.build_key(
+        "get", "https://example.com/city", {"key": "another_key", "city": TEST_CITY}
+    )
+
+
+def test_cache_lru_eviction() -> None:
+    """Test that the least recently used payload is evicted first."""
+    cache = ResponseCache(max_size=2)
+    keys = [cache.build_key("get", f"https://example.com/{idx}") for idx in range(3)]
+
+    cache.set(keys[0], {"idx": 0}, 60)
+    cache.set(keys[1], {"idx": 1}, 60)
+    assert cache.get(keys[0]) == {"idx": 0}
+    cache.set(keys[2], {"idx": 2}, 60)
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == {"idx": 0}
+    assert cache.get(keys[2]) == {"idx": 2}
+    assert cache.stats.evictions == 1
+
+    cache.clear()
+    assert len(cache) == 0
+    assert ResponseCache().stats.hit_ratio == 0.0
@@ -0,0 +1,187 @@
+"""Define tests for crawling supported locations."""
+
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+from aresponses import ResponsesMockServer
+
+from pyairvisual.catalog import SupportedCatalog, async_crawl_supported_locations
+from pyairvisual.cloud_api import CloudAPI
+from tests.common import TEST_API_KEY, TEST_CITY, TEST_COUNTRY, TEST_STATE
+
+
+def add_location_response(
+    aresponses: ResponsesMockServer, endpoint: str, kind: str, names: list[str]
+) -> None:
+    """Add a mocked response for a supported locations endpoint.
+
+    Args:
+        aresponses: An aresponses server.
+        endpoint: The endpoint to mock.
+        kind: The kind of location (e.g., "country").
+        names: The location names to return.
+    """
+    aresponses.add(
+        "api.airvisual.com",
+        f"/v2/{endpoint}",
+        "get",
+        response=aiohttp.web_response.json_response(
+            {"status": "success", "data": [{kind: name} for name in names]},
+            status=200,
+        ),
+    )
+
+
+@pytest.mark.asyncio
+async def test_crawl(
+    aresponses: ResponsesMockServer, stations_response: str, tmp_path: Path
+) -> None:
+    """Test crawling, saving, and loading the catalog of supported locations.
+
+    Args:
+        aresponses: An aresponses server.
+        stations_response: An API response payload.
+        tmp_path: A temporary directory.
+    """
+    add_location_response(aresponses, "countries", "country", [TEST_COUNTRY])
+    add_location_response(aresponses, "states", "state", [TEST_STATE])
+    add_location_response(aresponses, "cities", "city", [TEST_CITY])
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/stations",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(stations_response), status=200
+        ),
+    )
+
+    checkpoint_path = tmp_path / "catalog.json"
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(TEST_API_KEY, session=session)
+        catalog = await async_crawl_supported_locations(
+            cloud_api.supported, include_stations=True, checkpoint_path=checkpoint_path
+        )
+
+    catalog = SupportedCatalog.load(checkpoint_path)
+    assert catalog.is_supported(TEST_COUNTRY)
+    assert catalog.is_supported(TEST_COUNTRY, TEST_STATE, TEST_CITY)
+    assert catalog.is_supported(
+        TEST_COUNTRY, TEST_STATE, TEST_CITY, "US Embassy in Beijing"
+    )
+    assert not catalog.is_supported("Atlantis")
+    assert not catalog.is_supported(TEST_COUNTRY, TEST_STATE, "Nowhere")
+    assert list(catalog.stations()) == [
+        (
+            "US Embassy in Beijing",
+            TEST_CITY,
+            TEST_STATE,
+            TEST_COUNTRY,
+            [39.954352, 116.466258],
+        ),
+        (
+            "Botanical Garden",
+            TEST_CITY,
+            TEST_STATE,
+            TEST_COUNTRY,
+            [40.0078007235, 116.2148532181],
+        ),
+    ]
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_crawl_checkpoints_within_level(
+    aresponses: ResponsesMockServer, tmp_path: Path
+) -> None:
+    """Test that the catalog is saved every N completed requests within a level.
+
+    Args:
+        aresponses: An aresponses server.
+        tmp_path: A temporary directory.
+    """
+    countries = ["Country A", "Country B", "Country C"]
+    add_location_response(aresponses, "countries", "country", countries)
+    for _ in countries:
+        add_location_response(aresponses, "states", "state", [])
+
+    saved_counts = []
+
+    def save(catalog: SupportedCatalog, _: Any) -> None:
+        """Record how many countries had been crawled at each save.
+
+        Args:
+            catalog: The catalog being saved.
+        """
+        saved_counts.append(
+            sum(states is not None for states in (catalog.countries or {}).values())
+        )
+
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(TEST_API_KEY, session=session)
+        with patch.object(SupportedCatalog, "save", autospec=True, side_effect=save):
+            await async_crawl_supported_locations(
+                cloud_api.supported,
+                checkpoint_path=tmp_path / "catalog.json",
+                checkpoint_every=2,
+            )
+
+    # Once within the states level, and then at the end of each level:
+    assert saved_counts == [2, 3, 3]
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_crawl_resume(
+    aresponses: ResponsesMockServer, error_generic_response: str
+) -> None:
+    """Test that a crawl resumes from the nodes that previously failed.
+
+    Args:
+        aresponses: An aresponses server.
+        error_generic_response: An API response payload.
+    """
+    add_location_response(aresponses, "countries", "country", [TEST_COUNTRY])
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/states",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(error_generic_response), status=404
+        ),
+    )
+    add_location_response(aresponses, "states", "state", [TEST_STATE])
+    add_location_response(aresponses, "cities", "city", [TEST_CITY])
+
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(TEST_API_KEY, session=session)
+        catalog = await async_crawl_supported_locations(cloud_api.supported)
+        assert catalog.countries == {TEST_COUNTRY: None}
+
+        catalog = await async_crawl_supported_locations(
+            cloud_api.supported, catalog=catalog
+        )
+
+    assert catalog.countries == {TEST_COUNTRY: {TEST_STATE: {TEST_CITY: None}}}
+    assert catalog.is_supported(TEST_COUNTRY, TEST_STATE, TEST_CITY)
+    assert not list(catalog.stations())
+
+    aresponses.assert_plan_strictly_followed()
+
+
+def test_load_invalid_catalog(tmp_path: Path) -> None:
+    """Test loading a file that isn't a compatible catalog.
+
+    Args:
+        tmp_path: A temporary directory.
+    """
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps({"version": 0, "countries": {}}), encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        SupportedCatalog.load(path)
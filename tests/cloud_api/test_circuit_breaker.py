@@ -0,0 +1,195 @@
+"""Define tests for Cloud API circuit breakers."""
+
+import asyncio
+import json
+import time
+
+import aiohttp
+import pytest
+from aresponses import ResponsesMockServer
+
+from pyairvisual.circuit_breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    CircuitBreakers,
+)
+from pyairvisual.cloud_api import (
+    API_URL_BASE,
+    NODE_API_URL_BASE,
+    CircuitOpenError,
+    CloudAPI,
+    InvalidResponseError,
+    NotFoundError,
+)
+from pyairvisual.rate_limit import Quota, RateLimiter
+from tests.common import TEST_API_KEY, TEST_CITY, TEST_COUNTRY, TEST_STATE
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_and_recovers(
+    aresponses: ResponsesMockServer,
+    countries_response: str,
+    error_city_not_found_response: str,
+) -> None:
+    """Test that a failing endpoint is refused until a trial request succeeds.
+
+    Args:
+        aresponses: An aresponses server.
+        countries_response: An API response payload.
+        error_city_not_found_response: An API response payload.
+    """
+    for _ in range(2):
+        aresponses.add(
+            "api.airvisual.com",
+            "/v2/city",
+            "get",
+            response=aresponses.Response(text="Bad Gateway", status=502),
+        )
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/countries",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(countries_response), status=200
+        ),
+    )
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/city",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(error_city_not_found_response), status=200
+        ),
+    )
+
+    state_changes = []
+    circuit_breakers = CircuitBreakers(failure_threshold=2, recovery_timeout=0.2)
+    circuit_breakers.add_listener(
+        lambda breaker, old_state, new_state: state_changes.append(
+            (breaker.name, old_state, new_state)
+        )
+    )
+
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(
+            TEST_API_KEY, session=session, circuit_breakers=circuit_breakers
+        )
+        for _ in range(2):
+            with pytest.raises(InvalidResponseError):
+                await cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+
+        with pytest.raises(CircuitOpenError):
+            await cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+
+        # Other endpoints have their own breakers:
+        await cloud_api.supported.countries()
+
+        # Once the recovery timeout passes, a trial request is let through (and an
+        # error from the API still means that the API is available):
+        await asyncio.sleep(circuit_breakers.get(API_URL_BASE, "city").retry_after)
+        with pytest.raises(NotFoundError):
+            await cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+
+    city_breaker_name = f"{API_URL_BASE}/city"
+    assert state_changes == [
+        (city_breaker_name, STATE_CLOSED, STATE_OPEN),
+        (city_breaker_name, STATE_OPEN, STATE_HALF_OPEN),
+        (city_breaker_name, STATE_HALF_OPEN, STATE_CLOSED),
+    ]
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_skips_rate_limiter(aresponses: ResponsesMockServer) -> None:
+    """Test that an open circuit fails fast without waiting on the rate limiter.
+
+    Args:
+        aresponses: An aresponses server.
+    """
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/city",
+        "get",
+        response=aresponses.Response(text="Bad Gateway", status=502),
+    )
+
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(
+            TEST_API_KEY,
+            session=session,
+            circuit_breakers=CircuitBreakers(failure_threshold=1),
+            rate_limiter=RateLimiter([Quota("minute", 1, 5)]),
+        )
+        with pytest.raises(InvalidResponseError):
+            await cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+
+        start = time.monotonic()
+        with pytest.raises(CircuitOpenError):
+            await cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+        assert time.monotonic() - start < 1
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_node_breaker_shared(aresponses: ResponsesMockServer) -> None:
+    """Test that all node IDs share a single breaker.
+
+    Args:
+        aresponses: An aresponses server.
+    """
+    for node_id in ("1", "2"):
+        aresponses.add(
+            "www.airvisual.com",
+            f"/api/v2/node/{node_id}",
+            "get",
+            response=aresponses.Response(text="Bad Gateway", status=502),
+        )
+
+    circuit_breakers = CircuitBreakers(failure_threshold=2)
+
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(
+            TEST_API_KEY, session=session, circuit_breakers=circuit_breakers
+        )
+        for node_id in ("1", "2"):
+            with pytest.raises(InvalidResponseError):
+                await cloud_api.node.get_by_node_id(node_id)
+
+        # A node that has never been requested is refused, too:
+        with pytest.raises(CircuitOpenError, match=f"{NODE_API_URL_BASE} is open"):
+            await cloud_api.node.get_by_node_id("3")
+
+    assert circuit_breakers.get(NODE_API_URL_BASE, "").state == STATE_OPEN
+
+    aresponses.assert_plan_strictly_followed()
+
+
+def test_half_open_trials() -> None:
+    """Test that half-open breakers limit (and can re-open on) trial requests."""
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0)
+    assert breaker.retry_after == 0.0
+
+    breaker.record_failure()
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.would_allow_request()
+    assert breaker.allow_request()
+    assert not breaker.would_allow_request()
+    assert not breaker.allow_request()
+
+    breaker.release()
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.retry_after == 0.0
+    assert breaker.state == STATE_HALF_OPEN
+
+    breaker = CircuitBreaker("test", recovery_timeout=60)
+    for _ in range(5):
+        breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert not breaker.allow_request()
+    assert breaker.retry_after > 59
@@ -0,0 +1,182 @@
+"""Define tests for the persistent Cloud API response cache."""
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+from aresponses import ResponsesMockServer
+
+from pyairvisual.cache import ResponseCache
+from pyairvisual.cloud_api import CloudAPI
+from pyairvisual.disk_cache import DiskCache
+from tests.common import TEST_API_KEY, TEST_CITY, TEST_COUNTRY, TEST_STATE
+
+
+@pytest.mark.asyncio
+async def test_shared_disk_cache(
+    aresponses: ResponsesMockServer, city_response: str, tmp_path: Path
+) -> None:
+    """Test that a payload fetched by one client is served to another from disk.
+
+    Args:
+        aresponses: An aresponses server.
+        city_response: An API response payload.
+        tmp_path: A temporary directory.
+    """
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/city",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(city_response), status=200
+        ),
+    )
+
+    # Each cache (and disk connection) stands in for a separate worker process:
+    caches = [
+        ResponseCache(disk_cache=DiskCache(tmp_path / "cache.db")) for _ in range(2)
+    ]
+    async with aiohttp.ClientSession() as session:
+        first, second = [
+            await CloudAPI(TEST_API_KEY, session=session, cache=cache).air_quality.city(
+                TEST_CITY, TEST_STATE, TEST_COUNTRY
+            )
+            for cache in caches
+        ]
+
+    assert first == second
+    assert caches[0].stats.misses == 1
+    assert caches[1].stats.disk_hits == 1
+
+    # The second cache now serves the payload from memory:
+    key = ResponseCache.build_key(
+        "get",
+        "https://api.airvisual.com/v2/city",
+        {"city": TEST_CITY, "state": TEST_STATE, "country": TEST_COUNTRY},
+    )
+    assert caches[1].get(key) == {"status": "success", "data": second}
+    assert caches[1].stats.disk_hits == 1
+    assert caches[1].stats.hits == 2
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_errors(
+    aresponses: ResponsesMockServer,
+    caplog: pytest.LogCaptureFixture,
+    city_response: str,
+    tmp_path: Path,
+) -> None:
+    """Test that a broken disk cache is logged and treated as a miss.
+
+    Args:
+        aresponses: An aresponses server.
+        caplog: A mocked logging utility.
+        city_response: An API response payload.
+        tmp_path: A temporary directory.
+    """
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/city",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(city_response), status=200
+        ),
+    )
+
+    # A directory can't be opened as a database:
+    cache = ResponseCache(disk_cache=DiskCache(tmp_path))
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(TEST_API_KEY, session=session, cache=cache)
+        data = await cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+        assert data["current"]["pollution"]["aqius"] == 66
+
+    assert cache.stats.misses == 1
+    assert "Error reading from the disk cache" in caplog.text
+    assert "Error writing to the disk cache" in caplog.text
+
+    key = ResponseCache.build_key("get", "https://api.airvisual.com/v2/nearest_city")
+    cache.set(key, {"status": "success"}, 60)
+    cache.clear()
+    assert cache.get(key) is None
+    assert cache.stats.misses == 2
+
+    aresponses.assert_plan_strictly_followed()
+
+
+def test_disk_cache_expiration(tmp_path: Path) -> None:
+    """Test that expired payloads are neither served nor kept.
+
+    Args:
+        tmp_path: A temporary directory.
+    """
+    disk_cache = DiskCache(tmp_path / "nested" / "cache.db")
+    key = ResponseCache.build_key("get", "https://example.com/city")
+
+    with patch("pyairvisual.disk_cache.time.time", return_value=1000.0):
+        disk_cache.set(key, {"status": "success"}, 10)
+        disk_cache.set(("ignored",), {"status": "success"}, 0)
+        assert disk_cache.get(key) == ({"status": "success"}, 10.0)
+
+    with patch("pyairvisual.disk_cache.time.time", return_value=1010.0):
+        assert disk_cache.get(key) is None
+        disk_cache.set(("other",), {"status": "success"}, 10)
+
+    assert len(disk_cache) == 1
+
+    disk_cache.clear()
+    assert len(disk_cache) == 0
+
+    disk_cache.close()
+    disk_cache.close()
+
+
+def test_disk_cache_size_eviction(tmp_path: Path) -> None:
+    """Test that the payloads closest to expiring are evicted first.
+
+    Args:
+        tmp_path: A temporary directory.
+    """
+    disk_cache = DiskCache(tmp_path / "cache.db", max_bytes=100)
+    payload = {"data": "x" * 30}
+
+    disk_cache.set(("short",), payload, 10)
+    disk_cache.set(("long",), payload, 1000)
+    disk_cache.set(("medium",), payload, 100)
+
+    assert len(disk_cache) == 2
+    assert disk_cache.get(("short",)) is None
+    assert disk_cache.get(("medium",)) is not None
+    assert disk_cache.get(("long",)) is not None
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_running_size(tmp_path: Path) -> None:
+    """Test that the running size total tracks inserts, updates and deletes.
+
+    Args:
+        tmp_path: A temporary directory.
+    """
+    disk_cache = DiskCache(tmp_path / "cache.db", max_bytes=100)
+    payload = {"data": "x" * 30}
+
+    # Replacing a payload mustn't count it twice:
+    for _ in range(3):
+        await disk_cache.async_set(("key",), payload, 10)
+    await disk_cache.async_set(("other",), payload, 100)
+
+    assert len(disk_cache) == 2
+    assert await disk_cache.async_get(("key",)) is not None
+
+    disk_cache.clear()
+    disk_cache.close()
+
+    # The total is persisted, so a new connection (or process) picks it up:
+    disk_cache = DiskCache(tmp_path / "cache.db", max_bytes=100)
+    for key in ("first", "second", "third"):
+        disk_cache.set((key,), payload, 10)
+    assert len(disk_cache) == 2
+    assert disk_cache.get(("first",)) is None
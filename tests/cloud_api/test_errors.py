@@ -1,5 +1,6 @@
 """Define tests for API errors."""
 
+import asyncio
 import json
 from unittest.mock import Mock
 
@@ -17,7 +18,7 @@ from pyairvisual.cloud_api import (
     NotFoundError,
     UnauthorizedError,
 )
-from tests.common import TEST_API_KEY
+from tests.common import TEST_API_KEY, TEST_CITY, TEST_COUNTRY, TEST_STATE
 
 
 @pytest.mark.asyncio
@@ -90,3 +91,37 @@ async def test_errors(
         async with aiohttp.ClientSession() as session:
             cloud_api = CloudAPI(TEST_API_KEY, session=session)
             await cloud_api.air_quality.nearest_city()
+
+
+@pytest.mark.asyncio
+async def test_coalesced_request_error(
+    aresponses: ResponsesMockServer, error_city_not_found_response: str
+) -> None:
+    """Test that every caller sharing an in-flight request receives its error.
+
+    Args:
+        aresponses: An aresponses server.
+        error_city_not_found_response: An API response payload.
+    """
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/city",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(error_city_not_found_response), status=400
+        ),
+    )
+
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(TEST_API_KEY, session=session)
+        results = await asyncio.gather(
+            *(
+                cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+                for _ in range(3)
+            ),
+            return_exceptions=True,
+        )
+
+    assert all(isinstance(result, NotFoundError) for result in results)
+
+    aresponses.assert_plan_strictly_followed()
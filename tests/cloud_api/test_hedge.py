@@ -0,0 +1,153 @@
+"""Define tests for hedging slow Cloud API requests."""
+
+import asyncio
+import json
+
+import aiohttp
+import pytest
+from aresponses import ResponsesMockServer
+
+from pyairvisual.cloud_api import CloudAPI
+from pyairvisual.hedge import HedgePolicy
+from pyairvisual.rate_limit import Quota, RateLimiter
+from tests.common import TEST_API_KEY, TEST_CITY, TEST_COUNTRY, TEST_STATE
+
+
+@pytest.mark.asyncio
+async def test_hedged_request(
+    aresponses: ResponsesMockServer, city_response: str
+) -> None:
+    """Test that a slow request is hedged and the first response wins.
+
+    Args:
+        aresponses: An aresponses server.
+        city_response: An API response payload.
+    """
+    slow_response = json.loads(city_response)
+    slow_response["data"]["current"]["pollution"]["aqius"] = 100
+
+    async def respond_slowly(_: aiohttp.web.Request) -> aiohttp.web.Response:
+        """Respond after a delay.
+
+        Returns:
+            An API response.
+        """
+        await asyncio.sleep(0.5)
+        return aiohttp.web_response.json_response(slow_response)
+
+    aresponses.add("api.airvisual.com", "/v2/city", "get", response=respond_slowly)
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/city",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(city_response), status=200
+        ),
+    )
+
+    hedge_policy = HedgePolicy(initial_delay=0.05, budget_size=1)
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(TEST_API_KEY, session=session, hedge_policy=hedge_policy)
+        data = await asyncio.wait_for(
+            cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY), 0.4
+        )
+
+    assert data["current"]["pollution"]["aqius"] == 66
+    assert hedge_policy.budget_remaining == 0
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_hedge_budget_exhausted(
+    aresponses: ResponsesMockServer, city_response: str
+) -> None:
+    """Test that a slow request isn't hedged (or rate-limited) once the budget is spent.
+
+    Args:
+        aresponses: An aresponses server.
+        city_response: An API response payload.
+    """
+
+    async def respond_slowly(_: aiohttp.web.Request) -> aiohttp.web.Response:
+        """Respond after a delay.
+
+        Returns:
+            An API response.
+        """
+        await asyncio.sleep(0.1)
+        return aiohttp.web_response.json_response(json.loads(city_response))
+
+    aresponses.add("api.airvisual.com", "/v2/city", "get", response=respond_slowly)
+
+    hedge_policy = HedgePolicy(initial_delay=0.01, budget_size=0)
+    rate_limiter = RateLimiter([Quota("minute", 2, 60)])
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(
+            TEST_API_KEY,
+            session=session,
+            hedge_policy=hedge_policy,
+            rate_limiter=rate_limiter,
+        )
+        data = await cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+
+    assert data["city"] == "Los Angeles"
+    assert rate_limiter.remaining == {"minute": 1}
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_hedge_rate_limited(
+    aresponses: ResponsesMockServer, city_response: str
+) -> None:
+    """Test that a hedge isn't drawn from the budget if the rate limiter denies it.
+
+    Args:
+        aresponses: An aresponses server.
+        city_response: An API response payload.
+    """
+
+    async def respond_slowly(_: aiohttp.web.Request) -> aiohttp.web.Response:
+        """Respond after a delay.
+
+        Returns:
+            An API response.
+        """
+        await asyncio.sleep(0.1)
+        return aiohttp.web_response.json_response(json.loads(city_response))
+
+    aresponses.add("api.airvisual.com", "/v2/city", "get", response=respond_slowly)
+
+    hedge_policy = HedgePolicy(initial_delay=0.01, budget_size=1)
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(
+            TEST_API_KEY,
+            session=session,
+            hedge_policy=hedge_policy,
+            rate_limiter=RateLimiter([Quota("minute", 1, 60)]),
+        )
+        data = await cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+
+    assert data["city"] == "Los Angeles"
+    assert hedge_policy.budget_remaining == 1
+
+    aresponses.assert_plan_strictly_followed()
+
+
+def test_hedge_delay() -> None:
+    """Test that the hedge delay tracks a percentile of recent latencies."""
+    hedge_policy = HedgePolicy(percentile=90, initial_delay=2.0, min_samples=10)
+    for latency in range(1, 10):
+        hedge_policy.record_latency(latency / 10)
+    assert hedge_policy.get_hedge_delay() == 2.0
+
+    hedge_policy.record_latency(1.0)
+    assert hedge_policy.get_hedge_delay() == 0.9
+
+    hedge_policy = HedgePolicy(budget_ratio=0.5, budget_size=1)
+    assert hedge_policy.try_hedge()
+    assert not hedge_policy.try_hedge()
+    hedge_policy.record_request()
+    hedge_policy.record_request()
+    assert hedge_policy.budget_remaining == 1
@@ -0,0 +1,128 @@
+"""Define tests for Cloud API request instrumentation."""
+
+import json
+import logging
+
+import aiohttp
+import pytest
+from aresponses import ResponsesMockServer
+
+from pyairvisual.cache import ResponseCache
+from pyairvisual.cloud_api import CloudAPI, NotFoundError
+from pyairvisual.instrumentation import (
+    SOURCE_CACHE,
+    SOURCE_NETWORK,
+    RequestEvent,
+    RequestInstrumentation,
+)
+from tests.common import TEST_API_KEY, TEST_CITY, TEST_COUNTRY, TEST_STATE
+
+
+@pytest.mark.asyncio
+async def test_request_events(
+    aresponses: ResponsesMockServer, city_response: str
+) -> None:
+    """Test that network requests and cache hits are reported.
+
+    Args:
+        aresponses: An aresponses server.
+        city_response: An API response payload.
+    """
+    for _ in range(2):
+        aresponses.add(
+            "api.airvisual.com",
+            "/v2/city",
+            "get",
+            response=aiohttp.web_response.json_response(
+                json.loads(city_response), status=200
+            ),
+        )
+
+    events: list[RequestEvent] = []
+    instrumentation = RequestInstrumentation()
+    remove_listener = instrumentation.add_listener(events.append)
+
+    async with CloudAPI(
+        TEST_API_KEY, cache=ResponseCache(), instrumentation=instrumentation
+    ) as cloud_api:
+        await cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+        await cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+
+        remove_listener()
+        assert not instrumentation.has_listeners
+
+        await cloud_api.air_quality.city(TEST_CITY, "Nevada", TEST_COUNTRY)
+
+    assert len(events) == 2
+    network_event, cache_event = events[0], events[1]
+
+    assert network_event.endpoint == "city"
+    assert network_event.method == "get"
+    assert network_event.source == SOURCE_NETWORK
+    assert network_event.attempt == 1
+    assert network_event.status == 200
+    assert network_event.bytes_received > 0
+    assert network_event.error is None
+    assert network_event.first_byte is not None
+    assert network_event.total is not None
+    assert network_event.first_byte <= network_event.total
+
+    assert cache_event.source == SOURCE_CACHE
+    assert cache_event.bytes_received == 0
+    assert cache_event.status is None
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_request_error_event(
+    aresponses: ResponsesMockServer,
+    caplog: pytest.LogCaptureFixture,
+    error_city_not_found_response: str,
+) -> None:
+    """Test that failed requests report their mapped error (and bad listeners log).
+
+    Args:
+        aresponses: An aresponses server.
+        caplog: A mocked logging utility.
+        error_city_not_found_response: An API response payload.
+    """
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/city",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(error_city_not_found_response), status=200
+        ),
+    )
+
+    def broken_listener(_: RequestEvent) -> None:
+        """Raise an error in a listener.
+
+        Raises:
+            ValueError: Always.
+        """
+        raise ValueError("Broken listener")
+
+    events: list[RequestEvent] = []
+    instrumentation = RequestInstrumentation()
+    instrumentation.add_listener(broken_listener)
+    instrumentation.add_listener(events.append)
+
+    async with aiohttp.ClientSession(
+        trace_configs=[instrumentation.create_trace_config()]
+    ) as session:
+        cloud_api = CloudAPI(
+            TEST_API_KEY, session=session, instrumentation=instrumentation
+        )
+        with caplog.at_level(logging.ERROR), pytest.raises(NotFoundError):
+            await cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+
+    assert len(events) == 1
+    event = events[0]
+    assert event.error is NotFoundError
+    assert event.status == 200
+    assert event.first_byte is not None
+    assert "Error in request listener" in caplog.text
+
+    aresponses.assert_plan_strictly_followed()
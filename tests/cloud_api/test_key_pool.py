@@ -0,0 +1,119 @@
+"""Define tests for spreading requests across a pool of API keys."""
+
+import json
+
+import aiohttp
+import pytest
+from aresponses import ResponsesMockServer
+
+from pyairvisual.cloud_api import CloudAPI, InvalidKeyError, LimitReachedError
+from pyairvisual.key_pool import APIKeyPool
+from pyairvisual.rate_limit import Quota
+from tests.common import TEST_CITY, TEST_COUNTRY, TEST_STATE
+
+
+@pytest.mark.asyncio
+async def test_key_failover(
+    aresponses: ResponsesMockServer,
+    city_response: str,
+    error_incorrect_api_key_response: str,
+    error_limit_reached_response: str,
+) -> None:
+    """Test that failing keys are taken out of rotation.
+
+    Args:
+        aresponses: An aresponses server.
+        city_response: An API response payload.
+        error_incorrect_api_key_response: An API response payload.
+        error_limit_reached_response: An API response payload.
+    """
+    responses = {
+        "invalid_key": json.loads(error_incorrect_api_key_response),
+        "limited_key": json.loads(error_limit_reached_response),
+        "valid_key": json.loads(city_response),
+    }
+    used_keys = []
+
+    def handle(request: aiohttp.web.Request) -> aiohttp.web.Response:
+        """Respond based on the API key of a request.
+
+        Args:
+            request: An aiohttp request.
+
+        Returns:
+            An API response.
+        """
+        used_keys.append(request.query["key"])
+        return aiohttp.web_response.json_response(responses[request.query["key"]])
+
+    for _ in range(4):
+        aresponses.add("api.airvisual.com", "/v2/city", "get", response=handle)
+
+    key_pool = APIKeyPool(["invalid_key", "limited_key", "valid_key"])
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(key_pool, session=session, coalesce_requests=False)
+        for _ in range(2):
+            data = await cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+            assert data["city"] == "Los Angeles"
+
+        key_pool.disable("valid_key")
+        with pytest.raises(LimitReachedError):
+            await cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+
+    assert used_keys == ["invalid_key", "limited_key", "valid_key", "valid_key"]
+    assert key_pool.stats["invalid_key"].disabled
+    assert key_pool.stats["limited_key"].suspensions == 1
+    assert key_pool.stats["valid_key"].requests == 2
+    assert key_pool.stats["valid_key"].errors == 0
+    assert key_pool.stats["valid_key"].in_flight == 0
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_all_keys_invalid(
+    aresponses: ResponsesMockServer, error_incorrect_api_key_response: str
+) -> None:
+    """Test that the last key error is raised once every key is out of rotation.
+
+    Args:
+        aresponses: An aresponses server.
+        error_incorrect_api_key_response: An API response payload.
+    """
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/city",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(error_incorrect_api_key_response), status=200
+        ),
+    )
+
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(APIKeyPool(["invalid_key"]), session=session)
+        with pytest.raises(InvalidKeyError):
+            await cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+
+    aresponses.assert_plan_strictly_followed()
+
+
+def test_budget_aware_selection() -> None:
+    """Test that the key with the largest share of its budget left is picked."""
+    key_pool = APIKeyPool(
+        ["first_key", "second_key", "first_key"], quotas=[Quota("minute", 2, 60)]
+    )
+    assert len(key_pool) == 2
+
+    picked = []
+    while (api_key := key_pool.acquire()) is not None:
+        picked.append(api_key)
+        key_pool.release(api_key)
+
+    assert sorted(picked) == ["first_key", "first_key", "second_key", "second_key"]
+    assert picked[0] != picked[1]
+
+    key_pool.suspend("first_key", 0)
+    assert key_pool.stats["first_key"].suspensions == 1
+
+    with pytest.raises(ValueError):
+        APIKeyPool([])
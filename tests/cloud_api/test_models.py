@@ -0,0 +1,114 @@
+"""Define tests for typed response models."""
+
+import json
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+from aresponses import ResponsesMockServer
+
+from pyairvisual.cloud_api import CloudAPI
+from pyairvisual.models import AirQualityReading, PollutantConcentration
+from tests.common import TEST_API_KEY, TEST_CITY, TEST_COUNTRY, TEST_STATE
+
+
+@pytest.mark.asyncio
+async def test_city_reading(
+    aresponses: ResponsesMockServer, city_response: str
+) -> None:
+    """Test a typed view over a city payload.
+
+    Args:
+        aresponses: An aresponses server.
+        city_response: An API response payload.
+    """
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/city",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(city_response), status=200
+        ),
+    )
+
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(TEST_API_KEY, session=session)
+        data = await cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+
+    reading = AirQualityReading(data)
+    assert reading.raw is data
+    assert AirQualityReading(data, keep_raw=False).raw == data
+    assert reading.location.city == "Los Angeles"
+    assert reading.location.state == "California"
+    assert reading.location.country == "USA"
+    assert reading.location.station is None
+    assert reading.location.coordinates == (34.0669, -118.2417)
+
+    assert reading.pollution is not None
+    assert reading.pollution.timestamp == datetime(2018, 6, 10, tzinfo=timezone.utc)
+    assert reading.pollution.aqi_us == 66
+    assert reading.pollution.aqi_cn == 44
+    assert reading.pollution.main_pollutant_us == "p2"
+    assert reading.pollution.main_pollutant_cn == "p1"
+    assert reading.pollution.pollutants == {}
+
+    assert reading.weather is not None
+    assert reading.weather.timestamp == datetime(2018, 6, 10, 1, tzinfo=timezone.utc)
+    assert reading.weather.humidity == 60
+    assert reading.weather.icon == "01d"
+    assert reading.weather.pressure == 1012
+    assert reading.weather.temperature == 25
+    assert reading.weather.wind_direction == 230
+    assert reading.weather.wind_speed == 4.6
+
+    assert not hasattr(reading, "__dict__")
+
+    aresponses.assert_plan_strictly_followed()
+
+
+def test_partial_reading(station_response: str) -> None:
+    """Test a typed view over station and incomplete payloads.
+
+    Args:
+        station_response: An API response payload.
+    """
+    data = json.loads(station_response)["data"]
+    reading = AirQualityReading(data)
+    assert reading.location.station == "US Embassy in Beijing"
+    assert "forecasts" in reading.raw
+
+    # A lossy rebuild only keeps the modeled fields:
+    lossy_raw = AirQualityReading(data, keep_raw=False).raw
+    assert lossy_raw["current"] == data["current"]
+    assert "forecasts" not in lossy_raw
+    assert reading.pollution is not None
+    assert reading.pollution.pollutants == {
+        "p2": PollutantConcentration(concentration=95, aqi_cn=125, aqi_us=171)
+    }
+
+    reading = AirQualityReading({"city": "Nowhere"})
+    assert reading.location.coordinates is None
+    assert reading.pollution is None
+    assert reading.weather is None
+    assert repr(reading) == "AirQualityReading({'city': 'Nowhere'})"
+
+
+def test_lazy_reading(city_response: str) -> None:
+    """Test that a reading only builds its models when they're first accessed.
+
+    Args:
+        city_response: An API response payload.
+    """
+    data = json.loads(city_response)["data"]
+    with patch("pyairvisual.models.Pollution") as pollution_mock:
+        reading = AirQualityReading(data)
+        pollution_mock.assert_not_called()
+        assert reading.pollution is pollution_mock.return_value
+        assert reading.pollution is pollution_mock.return_value
+        pollution_mock.assert_called_once_with(
+            data["current"]["pollution"], keep_raw=True
+        )
+
+        AirQualityReading(data, keep_raw=False)
+        assert pollution_mock.call_count == 2
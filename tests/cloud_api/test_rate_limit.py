@@ -0,0 +1,144 @@
+"""Define tests for the client-side rate limiter."""
+
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import aiohttp
+import pytest
+from aresponses import ResponsesMockServer
+
+from pyairvisual.cloud_api import CloudAPI, LimitReachedError
+from pyairvisual.rate_limit import (
+    PLAN_COMMUNITY,
+    Quota,
+    RateLimiter,
+    SQLiteQuotaStore,
+)
+from tests.common import TEST_API_KEY
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_fail_fast(
+    aresponses: ResponsesMockServer, countries_response: str
+) -> None:
+    """Test that a non-blocking rate limiter fails fast once exhausted.
+
+    Args:
+        aresponses: An aresponses server.
+        countries_response: An API response payload.
+    """
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/countries",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(countries_response), status=200
+        ),
+    )
+
+    rate_limiter = RateLimiter([Quota("minute", 1, 60)], block=False)
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(TEST_API_KEY, session=session, rate_limiter=rate_limiter)
+        await cloud_api.supported.countries()
+        assert rate_limiter.remaining == {"minute": 0}
+        assert await rate_limiter.async_remaining() == {"minute": 0}
+
+        with pytest.raises(LimitReachedError):
+            await cloud_api.supported.countries()
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_wait(
+    aresponses: ResponsesMockServer, countries_response: str
+) -> None:
+    """Test that a blocking rate limiter waits for the next slot.
+
+    Args:
+        aresponses: An aresponses server.
+        countries_response: An API response payload.
+    """
+    for _ in range(2):
+        aresponses.add(
+            "api.airvisual.com",
+            "/v2/countries",
+            "get",
+            response=aiohttp.web_response.json_response(
+                json.loads(countries_response), status=200
+            ),
+        )
+
+    clock = [100.0]
+
+    async def advance_clock(delay: float) -> None:
+        """Simulate sleeping by advancing the clock.
+
+        Args:
+            delay: The number of seconds to "sleep".
+        """
+        clock[0] += delay
+
+    with patch(
+        "pyairvisual.rate_limit.time.monotonic", side_effect=lambda: clock[0]
+    ), patch(
+        "pyairvisual.rate_limit.asyncio.sleep", AsyncMock(side_effect=advance_clock)
+    ) as mock_sleep:
+        rate_limiter = RateLimiter([Quota("minute", 1, 60)])
+        async with aiohttp.ClientSession() as session:
+            cloud_api = CloudAPI(
+                TEST_API_KEY,
+                session=session,
+                coalesce_requests=False,
+                rate_limiter=rate_limiter,
+            )
+            await cloud_api.supported.countries()
+            await cloud_api.supported.countries()
+
+    mock_sleep.assert_awaited_once_with(60.0)
+
+    aresponses.assert_plan_strictly_followed()
+
+
+def test_plan_quotas() -> None:
+    """Test creating a rate limiter for an AirVisual plan."""
+    rate_limiter = RateLimiter.for_plan(PLAN_COMMUNITY)
+    assert rate_limiter.remaining == {"minute": 5, "day": 500, "month": 10_000}
+
+    assert rate_limiter.try_acquire() == 0.0
+    assert rate_limiter.remaining == {"minute": 4, "day": 499, "month": 9_999}
+
+
+@pytest.mark.asyncio
+async def test_shared_quota_store(tmp_path: Path) -> None:
+    """Test that rate limiters sharing a SQLite store draw from one budget.
+
+    Args:
+        tmp_path: A temporary directory.
+    """
+    path = tmp_path / "quotas.db"
+    quotas = [Quota("minute", 3, 60), Quota("day", 100, 24 * 60 * 60)]
+
+    # Each store (and its connection) stands in for a separate worker process:
+    first = RateLimiter(quotas, block=False, store=SQLiteQuotaStore(path))
+    second = RateLimiter(quotas, block=False, store=SQLiteQuotaStore(path))
+    other = RateLimiter(
+        quotas, block=False, store=SQLiteQuotaStore(path, namespace="other_key")
+    )
+
+    assert second.remaining == {"minute": 3, "day": 100}
+    assert first.try_acquire() == 0.0
+    assert second.try_acquire() == 0.0
+    assert first.try_acquire() == 0.0
+    assert second.try_acquire() == pytest.approx(20.0, abs=0.1)
+    assert first.remaining == {"minute": 0, "day": 97}
+    assert other.remaining == {"minute": 3, "day": 100}
+
+    assert await first.async_try_acquire() == pytest.approx(20.0, abs=0.1)
+    assert await second.async_remaining() == {"minute": 0, "day": 97}
+
+    store = SQLiteQuotaStore(path)
+    store.close()
+    assert store.remaining(quotas) == {"minute": 0, "day": 97}
+    store.close()
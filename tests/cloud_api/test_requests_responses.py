@@ -1,12 +1,16 @@
 """Define tests for API requests and responses."""
 
+import asyncio
 import json
+from unittest.mock import Mock, patch
 
 import aiohttp
+import numpy as np
 import pytest
 from aresponses import ResponsesMockServer
 
 from pyairvisual import CloudAPI
+from pyairvisual.decoder import get_default_json_decoder
 from tests.common import (
     TEST_API_KEY,
     TEST_CITY,
@@ -216,6 +220,69 @@ async def test_no_explicit_client_session(
     assert data[0]["city"] == "Portland"
     assert data[0]["state"] == "Oregon"
     assert data[0]["country"] == "USA"
+    await cloud_api.aclose()
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_owned_client_session(
+    aresponses: ResponsesMockServer, city_ranking_response: str
+) -> None:
+    """Test that an owned ClientSession is reused across calls and closed on exit.
+
+    Args:
+        aresponses: An aresponses server.
+        city_ranking_response: An API response payload.
+    """
+    for _ in range(2):
+        aresponses.add(
+            "api.airvisual.com",
+            "/v2/city_ranking",
+            "get",
+            response=aiohttp.web_response.json_response(
+                json.loads(city_ranking_response), status=200
+            ),
+        )
+
+    async with CloudAPI(TEST_API_KEY, limit_per_host=2) as cloud_api:
+        await cloud_api.air_quality.ranking()
+        session = cloud_api._get_session()  # pylint: disable=protected-access
+        await cloud_api.air_quality.ranking()
+        assert cloud_api._get_session() is session  # pylint: disable=protected-access
+        assert not session.closed
+
+    assert session.closed
+
+    # Closing again should be a no-op:
+    await cloud_api.aclose()
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_provided_client_session_not_closed(
+    aresponses: ResponsesMockServer, city_ranking_response: str
+) -> None:
+    """Test that a caller-provided ClientSession is left open on exit.
+
+    Args:
+        aresponses: An aresponses server.
+        city_ranking_response: An API response payload.
+    """
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/city_ranking",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(city_ranking_response), status=200
+        ),
+    )
+
+    async with aiohttp.ClientSession() as session:
+        async with CloudAPI(TEST_API_KEY, session=session) as cloud_api:
+            await cloud_api.air_quality.ranking()
+        assert not session.closed
 
     aresponses.assert_plan_strictly_followed()
 
@@ -394,3 +461,174 @@ async def test_stations(
         assert len(data) == 2
 
     aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_coalesced_requests(
+    aresponses: ResponsesMockServer, city_response: str
+) -> None:
+    """Test that identical, concurrent requests share one in-flight request.
+
+    Args:
+        aresponses: An aresponses server.
+        city_response: An API response payload.
+    """
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/city",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(city_response), status=200
+        ),
+    )
+
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(TEST_API_KEY, session=session)
+        results = await asyncio.gather(
+            *(
+                cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+                for _ in range(5)
+            )
+        )
+
+    assert all(result["city"] == "Los Angeles" for result in results)
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_coalescing_disabled(
+    aresponses: ResponsesMockServer, city_response: str
+) -> None:
+    """Test that identical, concurrent requests are all sent when not coalescing.
+
+    Args:
+        aresponses: An aresponses server.
+        city_response: An API response payload.
+    """
+    for _ in range(2):
+        aresponses.add(
+            "api.airvisual.com",
+            "/v2/city",
+            "get",
+            response=aiohttp.web_response.json_response(
+                json.loads(city_response), status=200
+            ),
+        )
+
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(TEST_API_KEY, session=session, coalesce_requests=False)
+        await asyncio.gather(
+            *(
+                cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+                for _ in range(2)
+            )
+        )
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_custom_json_decoder(
+    aresponses: ResponsesMockServer, city_ranking_response: str
+) -> None:
+    """Test decoding raw response bodies with a custom JSON decoder.
+
+    Args:
+        aresponses: An aresponses server.
+        city_ranking_response: An API response payload.
+    """
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/city_ranking",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(city_ranking_response), status=200
+        ),
+    )
+
+    json_decoder = Mock(side_effect=json.loads)
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(TEST_API_KEY, session=session, json_decoder=json_decoder)
+        data = await cloud_api.air_quality.ranking()
+        assert len(data) == 3
+
+    assert isinstance(json_decoder.call_args.args[0], bytes)
+
+    aresponses.assert_plan_strictly_followed()
+
+
+def test_default_json_decoder_fallback() -> None:
+    """Test that the standard library is used when orjson isn't installed."""
+    with patch.dict("sys.modules", {"orjson": None}):
+        assert get_default_json_decoder() is json.loads
+
+
+@pytest.mark.asyncio
+async def test_node_by_id_columnar(
+    aresponses: ResponsesMockServer, node_by_id_response: str
+) -> None:
+    """Test getting a node's historical series as columnar arrays.
+
+    Args:
+        aresponses: An aresponses server.
+        node_by_id_response: An API response payload.
+    """
+    aresponses.add(
+        "www.airvisual.com",
+        f"/api/v2/node/{TEST_NODE_ID}",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(node_by_id_response), status=200
+        ),
+    )
+
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(TEST_API_KEY, session=session)
+        data = await cloud_api.node.get_by_node_id(TEST_NODE_ID, columnar=True)
+
+    instant = data["historical"]["instant"]
+    assert len(instant) == 1
+    assert instant.timestamps[0] == np.datetime64("2019-02-15T23:32:49.573")
+    assert instant["p2"][0] == 35
+    assert instant["tp"].dtype == np.float64
+    assert set(instant.metrics) == {"tp", "hm", "p2", "co"}
+
+    daily = data["historical"]["daily"]
+    assert daily["p2_sum"][0] == 3321
+    assert "outdoor_station" not in daily.metrics
+    assert data["current"]["p2"] == 35
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_node_by_id_columnar_metrics(
+    aresponses: ResponsesMockServer, node_by_id_response: str
+) -> None:
+    """Test getting only some metrics of a node's historical series.
+
+    Args:
+        aresponses: An aresponses server.
+        node_by_id_response: An API response payload.
+    """
+    aresponses.add(
+        "www.airvisual.com",
+        f"/api/v2/node/{TEST_NODE_ID}",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(node_by_id_response), status=200
+        ),
+    )
+
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(TEST_API_KEY, session=session)
+        data = await cloud_api.node.get_by_node_id(
+            TEST_NODE_ID, columnar=True, metrics=["p2", "co"]
+        )
+
+    instant = data["historical"]["instant"]
+    assert set(instant.metrics) == {"p2", "co"}
+    assert instant.timestamps[0] == np.datetime64("2019-02-15T23:32:49.573")
+
+    aresponses.assert_plan_strictly_followed()
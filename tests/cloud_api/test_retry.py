@@ -0,0 +1,206 @@
+"""Define tests for retrying Cloud API requests."""
+
+import asyncio
+import json
+import time
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+from aresponses import ResponsesMockServer
+
+from pyairvisual.cloud_api import (
+    CloudAPI,
+    InvalidResponseError,
+    LimitReachedError,
+    NotFoundError,
+)
+from pyairvisual.retry import RetryPolicy
+from tests.common import TEST_API_KEY, TEST_CITY, TEST_COUNTRY, TEST_STATE
+
+
+@pytest.mark.asyncio
+async def test_retry_success(
+    aresponses: ResponsesMockServer,
+    city_response: str,
+    error_limit_reached_response: str,
+) -> None:
+    """Test that retryable errors are retried until the request succeeds.
+
+    Args:
+        aresponses: An aresponses server.
+        city_response: An API response payload.
+        error_limit_reached_response: An API response payload.
+    """
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/city",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(error_limit_reached_response), status=429
+        ),
+    )
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/city",
+        "get",
+        aresponses.Response(
+            text="<html>Bad Gateway</html>",
+            headers={"Content-Type": "text/html"},
+            status=502,
+        ),
+    )
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/city",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(city_response), status=200
+        ),
+    )
+
+    retry_policy = RetryPolicy(base_delay=0)
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(TEST_API_KEY, session=session, retry_policy=retry_policy)
+        data = await cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+
+    assert data["city"] == "Los Angeles"
+    assert retry_policy.budget_remaining == 8
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "retry_policy",
+    [
+        RetryPolicy(base_delay=0, max_attempts=2),
+        RetryPolicy(base_delay=0, budget_size=1),
+        RetryPolicy(base_delay=5, max_delay=5, deadline=1),
+    ],
+)
+async def test_retry_gives_up(
+    aresponses: ResponsesMockServer, retry_policy: RetryPolicy
+) -> None:
+    """Test that retries stop at the attempt limit, the budget, or the deadline.
+
+    Args:
+        aresponses: An aresponses server.
+        retry_policy: The retry policy to use.
+    """
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/countries",
+        "get",
+        aresponses.Response(text="Service Unavailable", status=503),
+        repeat=2,
+    )
+
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(TEST_API_KEY, session=session, retry_policy=retry_policy)
+        # Use the longest possible backoff delay (which is past the deadline):
+        with (
+            patch("pyairvisual.retry.random.uniform", side_effect=lambda _, high: high),
+            pytest.raises(InvalidResponseError),
+        ):
+            await cloud_api.supported.countries()
+
+
+@pytest.mark.asyncio
+async def test_retry_deadline_bounds_attempt(aresponses: ResponsesMockServer) -> None:
+    """Test that an attempt still in flight at the deadline is cancelled.
+
+    Args:
+        aresponses: An aresponses server.
+    """
+
+    async def respond_slowly(_: aiohttp.web.Request) -> aiohttp.web.Response:
+        """Respond after the deadline.
+
+        Returns:
+            An API response.
+        """
+        await asyncio.sleep(1)
+        return aiohttp.web_response.json_response({"status": "success", "data": []})
+
+    aresponses.add("api.airvisual.com", "/v2/countries", "get", response=respond_slowly)
+
+    retry_policy = RetryPolicy(base_delay=0, deadline=0.1)
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(TEST_API_KEY, session=session, retry_policy=retry_policy)
+        start = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            await cloud_api.supported.countries()
+
+    assert time.monotonic() - start < 0.5
+
+
+@pytest.mark.asyncio
+async def test_no_retry_for_deterministic_errors(
+    aresponses: ResponsesMockServer, error_city_not_found_response: str
+) -> None:
+    """Test that errors that will never succeed aren't retried.
+
+    Args:
+        aresponses: An aresponses server.
+        error_city_not_found_response: An API response payload.
+    """
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/city",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(error_city_not_found_response), status=400
+        ),
+    )
+
+    retry_policy = RetryPolicy(base_delay=0)
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(TEST_API_KEY, session=session, retry_policy=retry_policy)
+        with pytest.raises(NotFoundError):
+            await cloud_api.air_quality.city(TEST_CITY, TEST_STATE, TEST_COUNTRY)
+
+    assert retry_policy.budget_remaining == 10
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_no_retry_without_policy(
+    aresponses: ResponsesMockServer, error_limit_reached_response: str
+) -> None:
+    """Test that nothing is retried when no retry policy is configured.
+
+    Args:
+        aresponses: An aresponses server.
+        error_limit_reached_response: An API response payload.
+    """
+    aresponses.add(
+        "api.airvisual.com",
+        "/v2/countries",
+        "get",
+        response=aiohttp.web_response.json_response(
+            json.loads(error_limit_reached_response), status=429
+        ),
+    )
+
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(TEST_API_KEY, session=session)
+        with pytest.raises(LimitReachedError):
+            await cloud_api.supported.countries()
+
+    aresponses.assert_plan_strictly_followed()
+
+
+def test_retry_delay_bounds() -> None:
+    """Test that backoff delays are capped and drawn with full jitter."""
+    retry_policy = RetryPolicy(base_delay=1, max_delay=3, max_attempts=10)
+    for attempt in range(1, 6):
+        delay = retry_policy.get_retry_delay(attempt, 0)
+        assert delay is not None
+        assert 0 <= delay <= min(3, 2 ** (attempt - 1))
+
+    assert retry_policy.budget_remaining == 5
+    for _ in range(10):
+        retry_policy.record_request()
+    assert retry_policy.budget_remaining == 7
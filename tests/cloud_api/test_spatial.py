@@ -0,0 +1,166 @@
+"""Define tests for answering nearest_* lookups from a local spatial index."""
+
+import json
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+from aresponses import ResponsesMockServer
+
+from pyairvisual.catalog import SupportedCatalog
+from pyairvisual.cloud_api import CloudAPI
+from pyairvisual.spatial import (
+    KnownLocation,
+    LocationIndex,
+    SpatialIndex,
+    geohash_decode,
+    geohash_encode,
+)
+from tests.common import TEST_API_KEY, TEST_LATITUDE, TEST_LONGITUDE
+
+
+@pytest.mark.asyncio
+async def test_nearest_city_from_index(
+    aresponses: ResponsesMockServer, city_response: str
+) -> None:
+    """Test that a nearby, known city is requested directly once it's stale.
+
+    Args:
+        aresponses: An aresponses server.
+        city_response: An API response payload.
+    """
+    for endpoint in ("nearest_city", "city", "nearest_city"):
+        aresponses.add(
+            "api.airvisual.com",
+            f"/v2/{endpoint}",
+            "get",
+            response=aiohttp.web_response.json_response(
+                json.loads(city_response), status=200
+            ),
+        )
+
+    location_index = LocationIndex(max_distance=5, payload_ttl=0)
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(
+            TEST_API_KEY, session=session, location_index=location_index
+        )
+        await cloud_api.air_quality.nearest_city(
+            latitude=TEST_LATITUDE, longitude=TEST_LONGITUDE
+        )
+        assert len(location_index.cities) == 1
+
+        # ~1.1 km away (answered by the /city endpoint):
+        data = await cloud_api.air_quality.nearest_city(
+            latitude=TEST_LATITUDE + 0.01, longitude=TEST_LONGITUDE
+        )
+        assert data["city"] == "Los Angeles"
+
+        # ~11 km away (answered by the /nearest_city endpoint):
+        await cloud_api.air_quality.nearest_city(
+            latitude=TEST_LATITUDE + 0.1, longitude=TEST_LONGITUDE
+        )
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_nearest_station_from_index(
+    aresponses: ResponsesMockServer, station_response: str
+) -> None:
+    """Test that a nearby, known station is answered from its latest payload.
+
+    Args:
+        aresponses: An aresponses server.
+        station_response: An API response payload.
+    """
+    for _ in range(2):
+        aresponses.add(
+            "api.airvisual.com",
+            "/v2/station",
+            "get",
+            response=aiohttp.web_response.json_response(
+                json.loads(station_response), status=200
+            ),
+        )
+
+    location_index = LocationIndex()
+    async with aiohttp.ClientSession() as session:
+        cloud_api = CloudAPI(
+            TEST_API_KEY, session=session, location_index=location_index
+        )
+        await cloud_api.air_quality.station(
+            "US Embassy in Beijing", "Beijing", "Beijing", "China"
+        )
+        data = await cloud_api.air_quality.nearest_station(
+            latitude=39.95, longitude=116.47
+        )
+        assert data["name"] == "US Embassy in Beijing"
+        assert len(location_index.cities) == 0
+        assert len(location_index.stations) == 1
+
+        # Once the latest payload is stale, the station is requested directly:
+        with patch("pyairvisual.spatial.time.monotonic", return_value=1e12):
+            data = await cloud_api.air_quality.nearest_station(
+                latitude=39.95, longitude=116.47
+            )
+        assert data["name"] == "US Embassy in Beijing"
+
+    aresponses.assert_plan_strictly_followed()
+
+
+def test_spatial_index() -> None:
+    """Test nearest-neighbor lookups across cell and antimeridian boundaries."""
+    index = SpatialIndex(cell_size=1)
+    index.add(KnownLocation(0.0, 179.9, "East", "Fiji", "Fiji"))
+    index.add(KnownLocation(0.0, 170.0, "West", "Fiji", "Fiji"))
+    index.add(KnownLocation(0.0, 179.9, "East", "Fiji", "Fiji"))
+    assert len(index) == 2
+
+    match = index.nearest(0.0, -179.9, max_distance=50)
+    assert match is not None
+    assert match[0].city == "East"
+    assert match[1] == pytest.approx(22.2, abs=0.1)
+
+    assert index.nearest(0.0, -170.0, max_distance=50) is None
+    match = index.nearest(0.0, -170.0)
+    assert match is not None
+    assert match[0].city == "East"
+
+    assert KnownLocation.from_payload({"city": "Nowhere"}) is None
+
+
+def test_spatial_index_from_catalog() -> None:
+    """Test indexing the stations of a crawled catalog."""
+    catalog = SupportedCatalog(
+        {
+            "China": {
+                "Beijing": {
+                    "Beijing": {
+                        "US Embassy in Beijing": [39.954352, 116.466258],
+                        "Unknown Location": None,
+                    }
+                }
+            }
+        }
+    )
+    index = SpatialIndex()
+    index.add_catalog_stations(catalog)
+
+    assert len(index) == 1
+    match = index.nearest(39.95, 116.47, max_distance=1)
+    assert match is not None
+    assert match[0].station == "US Embassy in Beijing"
+
+
+def test_geohash_decode() -> None:
+    """Test decoding geohashes into the centers of their cells."""
+    latitude, longitude = geohash_decode("u4pruydqqvj")
+    assert latitude == pytest.approx(57.64911, abs=1e-5)
+    assert longitude == pytest.approx(10.40744, abs=1e-5)
+    assert geohash_encode(*geohash_decode("9q5cv3"), 6) == "9q5cv3"
+
+
+def test_geohash_encode() -> None:
+    """Test encoding coordinates as geohashes."""
+    assert geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert geohash_encode(TEST_LATITUDE, TEST_LONGITUDE, 6) == "9q5cv3"
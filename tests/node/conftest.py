@@ -2,10 +2,9 @@
 
 from __future__ import annotations
 
-import tempfile
 from collections.abc import Generator
-from typing import cast
-from unittest.mock import MagicMock, Mock, mock_open, patch
+from typing import IO
+from unittest.mock import Mock, patch
 
 import pytest
 
@@ -23,40 +22,21 @@ def error_node_not_found_response_fixture() -> str:
 
 
 @pytest.fixture(name="mock_history_file")
-def mock_history_file_fixture() -> Mock:
+def mock_history_file_fixture(node_history_samba_response: str) -> Mock:
     """Define a fixture to mock a file for history data.
 
-    Returns:
-        A Mock history file.
-    """
-    return Mock(name="202003_AirVisual_values.txt")
-
-
-@pytest.fixture(name="mock_measurements_file")
-def mock_measurements_file_fixture(node_measurements_response: str) -> Mock:
-    """Define a fixture to mock a file for measurement data.
+    Args:
+        node_history_samba_response: A history file's contents.
 
     Returns:
-        A Mock measurements file.
+        A Mock history file.
     """
     mock = Mock()
-    mock.read.return_value = node_measurements_response.encode()
+    mock.file_size = len(node_history_samba_response.encode())
+    mock.filename = "202003_AirVisual_values.txt"
     return mock
 
 
-@pytest.fixture(name="mock_open_function", scope="session")
-def mock_open_function_fixture(node_history_samba_response: str) -> MagicMock:
-    """Define a fixture to mock the builtin open function.
-
-    Returns:
-        A Mock method to simulate opening a file.
-    """
-    mop = mock_open(read_data=node_history_samba_response)
-    mop.return_value.__iter__ = lambda self: self
-    mop.return_value.__next__ = lambda self: next(iter(self.readline, ""))
-    return cast(MagicMock, mop)
-
-
 @pytest.fixture(name="mock_pysmb_close")
 def mock_pysmb_close_fixture() -> Mock:
     """Define a fixture to mock the pysmb close method.
@@ -88,13 +68,49 @@ def mock_pysmb_list_path_fixture(mock_history_file: Mock) -> Mock:
 
 
 @pytest.fixture(name="mock_pysmb_retrieve_file")
-def mock_pysmb_retrieve_file_fixture() -> Mock:
+def mock_pysmb_retrieve_file_fixture(
+    node_history_samba_response: str, node_measurements_response: str
+) -> Mock:
     """Define a fixture to mock the pysmb retrieveFile method.
 
+    Args:
+        node_history_samba_response: A history file's contents.
+        node_measurements_response: A measurements file's contents.
+
     Returns:
         A Mock method to simulate retrieving the contents of a file.
     """
-    return Mock()
+
+    def retrieve_file(
+        _: str,
+        filepath: str,
+        file_obj: IO[bytes],
+        offset: int = 0,
+        max_length: int = -1,
+    ) -> tuple[int, int]:
+        """Write the contents of a file (from an offset) to a file-like object.
+
+        Args:
+            filepath: A filepath on the Node Samba share.
+            file_obj: The file-like object to write to.
+            offset: The byte offset to start from.
+            max_length: The max number of bytes to write (-1 for all).
+
+        Returns:
+            A (file attributes, bytes written) tuple.
+        """
+        if filepath == "/latest_config_measurements.json":
+            contents = node_measurements_response.encode()
+        else:
+            contents = node_history_samba_response.encode()
+        if max_length == -1:
+            contents = contents[offset:]
+        else:
+            contents = contents[offset : offset + max_length]
+        file_obj.write(contents)
+        return 0, len(contents)
+
+    return Mock(side_effect=retrieve_file)
 
 
 @pytest.fixture(name="node_history_samba_response", scope="session")
@@ -129,9 +145,7 @@ def node_measurements_response_fixture(node_measurements_file: Mock) -> str:
 
 @pytest.fixture(name="setup_samba_connection")
 def setup_samba_connection_fixture(  # pylint: disable=too-many-arguments, too-many-positional-arguments
-    mock_history_file: Mock,
-    mock_measurements_file: Mock,
-    mock_open_function: Mock,
+    mock_history_file: Mock,  # pylint: disable=unused-argument
     mock_pysmb_close: Mock,
     mock_pysmb_connect: Mock,
     mock_pysmb_list_path: Mock,
@@ -141,22 +155,17 @@ def setup_samba_connection_fixture(  # pylint: disable=too-many-arguments, too-m
 
     Args:
         mock_history_file: A mocked history file.
-        mock_measurements_file: A mocked measurements file.
-        mock_open_function: A mocked function to open a file.
         mock_pysmb_close: A mocked function to close a pysmb connection.
         mock_pysmb_connect: A mocked function to open a pysmb connection.
         mock_pysmb_list_path: A mocked function to list file references at a path.
         mock_pysmb_retrieve_file: A mocked function to retrieve the contents of a file.
     """
-    with patch.object(
-        tempfile,
-        "NamedTemporaryFile",
-        side_effect=[mock_measurements_file, mock_history_file],
-    ), patch("smb.SMBConnection.SMBConnection.connect", mock_pysmb_connect), patch(
+    with patch("smb.SMBConnection.SMBConnection.connect", mock_pysmb_connect), patch(
         "smb.SMBConnection.SMBConnection.listPath", mock_pysmb_list_path
     ), patch(
         "smb.SMBConnection.SMBConnection.retrieveFile", mock_pysmb_retrieve_file
-    ), patch("smb.SMBConnection.SMBConnection.close", mock_pysmb_close), patch(
-        "builtins.open", mock_open_function
-    ):
+    ), patch(
+        "smb.SMBConnection.SMBConnection.retrieveFileFromOffset",
+        mock_pysmb_retrieve_file,
+    ), patch("smb.SMBConnection.SMBConnection.close", mock_pysmb_close):
         yield
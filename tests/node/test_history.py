@@ -0,0 +1,111 @@
+"""Define tests for Node/Pro history helpers."""
+
+import io
+
+import numpy as np
+import pytest
+
+from pyairvisual.history import (
+    ColumnarHistoryBuffer,
+    HistoryRowsView,
+    parse_columnar_history,
+    parse_history,
+    truncate_partial_row,
+)
+
+FIELDNAMES = ["Date", "Time", "Timestamp", "pm2_5", "co2"]
+
+
+def test_columnar_history_buffer() -> None:
+    """Test appending parsed rows to a ColumnarHistoryBuffer."""
+    first = parse_columnar_history(
+        io.BytesIO(b"2020/03/08;05:30:25;1583645425;7.0;603\n"), FIELDNAMES
+    )
+    second = parse_columnar_history(
+        io.BytesIO(
+            b"2020/03/08;05:45:25;1583646325;5.0;599\n"
+            b"2020/03/08;06:00:25;1583647225;4.0;604\n"
+        ),
+        FIELDNAMES,
+    )
+
+    buffer = ColumnarHistoryBuffer()
+    buffer.append(first)
+    first_view = buffer.view()
+    buffer.append(second)
+    history = buffer.view()
+
+    assert len(buffer) == 3
+    assert history["co2"].tolist() == [603.0, 599.0, 604.0]
+    assert history.timestamps[-1] == np.datetime64("2020-03-08T06:00:25")
+    assert not history["co2"].flags.writeable
+
+    # An earlier view isn't affected by later appends:
+    assert first_view["co2"].tolist() == [603.0]
+
+
+def test_history_rows_view() -> None:
+    """Test that a view of a growing list of rows keeps its length."""
+    rows = [{"co2": "603"}, {"co2": "599"}]
+    view = HistoryRowsView(rows)
+    rows.append({"co2": "604"})
+
+    assert len(view) == 2
+    assert view[-1] == {"co2": "599"}
+    assert view[-5:] == rows[:2]
+    assert list(view) == rows[:2]
+    with pytest.raises(IndexError):
+        view[2]  # pylint: disable=pointless-statement
+
+
+def test_parse_columnar_history_empty_cells() -> None:
+    """Test that empty cells are parsed as NaN."""
+    history = parse_columnar_history(
+        io.BytesIO(
+            b"2020/03/08;05:30:25;1583645425;7.0;\n"
+            b"2020/03/08;05:45:25;1583646325;;599\n"
+        ),
+        FIELDNAMES,
+    )
+
+    assert len(history) == 2
+    assert history["pm2_5"][0] == 7.0
+    assert np.isnan(history["pm2_5"][1])
+    assert np.isnan(history["co2"][0])
+    assert history["co2"][1] == 599.0
+
+
+def test_parse_history_metrics() -> None:
+    """Test that only the requested columns are included in row mode."""
+    rows = parse_history(
+        io.BytesIO(
+            b"2020/03/08;05:30:25;1583645425;7.0;603\r\n"
+            b"\n"
+            b"2020/03/08;05:45:25;1583646325;5.0;599\n"
+        ),
+        FIELDNAMES,
+        columnar=False,
+        metrics={"pm2_5"},
+    )
+
+    assert rows == [
+        {"Timestamp": "1583645425", "pm2_5": "7.0"},
+        {"Timestamp": "1583646325", "pm2_5": "5.0"},
+    ]
+    assert not parse_history(io.BytesIO(b""), [], columnar=False, metrics=set())
+
+
+def test_truncate_partial_row() -> None:
+    """Test that a trailing, partially written row is dropped."""
+    file_obj = io.BytesIO(
+        b"2020/03/08;05:30:25;1583645425;7.0;603\n2020/03/08;05:45:25;15836"
+    )
+    file_obj.seek(10)
+    truncate_partial_row(file_obj, chunk_size=8)
+
+    assert file_obj.tell() == 10
+    assert file_obj.getvalue() == b"2020/03/08;05:30:25;1583645425;7.0;603\n"
+
+    file_obj = io.BytesIO(b"2020/03/08;05:45:25;15836")
+    truncate_partial_row(file_obj)
+    assert not parse_history(file_obj, FIELDNAMES, columnar=True)
@@ -3,10 +3,14 @@
 # pylint: disable=unused-argument
 import logging
 from collections.abc import Generator
-from unittest.mock import Mock
+from typing import IO
+from unittest.mock import Mock, patch
 
+import numpy as np
 import pytest
 
+from pyairvisual import node as node_module
+from pyairvisual.history import ColumnarHistory
 from pyairvisual.node import NodeSamba
 from tests.common import TEST_NODE_IP_ADDRESS, TEST_NODE_PASSWORD
 
@@ -176,3 +180,295 @@ async def test_node_by_samba_no_sensor_life_data(
         measurements = await node.async_get_latest_measurements()
 
     assert measurements["status"]["sensor_life"] == {}
+
+
+@pytest.mark.asyncio
+async def test_node_by_samba_spilled_to_disk(
+    setup_samba_connection: Generator,  # noqa: F841
+) -> None:
+    """Test that files larger than the spool size are parsed the same way.
+
+    Args:
+        setup_samba_connection: A mocked Samba connection.
+    """
+    async with NodeSamba(
+        TEST_NODE_IP_ADDRESS, TEST_NODE_PASSWORD, spool_max_size=16
+    ) as node:
+        measurements = await node.async_get_latest_measurements()
+        history = await node.async_get_history()
+
+    assert len(history["measurements"]) == 7
+    assert history["measurements"][0]["pm2_5"] == "7.0"
+    assert measurements["last_measurement_timestamp"] == 1584204767
+
+
+@pytest.mark.asyncio
+async def test_node_by_samba_incremental_history(
+    node_history_samba_response: str,
+    setup_samba_connection: Generator,  # noqa: F841
+) -> None:
+    """Test that incremental history syncs only retrieve appended bytes.
+
+    Args:
+        node_history_samba_response: A history file's contents.
+        setup_samba_connection: A mocked Samba connection.
+    """
+    contents = node_history_samba_response.encode()
+    # Start with the last row only partially written:
+    visible = [contents[:-20]]
+    history_file = Mock(filename="202003_AirVisual_values.txt")
+
+    def list_path(*_: str, **__: str) -> list[Mock]:
+        """Return the history file with its current size.
+
+        Returns:
+            A list of Samba file references.
+        """
+        history_file.file_size = len(visible[0])
+        return [history_file]
+
+    def retrieve_file(
+        _: str, __: str, file_obj: IO[bytes], offset: int = 0, max_length: int = -1
+    ) -> tuple[int, int]:
+        """Write the visible contents of the history file (from an offset).
+
+        Args:
+            file_obj: The file-like object to write to.
+            offset: The byte offset to start from.
+            max_length: The max number of bytes to write (-1 for all).
+
+        Returns:
+            A (file attributes, bytes written) tuple.
+        """
+        contents = visible[0][offset:]
+        if max_length != -1:
+            contents = contents[:max_length]
+        file_obj.write(contents)
+        return 0, len(contents)
+
+    retrieve_file_mock = Mock(side_effect=retrieve_file)
+    retrieve_file_from_offset_mock = Mock(side_effect=retrieve_file)
+
+    with patch(
+        "smb.SMBConnection.SMBConnection.listPath", Mock(side_effect=list_path)
+    ), patch(
+        "smb.SMBConnection.SMBConnection.retrieveFile", retrieve_file_mock
+    ), patch(
+        "smb.SMBConnection.SMBConnection.retrieveFileFromOffset",
+        retrieve_file_from_offset_mock,
+    ):
+        async with NodeSamba(
+            TEST_NODE_IP_ADDRESS, TEST_NODE_PASSWORD, incremental_history=True
+        ) as node:
+            history = await node.async_get_history()
+            assert len(history["measurements"]) == 6
+            assert retrieve_file_mock.call_count == 1
+
+            visible[0] = contents
+            history = await node.async_get_history()
+            assert len(history["measurements"]) == 7
+
+            # Nothing new has been written, so nothing is retrieved:
+            history = await node.async_get_history()
+
+            # Switching to columnar measurements starts the sync over:
+            columnar_history = await node.async_get_history(columnar=True)
+
+    offset = contents.rindex(b"\n", 0, -1) + 1
+    assert retrieve_file_mock.call_count == 2
+    assert retrieve_file_from_offset_mock.call_count == 1
+    assert retrieve_file_from_offset_mock.call_args.kwargs["offset"] == offset
+    assert len(history["measurements"]) == 7
+    assert history["measurements"][-1]["Timestamp"] == "1583650825"
+    assert history["trends"]["aqi_us"] == "decreasing"
+    assert columnar_history["measurements"]["pm2_5"].tolist() == [
+        float(measurement["pm2_5"]) for measurement in history["measurements"]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_node_by_samba_incremental_history_rollover(
+    node_history_samba_response: str,
+    setup_samba_connection: Generator,  # noqa: F841
+) -> None:
+    """Test that an empty new history file doesn't resync the previous one.
+
+    Args:
+        node_history_samba_response: A history file's contents.
+        setup_samba_connection: A mocked Samba connection.
+    """
+    contents = node_history_samba_response.encode()
+    files = {
+        "202003_AirVisual_values.txt": contents,
+        # The new month's file only has a header so far:
+        "202004_AirVisual_values.txt": contents[: contents.index(b"\n") + 1],
+    }
+
+    def list_path(*_: str, **__: str) -> list[Mock]:
+        """Return the history files with their current sizes.
+
+        Returns:
+            A list of Samba file references.
+        """
+        return [
+            Mock(filename=filename, file_size=len(file_contents))
+            for filename, file_contents in files.items()
+        ]
+
+    def retrieve_file(
+        _: str, filepath: str, file_obj: IO[bytes], offset: int = 0
+    ) -> tuple[int, int]:
+        """Write the contents of a history file (from an offset).
+
+        Args:
+            filepath: The path of the history file.
+            file_obj: The file-like object to write to.
+            offset: The byte offset to start from.
+
+        Returns:
+            A (file attributes, bytes written) tuple.
+        """
+        file_contents = files[filepath.lstrip("/")][offset:]
+        file_obj.write(file_contents)
+        return 0, len(file_contents)
+
+    retrieve_file_mock = Mock(side_effect=retrieve_file)
+
+    with patch(
+        "smb.SMBConnection.SMBConnection.listPath", Mock(side_effect=list_path)
+    ), patch("smb.SMBConnection.SMBConnection.retrieveFile", retrieve_file_mock):
+        async with NodeSamba(
+            TEST_NODE_IP_ADDRESS, TEST_NODE_PASSWORD, incremental_history=True
+        ) as node:
+            for _ in range(3):
+                history = await node.async_get_history()
+                assert len(history["measurements"]) == 7
+            assert retrieve_file_mock.call_count == 2
+
+            # States are only kept for files that are still listed:
+            del files["202003_AirVisual_values.txt"]
+            history = await node.async_get_history()
+            assert not history["measurements"]
+            assert list(node._history_states) == [  # pylint: disable=W0212
+                "202004_AirVisual_values.txt"
+            ]
+
+
+@pytest.mark.asyncio
+async def test_node_by_samba_history_tail(
+    mock_history_file: Mock,
+    mock_pysmb_retrieve_file: Mock,
+    node_history_samba_response: str,
+    setup_samba_connection: Generator,  # noqa: F841
+) -> None:
+    """Test that only the end of a history file is read for the last measurements.
+
+    Args:
+        mock_history_file: A mocked history file.
+        mock_pysmb_retrieve_file: A mocked function to retrieve a file.
+        node_history_samba_response: A history file's contents.
+        setup_samba_connection: A mocked Samba connection.
+    """
+    # Simulate a last row that is still being written:
+    mock_history_file.file_size -= 20
+
+    with patch.object(node_module, "TAIL_CHUNK_SIZE", 64):
+        async with NodeSamba(TEST_NODE_IP_ADDRESS, TEST_NODE_PASSWORD) as node:
+            history = await node.async_get_history(
+                include_trends=False, measurements_to_use=3
+            )
+
+    assert [measurement["Timestamp"] for measurement in history["measurements"]] == [
+        "1583648125",
+        "1583649025",
+        "1583649925",
+    ]
+    assert history["measurements"][0]["pm2_5"] == "2.0"
+
+    # Nothing but the header and the end of the file should have been read (i.e., not
+    # the second row):
+    contents = node_history_samba_response.encode()
+    second_row_start = contents.index(b"\n", contents.index(b"\n") + 1) + 1
+    second_row_end = contents.index(b"\n", second_row_start) + 1
+    for call in mock_pysmb_retrieve_file.call_args_list:
+        assert call.kwargs["max_length"] != -1
+        assert (
+            call.kwargs["offset"] + call.kwargs["max_length"] <= second_row_start
+            or call.kwargs["offset"] >= second_row_end
+        )
+
+
+@pytest.mark.asyncio
+async def test_node_by_samba_columnar_history(
+    setup_samba_connection: Generator,  # noqa: F841
+) -> None:
+    """Test getting a node's history as one array per metric.
+
+    Args:
+        setup_samba_connection: A mocked Samba connection.
+    """
+    async with NodeSamba(TEST_NODE_IP_ADDRESS, TEST_NODE_PASSWORD) as node:
+        history = await node.async_get_history(columnar=True)
+        rows = await node.async_get_history()
+        last_history = await node.async_get_history(
+            columnar=True, measurements_to_use=3
+        )
+
+    measurements = history["measurements"]
+    assert len(measurements) == 7
+    assert "Date" not in measurements.metrics
+    assert "Timestamp" not in measurements.metrics
+    assert measurements.timestamps[0] == np.datetime64("2020-03-08T05:30:25")
+    assert measurements["pm2_5"].dtype == np.float64
+    assert measurements["pm2_5"].tolist() == [
+        float(row["pm2_5"]) for row in rows["measurements"]
+    ]
+    assert history["trends"] == rows["trends"]
+
+    assert last_history["measurements"]["co2"].tolist() == [604.0, 590.0, 585.0]
+    assert last_history["trends"]["co2"] == "decreasing"
+
+
+@pytest.mark.asyncio
+async def test_node_by_samba_history_metrics(
+    setup_samba_connection: Generator,  # noqa: F841
+) -> None:
+    """Test getting only some metrics of a node's history.
+
+    Args:
+        setup_samba_connection: A mocked Samba connection.
+    """
+    async with NodeSamba(TEST_NODE_IP_ADDRESS, TEST_NODE_PASSWORD) as node:
+        history = await node.async_get_history(metrics=["pm2_5", "co2"])
+        columnar_history = await node.async_get_history(
+            columnar=True, measurements_to_use=3, metrics=["pm2_5", "co2"]
+        )
+
+    assert history["measurements"][0] == {
+        "Timestamp": "1583645425",
+        "pm2_5": "7.0",
+        "co2": "603",
+    }
+    assert history["trends"] == {"co2": "decreasing", "pm2_5": "decreasing"}
+
+    assert set(columnar_history["measurements"].metrics) == {"pm2_5", "co2"}
+    assert columnar_history["measurements"]["co2"].tolist() == [604.0, 590.0, 585.0]
+    assert len(columnar_history["measurements"].timestamps) == 3
+
+
+def test_columnar_trends_with_gaps() -> None:
+    """Test that missing values are left out of columnar trends."""
+    history = ColumnarHistory(
+        np.arange(7).astype("datetime64[s]"),
+        {
+            "co2": np.array([np.nan, np.nan, 600, np.nan, np.nan, np.nan, np.nan]),
+            "pm2_5": np.array([7, np.nan, 4, 2, 3, 3, 3]),
+        },
+    )
+    trends = node_module._calculate_columnar_trends(  # pylint: disable=protected-access
+        history, -1
+    )
+    assert trends == {
+        "co2": "flat",
+        "pm2_5": "decreasing",
+    }